@@ -0,0 +1,3 @@
+from addonfactory_test_matrix_action.main import main
+
+main()
@@ -0,0 +1,120 @@
+"""Resolve many requests against one parse of the bundled matrices.
+
+Each input line is a JSON object::
+
+    {"name": "TA-foo", "features": "python39", "vendormatrix": "TA-foo/.vendormatrix",
+     "args": ["--coverage", "pairwise"]}
+
+where every key but ``name`` is optional and ``args`` holds further ``main``
+arguments. One JSON Lines record is written per request, in input order:
+``{"name", "outputs": {output: value}, "warnings": [...]}``, or
+``{"name", "error"}`` when the request is invalid.
+
+With ``--jobs N`` the requests are spread over N worker processes, each of
+which loads the model once; worth it when the vendor matrices are large.
+"""
+import argparse
+import configparser
+import json
+import sys
+
+from addonfactory_test_matrix_action import main as matrix
+
+# The model of this process; built once, by main() or by each worker.
+_model = None
+_path = None
+
+
+def _init(path):
+    global _model, _path
+    _path = path
+    _model = matrix._load_model(path, vendors_matrix=None)
+
+
+def resolve(line):
+    """Return the output record for one input *line*."""
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict):
+            raise ValueError("expected a JSON object")
+    except ValueError as e:
+        return {"name": None, "error": f"Invalid request {line.strip()!r}: {e}"}
+    name = request.get("name")
+    argv = [str(arg) for arg in request.get("args", [])]
+    if request.get("features"):
+        argv += ["--features", str(request["features"])]
+    log = []
+    try:
+        args, excludes, strength, durations = matrix._parse_arguments(argv, log.append)
+        model = _model.with_vendors(
+            matrix._load_vendors_config(request.get("vendormatrix"))
+        )
+    except (ValueError, configparser.Error) as e:
+        return {"name": name, "error": str(e)}
+    outputs = matrix._render_outputs(
+        args, _path, model, excludes, strength, durations, log.append
+    )
+    return {
+        "name": name,
+        "outputs": {key: json.loads(value) for key, value in outputs.items()},
+        "warnings": [message for message in log if message.startswith("::warning::")],
+    }
+
+
+def run(lines, out, jobs=1, path=None):
+    """Write one record per request line of *lines* to *out*; returns the number of errors."""
+    path = path or matrix._config_dir()
+    lines = (line for line in lines if line.strip())
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(jobs, initializer=_init, initargs=(path,))
+        records = executor.map(resolve, lines, chunksize=8)
+    else:
+        executor = None
+        _init(path)
+        records = map(resolve, lines)
+    errors = 0
+    try:
+        for record in records:
+            errors += "error" in record
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Resolve JSON Lines requests (name, features, vendormatrix, args) "
+        "against one parse of the matrices"
+    )
+    parser.add_argument(
+        "requests", nargs="?", default="-", help="JSON Lines file, '-' for stdin"
+    )
+    parser.add_argument("--output", default="-", help="JSON Lines file, '-' for stdout")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes (default: resolve in-process)",
+    )
+    parser.add_argument("--config", help="Config directory (default: the bundled one)")
+    options = parser.parse_args(argv)
+    if options.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    source = sys.stdin if options.requests == "-" else open(options.requests)
+    sink = sys.stdout if options.output == "-" else open(options.output, "w")
+    try:
+        errors = run(source, sink, options.jobs, options.config)
+    finally:
+        for stream in (source, sink):
+            if stream not in (sys.stdin, sys.stdout):
+                stream.close()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,94 @@
+"""Combined job matrix: the product of the Splunk, SC4S and vendor axes.
+
+Combinations are enumerated depth first, one axis at a time, so an exclude rule
+prunes a whole subtree as soon as every axis it mentions is assigned, and the
+walk stops once the job budget is reached.
+"""
+import itertools
+import json
+from fnmatch import fnmatchcase
+
+# GitHub Actions rejects matrices with more than 256 jobs.
+DEFAULT_MAX_JOBS = 256
+AXES = ("splunk", "sc4s", "vendor")
+
+
+def parse_excludes(text, axis_names=AXES):
+    """Parse ``--combined-exclude``: a JSON list of ``{"axis.field": "glob"}`` rules.
+
+    Raises ValueError on malformed JSON or rules naming an unknown axis.
+    """
+    if not text:
+        return []
+    try:
+        rules = json.loads(text)
+    except ValueError as e:
+        raise ValueError(f"Invalid --combined-exclude: {e}") from None
+    if not isinstance(rules, list) or not all(
+        isinstance(rule, dict) and rule for rule in rules
+    ):
+        raise ValueError("Invalid --combined-exclude: expected a list of objects")
+    parsed = []
+    for rule in rules:
+        conditions = []
+        for key, pattern in rule.items():
+            axis, _, field = key.partition(".")
+            if axis not in axis_names or not field or not isinstance(pattern, str):
+                raise ValueError(
+                    f"Invalid --combined-exclude rule {rule!r}: keys are "
+                    f"'<axis>.<field>' with axis one of {sorted(axis_names)}, "
+                    "values are glob strings"
+                )
+            conditions.append((axis, field, pattern))
+        parsed.append(tuple(conditions))
+    return parsed
+
+
+def rule_matches(conditions, assigned):
+    """Whether every glob of an exclude rule matches the assigned entries."""
+    return all(
+        fnmatchcase(str(assigned[axis].get(field, "")), pattern)
+        for axis, field, pattern in conditions
+    )
+
+
+def iter_combined(axes, excludes=()):
+    """Yield ``{axis: entry}`` for each combination of *axes* no exclude rule matches.
+
+    *axes* is a sequence of ``(name, entries)``; every rule is checked at the
+    depth of the last axis it mentions.
+    """
+    if not axes or any(not entries for _, entries in axes):
+        # The product of an empty axis is empty.
+        return
+    depth_of = {name: depth for depth, (name, _) in enumerate(axes)}
+    rules_at = [[] for _ in axes]
+    for conditions in excludes:
+        if any(axis not in depth_of for axis, _, _ in conditions):
+            # A rule on an axis that is not part of the product never matches.
+            continue
+        rules_at[max(depth_of[axis] for axis, _, _ in conditions)].append(conditions)
+
+    assigned = {}
+
+    def walk(depth):
+        if depth == len(axes):
+            yield dict(assigned)
+            return
+        name, entries = axes[depth]
+        for entry in entries:
+            assigned[name] = entry
+            if any(rule_matches(rule, assigned) for rule in rules_at[depth]):
+                continue
+            yield from walk(depth + 1)
+        del assigned[name]
+
+    yield from walk(0)
+
+
+def generate_combined(axes, excludes=(), max_jobs=DEFAULT_MAX_JOBS):
+    """Return ``(jobs, truncated)`` with at most *max_jobs* combinations."""
+    combinations = iter_combined(axes, excludes)
+    jobs = list(itertools.islice(combinations, max_jobs))
+    truncated = next(combinations, None) is not None
+    return jobs, truncated
@@ -0,0 +1,175 @@
+"""t-wise covering arrays over the combined matrix axes (``--coverage``).
+
+A covering array of strength t contains, for every choice of t axes, every
+combination of their entries in at least one job. Rows are built greedily in
+the spirit of AETG, but without randomness: each row starts from the first
+uncovered t-tuple and fills the remaining axes with the entry that covers the
+most uncovered tuples, ties going to the earlier entry. The same input always
+yields the same jobs.
+"""
+import itertools
+
+from addonfactory_test_matrix_action.combined import rule_matches
+
+
+def parse_coverage(text):
+    """Return the strength for ``--coverage``: None for ``full``, 2 for ``pairwise``, N for ``t=N``."""
+    if text is None or text == "full":
+        return None
+    if text == "pairwise":
+        return 2
+    if text.startswith("t="):
+        try:
+            strength = int(text[2:])
+        except ValueError:
+            strength = 0
+        if strength >= 1:
+            return strength
+    raise ValueError(
+        f"Invalid --coverage {text!r}: expected 'full', 'pairwise' or 't=N' with N >= 1"
+    )
+
+
+class _Builder:
+    def __init__(self, axes, strength, excludes):
+        self.names = [name for name, _ in axes]
+        self.entries = [list(entries) for _, entries in axes]
+        self.strength = min(strength, len(axes))
+        positions = {name: i for i, name in enumerate(self.names)}
+        # Rules over axes that are not part of the product never match.
+        self.rules = [
+            (frozenset(positions[axis] for axis, _, _ in rule), rule)
+            for rule in excludes
+            if all(axis in positions for axis, _, _ in rule)
+        ]
+        self.uncovered = {}
+        for columns in itertools.combinations(range(len(axes)), self.strength):
+            for values in itertools.product(
+                *(range(len(self.entries[c])) for c in columns)
+            ):
+                assignment = dict(zip(columns, values))
+                if not self._excluded(assignment):
+                    self.uncovered[(columns, values)] = None
+        # Covered tuples never become uncovered again, so the next seed is found
+        # by advancing a cursor over the tuples in their original order.
+        self.order = list(self.uncovered)
+        self.cursor = 0
+
+    def _excluded(self, assignment):
+        if not self.rules:
+            return False
+        assigned = None
+        for columns, rule in self.rules:
+            if columns.issubset(assignment):
+                if assigned is None:
+                    assigned = {
+                        self.names[c]: self.entries[c][v] for c, v in assignment.items()
+                    }
+                if rule_matches(rule, assigned):
+                    return True
+        return False
+
+    def _gain(self, assignment, column, value):
+        """Uncovered tuples completed by setting *column* to *value*."""
+        others = sorted(assignment)
+        gain = 0
+        for subset in itertools.combinations(others, self.strength - 1):
+            columns = tuple(sorted(subset + (column,)))
+            values = tuple(value if c == column else assignment[c] for c in columns)
+            if (columns, values) in self.uncovered:
+                gain += 1
+        return gain
+
+    def build_row(self, seed):
+        """Complete *seed* ({column: value}) into a row, or None if excludes forbid it."""
+        assignment = dict(seed)
+        for column in range(len(self.names)):
+            if column in assignment:
+                continue
+            best = None
+            for value in range(len(self.entries[column])):
+                if self.rules and self._excluded({**assignment, column: value}):
+                    continue
+                gain = self._gain(assignment, column, value)
+                if best is None or gain > best[0]:
+                    best = (gain, value)
+            if best is None:
+                # The greedy choices so far leave no allowed entry; search for
+                # any allowed completion of the seed instead.
+                assignment = self._complete(dict(seed), 0)
+                if assignment is None:
+                    return None
+                break
+            assignment[column] = best[1]
+        for columns in itertools.combinations(range(len(self.names)), self.strength):
+            self.uncovered.pop((columns, tuple(assignment[c] for c in columns)), None)
+        return assignment
+
+    def _complete(self, assignment, column):
+        if column == len(self.names):
+            return assignment
+        if column in assignment:
+            return self._complete(assignment, column + 1)
+        for value in range(len(self.entries[column])):
+            assignment[column] = value
+            if not self._excluded(assignment):
+                complete = self._complete(assignment, column + 1)
+                if complete is not None:
+                    return complete
+        del assignment[column]
+        return None
+
+    def next_seed(self):
+        """The first uncovered tuple as {column: value}."""
+        while self.order[self.cursor] not in self.uncovered:
+            self.cursor += 1
+        columns, values = self.order[self.cursor]
+        return dict(zip(columns, values))
+
+    def seed_with(self, column, value):
+        """The first uncovered tuple that sets *column* to *value*, or None."""
+        for columns, values in self.uncovered:
+            if column in columns and values[columns.index(column)] == value:
+                return dict(zip(columns, values))
+        return None
+
+    def job(self, assignment):
+        return {
+            self.names[c]: self.entries[c][assignment[c]]
+            for c in range(len(self.names))
+        }
+
+
+def generate_covering(axes, strength, excludes=(), max_jobs=None, required=()):
+    """Return ``(jobs, truncated)``: a t-wise covering array over *axes*.
+
+    *required* lists ``(axis, entry index)`` pairs that must appear in a job;
+    their jobs come first so a job budget never drops them.
+    """
+    if not axes or any(not entries for _, entries in axes):
+        return [], False
+    builder = _Builder(axes, strength, excludes)
+    positions = {name: i for i, (name, _) in enumerate(axes)}
+    rows = []
+    for axis, index in required:
+        column = positions[axis]
+        if any(row[column] == index for row in rows):
+            continue
+        seed = builder.seed_with(column, index) or {column: index}
+        row = builder.build_row(seed)
+        if row is not None:
+            rows.append(row)
+    while builder.uncovered:
+        seed = builder.next_seed()
+        row = builder.build_row(seed)
+        if row is None:
+            # No allowed job contains this tuple.
+            builder.uncovered.pop(
+                (tuple(sorted(seed)), tuple(seed[c] for c in sorted(seed)))
+            )
+            continue
+        rows.append(row)
+    truncated = max_jobs is not None and len(rows) > max_jobs
+    if truncated:
+        rows = rows[:max_jobs]
+    return [builder.job(row) for row in rows], truncated
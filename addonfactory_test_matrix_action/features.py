@@ -0,0 +1,194 @@
+"""Boolean ``--features`` expressions and the per-version feature bitmask index.
+
+Grammar, loosest binding first::
+
+    expr := term ("|" term)*
+    term := factor (("," | "&") factor)*
+    factor := "!" factor | "(" expr ")" | FLAG
+
+``,`` keeps its historical meaning (AND), so ``python39,python37`` still selects
+versions that have both flags. Flags are matched case-insensitively; a flag a
+version does not define counts as false.
+"""
+import functools
+import re
+
+_TOKEN = re.compile(r"\s*(?:([!|,&()])|([A-Za-z0-9_.\-]+))")
+
+
+def _tokenize(text):
+    tokens = []
+    position = 0
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise ValueError(
+                f"Invalid --features expression {text!r}: "
+                f"unexpected {text[position:].strip()[:1]!r} at offset {position}"
+            )
+        operator, flag = match.groups()
+        tokens.append(operator or ("flag", flag.lower()))
+        position = match.end()
+    return tokens
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def _peek(self):
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def _error(self, expected):
+        found = self._peek()
+        found = (
+            "end of input"
+            if found is None
+            else repr(found[1] if isinstance(found, tuple) else found)
+        )
+        return ValueError(
+            f"Invalid --features expression {self.text!r}: expected {expected}, found {found}"
+        )
+
+    def parse(self):
+        node = self._expr()
+        if self._peek() is not None:
+            raise self._error("an operator")
+        return node
+
+    def _expr(self):
+        terms = [self._term()]
+        while self._peek() == "|":
+            self.position += 1
+            terms.append(self._term())
+        return terms[0] if len(terms) == 1 else ("or", tuple(terms))
+
+    def _term(self):
+        factors = [self._factor()]
+        while self._peek() in (",", "&"):
+            self.position += 1
+            factors.append(self._factor())
+        return factors[0] if len(factors) == 1 else ("and", tuple(factors))
+
+    def _factor(self):
+        token = self._peek()
+        if token == "!":
+            self.position += 1
+            return ("not", self._factor())
+        if token == "(":
+            self.position += 1
+            node = self._expr()
+            if self._peek() != ")":
+                raise self._error("')'")
+            self.position += 1
+            return node
+        if isinstance(token, tuple):
+            self.position += 1
+            return token
+        raise self._error("a feature flag")
+
+
+@functools.lru_cache(maxsize=None)
+def parse_features(text):
+    """Parse a ``--features`` expression; None or a blank string selects everything.
+
+    Raises ValueError on a malformed expression.
+    """
+    if text is None or not text.strip():
+        return None
+    return _Parser(text).parse()
+
+
+def evaluate(node, props):
+    """Evaluate a parsed expression against a version's coerced props."""
+    if node is None:
+        return True
+    kind, value = node
+    if kind == "flag":
+        return props.get(value) is True
+    if kind == "not":
+        return not evaluate(value, props)
+    if kind == "and":
+        return all(evaluate(child, props) for child in value)
+    return any(evaluate(child, props) for child in value)
+
+
+class FeatureIndex:
+    """Bitmask of every boolean option of each version, in model order.
+
+    ``bits`` maps a lowercased flag to its bit; ``masks[i]`` has the bits of the
+    flags that are true for the i-th version.
+    """
+
+    __slots__ = ("bits", "masks", "_predicates")
+
+    def __init__(self, versions):
+        bits = {}
+        masks = []
+        for version in versions:
+            mask = 0
+            for key, value in version.props.items():
+                if value is True or value is False:
+                    bit = bits.setdefault(key, len(bits))
+                    if value:
+                        mask |= 1 << bit
+            masks.append(mask)
+        self.bits = bits
+        self.masks = tuple(masks)
+        self._predicates = {}
+
+    def predicate(self, text):
+        """Return ``mask -> bool`` for a ``--features`` expression, compiled once."""
+        predicate = self._predicates.get(text)
+        if predicate is None:
+            predicate = self._compile(parse_features(text))
+            self._predicates[text] = predicate
+        return predicate
+
+    def select(self, text, versions):
+        """Yield the versions (in model order) whose mask satisfies *text*."""
+        predicate = self.predicate(text)
+        for version, mask in zip(versions, self.masks):
+            if predicate(mask):
+                yield version
+
+    def _compile(self, node):
+        if node is None:
+            return lambda mask: True
+        kind, value = node
+        if kind == "flag":
+            # A flag no version defines is never true.
+            return self._all_of(self._bit(value), 0)
+        if kind == "not":
+            inner = self._compile(value)
+            return lambda mask: not inner(mask)
+        if kind == "or":
+            children = [self._compile(child) for child in value]
+            return lambda mask: any(child(mask) for child in children)
+        # AND: fold plain (and negated) flags into one integer test each.
+        required = forbidden = 0
+        rest = []
+        for child in value:
+            if child[0] == "flag":
+                required |= self._bit(child[1])
+            elif child[0] == "not" and child[1][0] == "flag":
+                forbidden |= self._bit(child[1][1])
+            else:
+                rest.append(self._compile(child))
+        test = self._all_of(required, forbidden)
+        if not rest:
+            return test
+        return lambda mask: test(mask) and all(child(mask) for child in rest)
+
+    def _bit(self, flag):
+        bit = self.bits.get(flag)
+        # Unknown flags map past every real bit, so a required one never matches
+        # and a forbidden one never excludes.
+        return 1 << (len(self.bits) if bit is None else bit)
+
+    @staticmethod
+    def _all_of(required, forbidden):
+        return lambda mask: mask & required == required and not mask & forbidden
@@ -1,76 +1,142 @@
 #!/usr/bin/env python3
-import argparse
-import configparser
-import json
+# Startup time is budgeted (tests/test_startup.py): argparse, configparser and
+# pprint are imported where they are used, so loading a matching snapshot never
+# pulls them in at import time.
 import os
-import pprint
-import re
-from datetime import datetime
-from pathlib import Path
+from datetime import date, datetime
 
+from addonfactory_test_matrix_action.combined import (
+    DEFAULT_MAX_JOBS,
+    generate_combined,
+    parse_excludes,
+)
+from addonfactory_test_matrix_action.covering import generate_covering, parse_coverage
+from addonfactory_test_matrix_action.features import evaluate, parse_features
+from addonfactory_test_matrix_action.model import MatrixModel
+from addonfactory_test_matrix_action.outputs import GithubOutput, write_atomic
+from addonfactory_test_matrix_action.result_cache import (
+    DEFAULT_MAX_BYTES,
+    ResultCache,
+    cache_key,
+    default_directory,
+)
+from addonfactory_test_matrix_action.scheduling import DurationModel, load_timings
+from addonfactory_test_matrix_action.snapshot import SNAPSHOT_NAME, load_snapshot
 
-def has_features(features, section):
-    if features is not None:
-        for feature in features.split(","):
-            value = section.getboolean(feature)
-            if not value:
-                return False
-    return True
+_VENDOR_MATRIX = "/github/workspace/.vendormatrix"
+
+
+def has_features(features, props):
+    """Whether *props* satisfy the ``--features`` expression (see features.py)."""
+    return evaluate(parse_features(features), props)
 
 
 _ALLOWED_SERVER_CONF_PYTHON_VERSIONS = {"python3", "force_python3"}
 
 
-def _load_splunk_config(path):
+def _splunk_matrix_path(path):
     if os.path.exists("splunk_matrix.conf"):
-        splunk_matrix = "splunk_matrix.conf"
-    else:
-        splunk_matrix = os.path.join(path, "splunk_matrix.conf")
+        return "splunk_matrix.conf"
+    return os.path.join(path, "splunk_matrix.conf")
+
+
+def _load_splunk_config(path):
+    import configparser
+
     config = configparser.ConfigParser()
-    config.read(splunk_matrix)
+    config.read(_splunk_matrix_path(path))
     return config
 
 
+def _load_sc4s_config(path):
+    import configparser
+
+    config = configparser.ConfigParser()
+    config.read(os.path.join(path, "SC4S_matrix.conf"))
+    return config
+
+
+def _load_vendors_config(vendors_matrix=_VENDOR_MATRIX):
+    if not vendors_matrix or not os.path.exists(vendors_matrix):
+        return None
+    import configparser
+
+    config = configparser.ConfigParser()
+    config.read(vendors_matrix)
+    return config
+
+
+def _load_model(path, vendors_matrix=_VENDOR_MATRIX):
+    """Parse every matrix once; the generators below are projections over the result.
+
+    The bundled matrices come from the precompiled snapshot when it matches the
+    conf files, see ``snapshot.py``.
+    """
+    snapshot = load_snapshot(
+        os.path.join(path, SNAPSHOT_NAME),
+        _splunk_matrix_path(path),
+        os.path.join(path, "SC4S_matrix.conf"),
+    )
+    if snapshot is not None:
+        return MatrixModel.from_snapshot(snapshot, _load_vendors_config(vendors_matrix))
+    return MatrixModel.from_configs(
+        _load_splunk_config(path),
+        _load_sc4s_config(path),
+        _load_vendors_config(vendors_matrix),
+    )
+
+
+def _as_of(args):
+    """The day support is evaluated for: --as-of, or today."""
+    return getattr(args, "as_of", None) or datetime.now().date()
+
+
+def _parse_as_of(value):
+    import argparse
+
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            f"invalid date {value!r}, expected YYYY-MM-DD"
+        ) from None
+
+
+def _active_splunk(args, model):
+    """Supported, feature-matching Splunk versions in model order; expired ones are never visited."""
+    predicate = model.feature_index.predicate(args.features)
+    masks = model.feature_index.masks
+    for position in model.splunk_supported_on(_as_of(args)):
+        if predicate(masks[position]):
+            yield model.splunk[position]
+
+
+def _active_sc4s(args, model):
+    for position in model.sc4s_supported_on(_as_of(args)):
+        yield model.sc4s[position]
+
+
 def _iter_splunk_sections(args, config):
     """Yield (section, props, base_entry) for each non-EOL, feature-matching Splunk version."""
-    today = datetime.now().date()
-    for section in config.sections():
-        if not re.search(r"^\d+", section):
-            continue
-        eol = datetime.strptime(config[section]["SUPPORTED"], "%Y-%m-%d").date()
-        if today >= eol:
-            continue
-        if not has_features(args.features, config[section]):
-            continue
-        props = {}
-        for k in config[section].keys():
-            try:
-                value = config[section].getboolean(k)
-            except ValueError:
-                value = config[section][k]
-            props[k] = value
-        base_entry = {
-            "version": props["version"],
-            "build": props["build"],
-            "islatest": (config["GENERAL"]["LATEST"] == section),
-            "isoldest": (config["GENERAL"]["OLDEST"] == section),
-        }
-        yield section, props, base_entry
+    model = MatrixModel.from_configs(config)
+    for splunk in _active_splunk(args, model):
+        yield splunk.section, dict(splunk.props), splunk.base_entry()
 
 
-def _generate_supported_splunk(args, path):
-    config = _load_splunk_config(path)
-    return [base_entry for _, _, base_entry in _iter_splunk_sections(args, config)]
+def _generate_supported_splunk(args, path, model=None):
+    if model is None:
+        model = _load_model(path)
+    return [splunk.base_entry() for splunk in _active_splunk(args, model)]
 
 
-def _generate_supported_splunk_modinput(args, path):
-    config = _load_splunk_config(path)
+def _generate_supported_splunk_modinput(args, path, model=None):
+    if model is None:
+        model = _load_model(path)
     supported_splunk = []
-    for _, props, base_entry in _iter_splunk_sections(args, config):
-        raw = props.get("server_conf_python_versions")
-        if raw:
-            for python_version in raw.split(","):
-                python_version = python_version.strip()
+    for splunk in _active_splunk(args, model):
+        base_entry = splunk.base_entry()
+        if splunk.server_conf_python_versions:
+            for python_version in splunk.server_conf_python_versions:
                 if python_version not in _ALLOWED_SERVER_CONF_PYTHON_VERSIONS:
                     raise ValueError(
                         f"Invalid server_conf_python_versions value: {python_version!r}. "
@@ -84,128 +150,364 @@ def _generate_supported_splunk_modinput(args, path):
     return supported_splunk
 
 
-def _generate_supported_sc4s(args, path):
-    config = configparser.ConfigParser()
-    sc4s_matrix = os.path.join(path, "SC4S_matrix.conf")
-    config.read(sc4s_matrix)
-    supported_sc4s = []
-    for section in config.sections():
-        if re.search(r"^\d+", section):
-            props = {}
-            supported_string = config[section].get("SUPPORTED", "ROLLING")
-            if supported_string != "ROLLING":
-                eol = datetime.strptime(supported_string, "%Y-%m-%d").date()
-                today = datetime.now().date()
-                if today >= eol:
-                    continue
-
-            for k in config[section].keys():
-                try:
-                    value = config[section].getboolean(k)
-                except:
-                    value = config[section][k]
-                props[k] = value
-            if not props.get("docker_registry"):
-                props[
-                    "docker_registry"
-                ] = "ghcr.io/splunk/splunk-connect-for-syslog/container"
-            supported_sc4s.append(
-                {
-                    "version": props["version"],
-                    "docker_registry": props["docker_registry"],
-                }
-            )
-    return supported_sc4s
-
-
-def _generate_supported_vendors(args, path):
-    config = configparser.ConfigParser()
-    vendors_matrix = os.path.join(path, "/github/workspace/.vendormatrix")
-    config.read(vendors_matrix)
+def _generate_supported_sc4s(args, path, model=None):
+    if model is None:
+        model = _load_model(path)
+    return [sc4s.entry() for sc4s in _active_sc4s(args, model)]
+
+
+def _add_months(day, months):
+    """*day* shifted by *months* calendar months, clamped to the end of the month."""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    for candidate in (day.day, 30, 29, 28):
+        try:
+            return day.replace(year=year, month=month, day=candidate)
+        except ValueError:
+            continue
+
 
-    supported_modinput_functional_vendors = []
-    supported_ui_vendors = []
-    for section in config.sections():
-        if re.search(r"^\d+", section):
-            props = {}
-
-            for k in config[section].keys():
-                try:
-                    value = config[section].getboolean(k)
-                except:
-                    value = config[section][k]
-                props[k] = value
-            if props.get("trigger_modinput_functional") is not False:
-                supported_modinput_functional_vendors.append(
-                    {"version": props["version"], "image": props["docker_image"]}
-                )
-            if props.get("trigger_ui") is not False:
-                supported_ui_vendors.append(
-                    {"version": props["version"], "image": props["docker_image"]}
-                )
+def _generate_forecast(args, path, model=None):
+    """Supported Splunk and SC4S sets from --as-of (or today) through each EOL boundary
+    within the next --forecast-months months, computed in one sweep over the boundaries.
+    """
+    if model is None:
+        model = _load_model(path)
+    start = _as_of(args)
+    end = _add_months(start, args.forecast_months)
+    # Insertion-ordered, so every snapshot keeps the model order.
+    splunk = {s.section: s for s in _active_splunk(args, model)}
+    sc4s = {s.section: s for s in _active_sc4s(args, model)}
+    boundaries = {}
+    for versions in (splunk, sc4s):
+        for section, version in versions.items():
+            if version.supported is not None and version.supported <= end:
+                boundaries.setdefault(version.supported, []).append((versions, section))
+
+    def snapshot(day):
+        return {
+            "date": day.isoformat(),
+            "supportedSplunk": [s.base_entry() for s in splunk.values()],
+            "supportedSC4S": [s.entry() for s in sc4s.values()],
+        }
 
+    forecast = [snapshot(start)]
+    for day in sorted(boundaries):
+        for versions, section in boundaries[day]:
+            del versions[section]
+        forecast.append(snapshot(day))
+    return forecast
+
+
+def _generate_supported_vendors(args, path, model=None):
+    if model is None:
+        model = _load_model(path)
+    vendors = model.vendors or ()
+    supported_modinput_functional_vendors = [
+        vendor.entry() for vendor in vendors if vendor.modinput_functional
+    ]
+    supported_ui_vendors = [vendor.entry() for vendor in vendors if vendor.ui]
     return supported_modinput_functional_vendors, supported_ui_vendors
 
 
-def main():
-    parser = argparse.ArgumentParser(description="Determine support matrix")
+def _vendor_outputs(args, path, model):
+    """The vendor outputs: the supported vendors, or one empty entry each without a .vendormatrix."""
+    if model.vendors is None:
+        return [{"version": "", "image": ""}], [{"version": "", "image": ""}]
+    return _generate_supported_vendors(args, path, model)
+
+
+def _config_dir():
+    """Return the bundled config directory, next to the package or the zipapp."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if os.path.isfile(root):
+        # Running from a zipapp: __file__ is <archive>.pyz/<package>/main.py.
+        root = os.path.dirname(root)
+    return os.path.join(root, "config")
+
+
+def _log(line):
+    """Workflow commands are printed verbatim, everything else through pprint."""
+    if line.startswith("::"):
+        print(line)
+    else:
+        import pprint
+
+        pprint.pprint(line)
+
+
+def _build_parser(add_help=True):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Determine support matrix", add_help=add_help
+    )
     parser.add_argument(
         "--features",
         type=str,
         default=None,
-        help="Comma separated list of features",
+        help="Feature expression, e.g. 'python39,!python37' or '(a|b),!c'; "
+        "',' and '&' mean AND, '|' OR, '!' NOT",
     )
 
-    args = parser.parse_args()
+    parser.add_argument(
+        "--combined-exclude",
+        type=str,
+        default=None,
+        help='JSON list of exclude rules for combinedMatrix, e.g. [{"splunk.version": "9.*", "sc4s.version": "2.*"}]',
+    )
+    parser.add_argument(
+        "--max-jobs",
+        type=int,
+        default=DEFAULT_MAX_JOBS,
+        help="Upper bound on the number of combinedMatrix jobs",
+    )
+    parser.add_argument(
+        "--coverage",
+        type=str,
+        default="full",
+        help="combinedMatrix reduction: 'full' product, 'pairwise' or 't=N' covering array",
+    )
+    parser.add_argument(
+        "--timings",
+        type=str,
+        default=None,
+        help="JSON timing history keyed by version/build/variant; orders Splunk entries longest first",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help="Pack the Splunk entries into this many duration-balanced shards",
+    )
+    parser.add_argument(
+        "--forecast-months",
+        type=int,
+        default=0,
+        help="Also emit the supported sets at every EOL boundary in the next N months",
+    )
+    parser.add_argument(
+        "--pin-digests",
+        action="store_true",
+        help="Add pinned_image (<image>@sha256:...) to the SC4S and vendor entries",
+    )
+    parser.add_argument(
+        "--pin-jobs",
+        type=int,
+        default=None,
+        help="Registry requests in flight while pinning (default: 8)",
+    )
+    parser.add_argument(
+        "--pin-ttl",
+        type=int,
+        default=None,
+        help="Seconds a resolved digest is reused from the cache directory (default: 3600)",
+    )
+    parser.add_argument(
+        "--as-of",
+        type=_parse_as_of,
+        default=None,
+        help="Evaluate support on this date (YYYY-MM-DD) instead of today",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=default_directory(),
+        help="Directory caching rendered outputs (default: $MATRIX_RESULT_CACHE_DIR, "
+        "else $RUNNER_TOOL_CACHE when it exists; disabled when neither is set)",
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Total size of cached outputs before least recently used ones are dropped",
+    )
+    return parser
+
+
+def _prepare(parser, args, log=_log):
+    """Validate *args*; return ``(excludes, strength, durations)`` or call ``parser.error``."""
+    try:
+        parse_features(args.features)
+        excludes = parse_excludes(args.combined_exclude)
+        strength = parse_coverage(args.coverage)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.max_jobs < 1:
+        parser.error("--max-jobs must be at least 1")
+    if args.shards < 0:
+        parser.error("--shards must not be negative")
+    if args.forecast_months < 0:
+        parser.error("--forecast-months must not be negative")
+    if args.pin_jobs is not None and args.pin_jobs < 1:
+        parser.error("--pin-jobs must be at least 1")
+    if args.pin_ttl is not None and args.pin_ttl < 0:
+        parser.error("--pin-ttl must not be negative")
+    durations = None
+    if args.timings:
+        if os.path.exists(args.timings):
+            try:
+                durations = DurationModel(load_timings(args.timings))
+            except ValueError as e:
+                parser.error(str(e))
+        else:
+            log(f"::warning::Timing history {args.timings} not found")
+    if args.shards and durations is None:
+        durations = DurationModel({})
+    return excludes, strength, durations
+
+
+def _raise_usage_error(message):
+    raise ValueError(message)
+
 
-    path = os.path.join(Path(__file__).parent.parent, "config")
+def _parse_arguments(argv, log=_log):
+    """``(args, excludes, strength, durations)`` for *argv*; raises ValueError instead of exiting.
 
-    supported_splunk = _generate_supported_splunk(args, path)
-    pprint.pprint(f"Supported Splunk versions: {json.dumps(supported_splunk)}")
-    with open(os.environ["GITHUB_OUTPUT"], "a") as fh:
-        print(f"supportedSplunk={json.dumps(supported_splunk)}", file=fh)
+    Nothing is printed: without ``--help`` the parser has no action writing to
+    stdout, so batch and service output stays clean.
+    """
+    parser = _build_parser(add_help=False)
+    parser.error = _raise_usage_error
+    args = parser.parse_args(argv)
+    return (args, *_prepare(parser, args, log))
 
-    supported_splunk_modinput = _generate_supported_splunk_modinput(args, path)
-    pprint.pprint(
-        f"Supported Splunk versions (modinput): {json.dumps(supported_splunk_modinput)}"
+
+def _pin_images(args, entries, log=_log):
+    """Pin *entries* in place, reusing digests cached next to the rendered outputs."""
+    # Imported here, with its defaults, so runs without --pin-digests never load it.
+    from addonfactory_test_matrix_action import pinning
+
+    cache_path = (
+        os.path.join(args.cache_dir, pinning.CACHE_NAME) if args.cache_dir else None
     )
-    with open(os.environ["GITHUB_OUTPUT"], "a") as fh:
-        print(
-            f"supportedSplunkModinput={json.dumps(supported_splunk_modinput)}", file=fh
+    ttl = pinning.DEFAULT_TTL if args.pin_ttl is None else args.pin_ttl
+    jobs = pinning.DEFAULT_JOBS if args.pin_jobs is None else args.pin_jobs
+    pinned = pinning.pin_entries(
+        entries, pinning.DigestCache(cache_path, ttl), jobs, log=log
+    )
+    log(f"Pinned {pinned} of {len(entries)} image entries")
+
+
+def _render_outputs(args, path, model, excludes, strength, durations, log=_log):
+    """Compute every output for *args* from *model*; returns the GithubOutput."""
+    outputs = GithubOutput()
+
+    supported_splunk = _generate_supported_splunk(args, path, model)
+    if durations is not None:
+        supported_splunk = durations.longest_first(supported_splunk)
+    serialized = outputs.set("supportedSplunk", supported_splunk)
+    log(f"Supported Splunk versions: {serialized}")
+
+    supported_splunk_modinput = _generate_supported_splunk_modinput(args, path, model)
+    if durations is not None:
+        supported_splunk_modinput = durations.longest_first(supported_splunk_modinput)
+    serialized = outputs.set("supportedSplunkModinput", supported_splunk_modinput)
+    log(f"Supported Splunk versions (modinput): {serialized}")
+
+    if args.shards:
+        serialized = outputs.set(
+            "supportedSplunkShards", durations.shard(supported_splunk, args.shards)
+        )
+        log(f"Supported Splunk shards: {serialized}")
+        serialized = outputs.set(
+            "supportedSplunkModinputShards",
+            durations.shard(supported_splunk_modinput, args.shards),
         )
+        log(f"Supported Splunk shards (modinput): {serialized}")
 
     for splunk in supported_splunk:
         if splunk["islatest"]:
-            pprint.pprint(f"Latest Splunk version: {json.dumps([splunk])}")
-            with open(os.environ["GITHUB_OUTPUT"], "a") as fh:
-                print(f"latestSplunk={json.dumps([splunk])}", file=fh)
+            serialized = outputs.set("latestSplunk", [splunk])
+            log(f"Latest Splunk version: {serialized}")
             break
 
-    supported_sc4s = _generate_supported_sc4s(args, path)
-    pprint.pprint(f"Supported SC4S versions: {json.dumps(supported_sc4s)}")
-    with open(os.environ["GITHUB_OUTPUT"], "a") as fh:
-        print(f"supportedSC4S={json.dumps(supported_sc4s)}", file=fh)
-    if os.path.exists("/github/workspace/.vendormatrix"):
-        (
-            supported_modinput_functional_vendors,
-            supported_ui_vendors,
-        ) = _generate_supported_vendors(args, path)
-    else:
-        supported_modinput_functional_vendors, supported_ui_vendors = (
-            [{"version": "", "image": ""}],
-            [{"version": "", "image": ""}],
+    supported_sc4s = _generate_supported_sc4s(args, path, model)
+    (
+        supported_modinput_functional_vendors,
+        supported_ui_vendors,
+    ) = _vendor_outputs(args, path, model)
+    if args.pin_digests:
+        _pin_images(
+            args,
+            supported_sc4s
+            + supported_modinput_functional_vendors
+            + supported_ui_vendors,
+            log,
         )
-    pprint.pprint(
+    serialized = outputs.set("supportedSC4S", supported_sc4s)
+    log(f"Supported SC4S versions: {serialized}")
+    log(
         f"Supported ModInput Functional Vendors {supported_modinput_functional_vendors}"
     )
-    pprint.pprint(f"Supported UI Vendors {supported_ui_vendors}")
-    with open(os.environ["GITHUB_OUTPUT"], "a") as fh:
-        print(
-            f"supportedModinputFunctionalVendors={json.dumps(supported_modinput_functional_vendors)}",
-            file=fh,
+    log(f"Supported UI Vendors {supported_ui_vendors}")
+    outputs.set(
+        "supportedModinputFunctionalVendors", supported_modinput_functional_vendors
+    )
+    outputs.set("supportedUIVendors", supported_ui_vendors)
+
+    axes = [("splunk", supported_splunk_modinput), ("sc4s", supported_sc4s)]
+    if model.vendors is not None:
+        axes.append(("vendor", supported_modinput_functional_vendors))
+    if strength is None:
+        combined, truncated = generate_combined(axes, excludes, args.max_jobs)
+    else:
+        required = [
+            ("splunk", i)
+            for i, splunk in enumerate(supported_splunk_modinput)
+            if splunk["islatest"] or splunk["isoldest"]
+        ]
+        combined, truncated = generate_covering(
+            axes, strength, excludes, args.max_jobs, required
         )
-    with open(os.environ["GITHUB_OUTPUT"], "a") as fh:
-        print(f"supportedUIVendors={json.dumps(supported_ui_vendors)}", file=fh)
+    if truncated:
+        log(f"::warning::combinedMatrix truncated to {args.max_jobs} jobs")
+    serialized = outputs.set("combinedMatrix", combined)
+    log(f"Combined matrix ({len(combined)} jobs): {serialized}")
+
+    if args.forecast_months:
+        forecast = _generate_forecast(args, path, model)
+        serialized = outputs.set("forecast", forecast)
+        log(f"Forecast ({len(forecast) - 1} EOL boundaries): {serialized}")
+
+    return outputs
+
+
+def main():
+    parser = _build_parser()
+    args = parser.parse_args()
+    excludes, strength, durations = _prepare(parser, args)
+
+    path = _config_dir()
+    cache = key = None
+    # Pinned outputs depend on the registries, not only on the inputs hashed here.
+    if args.cache_dir and not args.pin_digests:
+        cache = ResultCache(args.cache_dir, args.cache_max_bytes)
+        inputs = [
+            _splunk_matrix_path(path),
+            os.path.join(path, "SC4S_matrix.conf"),
+            _VENDOR_MATRIX,
+        ]
+        if args.timings:
+            inputs.append(args.timings)
+        arguments = {
+            name: value
+            for name, value in vars(args).items()
+            if name not in ("cache_dir", "cache_max_bytes")
+        }
+        key = cache_key(inputs, arguments, _as_of(args))
+        payload = cache.load(key)
+        if payload is not None:
+            write_atomic(os.environ["GITHUB_OUTPUT"], payload)
+            print(f"Restored outputs from {cache.directory} (key {key[:12]})")
+            return
+
+    model = _load_model(path)
+    outputs = _render_outputs(args, path, model, excludes, strength, durations)
+    payload = outputs.render().encode()
+    write_atomic(os.environ["GITHUB_OUTPUT"], payload)
+    if cache is not None:
+        cache.store(key, payload)
 
 
 if __name__ == "__main__":
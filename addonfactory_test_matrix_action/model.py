@@ -0,0 +1,291 @@
+"""Immutable, type-coerced view of the Splunk, SC4S and vendor matrices.
+
+Every conf file is parsed exactly once per invocation into a ``MatrixModel``;
+the generators in ``main.py`` are projections over it.
+"""
+import bisect
+import re
+from datetime import date, datetime
+from types import MappingProxyType
+
+from addonfactory_test_matrix_action.features import FeatureIndex
+
+_VERSION_SECTION = re.compile(r"^\d+")
+# configparser.ConfigParser.BOOLEAN_STATES, copied so that building the model
+# from a snapshot does not import configparser.
+_BOOLEAN_STATES = {
+    "1": True,
+    "yes": True,
+    "true": True,
+    "on": True,
+    "0": False,
+    "no": False,
+    "false": False,
+    "off": False,
+}
+_DEFAULT_SC4S_REGISTRY = "ghcr.io/splunk/splunk-connect-for-syslog/container"
+
+
+def _coerce(section):
+    """Return the section's options with boolean-looking values converted to bool."""
+    props = {}
+    for key, raw in section.items():
+        props[key] = _BOOLEAN_STATES.get(raw.lower(), raw)
+    return MappingProxyType(props)
+
+
+def _parse_date(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+class _Frozen:
+    __slots__ = ()
+
+    def __init__(self, **values):
+        for name, value in values.items():
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class SplunkVersion(_Frozen):
+    """One ``[X.Y]`` stanza of splunk_matrix.conf."""
+
+    __slots__ = (
+        "section",
+        "version",
+        "build",
+        "supported",
+        "islatest",
+        "isoldest",
+        "server_conf_python_versions",
+        "props",
+    )
+
+    def base_entry(self):
+        return {
+            "version": self.version,
+            "build": self.build,
+            "islatest": self.islatest,
+            "isoldest": self.isoldest,
+        }
+
+
+class SC4SVersion(_Frozen):
+    """One numbered stanza of SC4S_matrix.conf; ``supported`` is None for ROLLING."""
+
+    __slots__ = ("section", "version", "docker_registry", "supported", "props")
+
+    def entry(self):
+        return {"version": self.version, "docker_registry": self.docker_registry}
+
+
+class VendorVersion(_Frozen):
+    """One numbered stanza of the add-on's .vendormatrix."""
+
+    __slots__ = ("section", "version", "image", "modinput_functional", "ui", "props")
+
+    def entry(self):
+        return {"version": self.version, "image": self.image}
+
+
+class MatrixModel(_Frozen):
+    """All matrices of one invocation; ``vendors`` is None without a .vendormatrix.
+
+    ``eol_timeline`` holds ``(supported, section)`` pairs of the Splunk versions
+    sorted by end-of-life date; ``feature_index`` holds their boolean flags.
+    ``splunk_timeline`` and ``sc4s_timeline`` hold ``(supported, position)``
+    pairs, sorted the same way, for the ``*_supported_on`` queries; ROLLING
+    SC4S versions sort last as ``date.max``.
+    """
+
+    __slots__ = (
+        "latest",
+        "oldest",
+        "splunk",
+        "sc4s",
+        "vendors",
+        "eol_timeline",
+        "feature_index",
+        "splunk_timeline",
+        "sc4s_timeline",
+    )
+
+    @classmethod
+    def from_configs(cls, splunk_config, sc4s_config=None, vendors_config=None):
+        splunk = _build_splunk(splunk_config)
+        sc4s = _build_sc4s(sc4s_config) if sc4s_config is not None else ()
+        return cls(
+            latest=splunk_config.get("GENERAL", "LATEST", fallback=None),
+            oldest=splunk_config.get("GENERAL", "OLDEST", fallback=None),
+            splunk=splunk,
+            sc4s=sc4s,
+            vendors=(
+                _build_vendors(vendors_config) if vendors_config is not None else None
+            ),
+            eol_timeline=_eol_timeline(splunk),
+            feature_index=FeatureIndex(splunk),
+            splunk_timeline=_position_timeline(splunk),
+            sc4s_timeline=_position_timeline(sc4s),
+        )
+
+    def splunk_supported_on(self, day):
+        """Positions in ``splunk`` of the versions whose support ends after *day*, ascending.
+
+        A bisect locates the first of them; the cost is O(log n + k log k)
+        for k supported versions, independent of the expired ones.
+        """
+        return _supported_on(self.splunk_timeline, day)
+
+    def sc4s_supported_on(self, day):
+        """Positions in ``sc4s`` of the versions supported after *day*, ascending; see above."""
+        return _supported_on(self.sc4s_timeline, day)
+
+    def with_vendors(self, vendors_config):
+        """A copy of the model with ``vendors`` built from another .vendormatrix (or None)."""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values["vendors"] = (
+            _build_vendors(vendors_config) if vendors_config is not None else None
+        )
+        return type(self)(**values)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, vendors_config=None):
+        """Rebuild the model from a dict produced by ``snapshot.compile_snapshot``."""
+        latest = snapshot["latest"]
+        oldest = snapshot["oldest"]
+        splunk = tuple(
+            SplunkVersion(
+                section=entry["section"],
+                version=entry["version"],
+                build=entry["build"],
+                supported=date.fromisoformat(entry["supported"]),
+                islatest=(latest == entry["section"]),
+                isoldest=(oldest == entry["section"]),
+                server_conf_python_versions=tuple(entry["server_conf_python_versions"]),
+                props=MappingProxyType(entry["props"]),
+            )
+            for entry in snapshot["splunk"]
+        )
+        sc4s = tuple(
+            SC4SVersion(
+                section=entry["section"],
+                version=entry["version"],
+                docker_registry=entry["docker_registry"],
+                supported=(
+                    date.fromisoformat(entry["supported"])
+                    if entry["supported"] is not None
+                    else None
+                ),
+                props=MappingProxyType(entry["props"]),
+            )
+            for entry in snapshot["sc4s"]
+        )
+        return cls(
+            latest=latest,
+            oldest=oldest,
+            splunk=splunk,
+            sc4s=sc4s,
+            vendors=(
+                _build_vendors(vendors_config) if vendors_config is not None else None
+            ),
+            eol_timeline=tuple(
+                (date.fromisoformat(supported), section)
+                for supported, section in snapshot["eol_timeline"]
+            ),
+            feature_index=FeatureIndex(splunk),
+            splunk_timeline=_position_timeline(splunk),
+            sc4s_timeline=_position_timeline(sc4s),
+        )
+
+
+def _version_sections(config):
+    return [s for s in config.sections() if _VERSION_SECTION.search(s)]
+
+
+def _build_splunk(config):
+    latest = config.get("GENERAL", "LATEST", fallback=None)
+    oldest = config.get("GENERAL", "OLDEST", fallback=None)
+    versions = []
+    for section in _version_sections(config):
+        props = _coerce(config[section])
+        raw = props.get("server_conf_python_versions")
+        versions.append(
+            SplunkVersion(
+                section=section,
+                version=props["version"],
+                build=props["build"],
+                supported=_parse_date(props["supported"]),
+                islatest=(latest == section),
+                isoldest=(oldest == section),
+                server_conf_python_versions=(
+                    tuple(v.strip() for v in raw.split(","))
+                    if isinstance(raw, str) and raw
+                    else ()
+                ),
+                props=props,
+            )
+        )
+    return tuple(versions)
+
+
+def _eol_timeline(splunk):
+    return tuple(sorted((version.supported, version.section) for version in splunk))
+
+
+def _position_timeline(versions):
+    return tuple(
+        sorted(
+            (date.max if version.supported is None else version.supported, position)
+            for position, version in enumerate(versions)
+        )
+    )
+
+
+def _supported_on(timeline, day):
+    # (day, len(timeline)) sorts after every entry ending on *day*.
+    start = bisect.bisect_right(timeline, (day, len(timeline)))
+    return sorted(position for _, position in timeline[start:])
+
+
+def _build_sc4s(config):
+    versions = []
+    for section in _version_sections(config):
+        props = _coerce(config[section])
+        supported = props.get("supported", "ROLLING")
+        versions.append(
+            SC4SVersion(
+                section=section,
+                version=props["version"],
+                docker_registry=props.get("docker_registry") or _DEFAULT_SC4S_REGISTRY,
+                supported=None if supported == "ROLLING" else _parse_date(supported),
+                props=props,
+            )
+        )
+    return tuple(versions)
+
+
+def _build_vendors(config):
+    versions = []
+    for section in _version_sections(config):
+        props = _coerce(config[section])
+        versions.append(
+            VendorVersion(
+                section=section,
+                version=props["version"],
+                image=props.get("docker_image"),
+                modinput_functional=props.get("trigger_modinput_functional")
+                is not False,
+                ui=props.get("trigger_ui") is not False,
+                props=props,
+            )
+        )
+    return tuple(versions)
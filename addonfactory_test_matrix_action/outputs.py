@@ -0,0 +1,75 @@
+"""Buffered writer for the step's GITHUB_OUTPUT file."""
+import json
+import os
+
+# Values longer than this use the ``key<<DELIMITER`` multiline syntax.
+_MULTILINE_THRESHOLD = 1024
+
+
+class GithubOutput:
+    """Collects step outputs in memory and writes them to GITHUB_OUTPUT at once."""
+
+    def __init__(self):
+        self._values = {}
+
+    def set(self, key, value):
+        """Serialize *value* (JSON unless already a str) and return the serialized text."""
+        serialized = value if isinstance(value, str) else json.dumps(value)
+        self._values[key] = serialized
+        return serialized
+
+    def __contains__(self, key):
+        return key in self._values
+
+    def items(self):
+        """``(key, serialized value)`` pairs in the order they were set."""
+        return self._values.items()
+
+    def render(self):
+        chunks = []
+        for key, value in self._values.items():
+            if "\n" in value or len(value) > _MULTILINE_THRESHOLD:
+                import uuid
+
+                delimiter = f"ghadelimiter_{uuid.uuid4().hex}"
+                chunks.append(f"{key}<<{delimiter}\n{value}\n{delimiter}\n")
+            else:
+                chunks.append(f"{key}={value}\n")
+        return "".join(chunks)
+
+    def write(self, path):
+        write_atomic(path, self.render().encode())
+
+
+def write_atomic(path, payload):
+    """Append *payload* to *path* so readers see either the old or the new file.
+
+    The existing content plus *payload* goes to a temporary file in the same
+    directory, which is fsync'ed and then renamed over *path*.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        with open(path, "rb") as fh:
+            existing = fh.read()
+        mode = os.stat(path).st_mode & 0o777
+    except FileNotFoundError:
+        existing = b""
+        mode = 0o644
+    # Same as tempfile.mkstemp, without importing tempfile on the startup path.
+    tmp_path = os.path.join(directory, f".github_output.{os.urandom(8).hex()}")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            fh.write(existing + payload)
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    dir_fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
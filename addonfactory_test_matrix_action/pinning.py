@@ -0,0 +1,195 @@
+"""Pin the SC4S and vendor images of the outputs to manifest digests.
+
+``supportedSC4S`` and the vendor outputs name images by tag, which every job
+would resolve on its own. With ``--pin-digests`` the distinct references are
+resolved once, concurrently, with manifest HEAD requests to their registries,
+and every entry gains ``pinned_image``: ``<reference>@sha256:...``.
+
+Resolved digests are kept in a JSON file for ``--pin-ttl`` seconds, so runs
+close together agree and skip the registries. A reference that cannot be
+resolved keeps its tag and logs a warning; pinning never fails the step.
+"""
+import json
+import os
+import re
+import time
+
+DEFAULT_JOBS = 8
+DEFAULT_TTL = 3600
+CACHE_NAME = "digests.json"
+
+_DOCKER_HUB = "registry-1.docker.io"
+# Multi-arch indexes first: their digest is what ``docker pull`` records.
+_MANIFEST_ACCEPT = ", ".join(
+    [
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.v2+json",
+    ]
+)
+_CHALLENGE_PARAM = re.compile(r'(\w+)="([^"]*)"')
+
+
+def image_reference(entry):
+    """The image an SC4S or vendor *entry* names, or None for the empty placeholder."""
+    if "docker_registry" in entry:
+        return f"{entry['docker_registry']}:{entry['version']}"
+    return entry.get("image") or None
+
+
+def split_reference(reference):
+    """``(registry, repository, tag)`` of *reference*, with Docker Hub defaults filled in."""
+    if "@" in reference:
+        raise ValueError(f"{reference} is already pinned")
+    name, tag = reference, "latest"
+    if reference.rfind(":") > reference.rfind("/"):
+        name, tag = reference.rsplit(":", 1)
+    first, _, rest = name.partition("/")
+    if rest and ("." in first or ":" in first or first == "localhost"):
+        return first, rest, tag
+    return _DOCKER_HUB, name if rest else f"library/{name}", tag
+
+
+def _anonymous_token(challenge, timeout):
+    """Fetch a pull token for a ``WWW-Authenticate: Bearer`` *challenge*."""
+    import urllib.parse
+    import urllib.request
+
+    scheme, _, params = challenge.partition(" ")
+    params = dict(_CHALLENGE_PARAM.findall(params))
+    if scheme.lower() != "bearer" or "realm" not in params:
+        raise ValueError(f"unsupported authentication challenge {challenge!r}")
+    realm = params.pop("realm")
+    url = f"{realm}?{urllib.parse.urlencode(params)}" if params else realm
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        body = json.load(response)
+    return body.get("token") or body["access_token"]
+
+
+def resolve_digest(reference, timeout=10, scheme="https"):
+    """Return the manifest digest *reference* points to, from a HEAD request.
+
+    Registries asking for a bearer token (Docker Hub, ghcr.io) get an
+    anonymous pull token. Raises OSError on network and HTTP errors.
+    """
+    import urllib.error
+    import urllib.request
+
+    registry, repository, tag = split_reference(reference)
+    url = f"{scheme}://{registry}/v2/{repository}/manifests/{tag}"
+    headers = {"Accept": _MANIFEST_ACCEPT}
+    for attempt in range(2):
+        request = urllib.request.Request(url, headers=headers, method="HEAD")
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                digest = response.headers.get("Docker-Content-Digest")
+        except urllib.error.HTTPError as e:
+            if e.code != 401 or attempt:
+                raise
+            challenge = e.headers.get("WWW-Authenticate", "")
+            headers["Authorization"] = f"Bearer {_anonymous_token(challenge, timeout)}"
+            continue
+        if not digest:
+            raise ValueError(f"{registry} sent no Docker-Content-Digest")
+        return digest
+
+
+class DigestCache:
+    """``reference -> {"digest", "resolved"}`` in one JSON file; entries expire after *ttl* seconds.
+
+    With no *path* the cache only lives for the run. Like ResultCache, a file
+    that cannot be read or written only costs the requests it would have saved.
+    """
+
+    def __init__(self, path=None, ttl=DEFAULT_TTL, clock=time.time):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = {}
+        self._dirty = False
+        if path:
+            try:
+                with open(path) as fh:
+                    entries = json.load(fh)
+                if isinstance(entries, dict):
+                    self._entries = entries
+            except (OSError, ValueError):
+                pass
+
+    def get(self, reference):
+        entry = self._entries.get(reference)
+        if not isinstance(entry, dict) or "resolved" not in entry:
+            return None
+        if self.clock() - entry["resolved"] >= self.ttl:
+            return None
+        return entry.get("digest")
+
+    def put(self, reference, digest):
+        self._entries[reference] = {"digest": digest, "resolved": self.clock()}
+        self._dirty = True
+
+    def save(self):
+        """Write the entries still fresh back to the file, if any changed."""
+        if not self.path or not self._dirty:
+            return
+        now = self.clock()
+        entries = {
+            reference: entry
+            for reference, entry in self._entries.items()
+            if isinstance(entry, dict) and now - entry.get("resolved", 0) < self.ttl
+        }
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(tmp_path, "w") as fh:
+                json.dump(entries, fh, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            return
+        self._dirty = False
+
+
+def pin_entries(entries, cache, jobs=DEFAULT_JOBS, resolve=None, log=print):
+    """Add ``pinned_image`` to every entry of *entries* whose image resolves.
+
+    Each distinct reference not in *cache* is resolved once, by up to *jobs*
+    threads, with *resolve* (default: resolve_digest). Returns the number of
+    entries pinned.
+    """
+    resolve = resolve or resolve_digest
+    entries = list(entries)
+    references = {id(entry): image_reference(entry) for entry in entries}
+    digests = {}
+    missing = []
+    for reference in dict.fromkeys(filter(None, references.values())):
+        digest = cache.get(reference)
+        if digest:
+            digests[reference] = digest
+        else:
+            missing.append(reference)
+
+    def attempt(reference):
+        try:
+            return resolve(reference)
+        except (OSError, ValueError, KeyError) as e:
+            log(f"::warning::Could not resolve the digest of {reference}: {e}")
+            return None
+
+    if missing:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(min(jobs, len(missing))) as pool:
+            for reference, digest in zip(missing, pool.map(attempt, missing)):
+                if digest:
+                    digests[reference] = digest
+                    cache.put(reference, digest)
+        cache.save()
+
+    pinned = 0
+    for entry in entries:
+        reference = references[id(entry)]
+        if reference in digests:
+            entry["pinned_image"] = f"{reference}@{digests[reference]}"
+            pinned += 1
+    return pinned
@@ -0,0 +1,133 @@
+"""Cache of rendered GITHUB_OUTPUT payloads.
+
+The action's outputs are a pure function of the conf files, the add-on's
+.vendormatrix, the command-line arguments, the action's own code and today's
+date, so a payload is stored under a sha256 of exactly those inputs. Entries
+are files in one directory; reading an entry refreshes its mtime and the least
+recently used entries are removed once the directory exceeds ``max_bytes``.
+"""
+import hashlib
+import json
+import os
+
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+_SUFFIX = ".out"
+_TOOL_CACHE_NAME = "addonfactory-test-matrix-action"
+
+
+def default_directory():
+    """$MATRIX_RESULT_CACHE_DIR, else a directory in an existing $RUNNER_TOOL_CACHE, else None."""
+    directory = os.environ.get("MATRIX_RESULT_CACHE_DIR")
+    if directory:
+        return directory
+    tool_cache = os.environ.get("RUNNER_TOOL_CACHE")
+    if tool_cache and os.path.isdir(tool_cache):
+        return os.path.join(tool_cache, _TOOL_CACHE_NAME, "results")
+    return None
+
+
+def _package_sources(package_dir):
+    if os.path.isdir(package_dir):
+        names = os.listdir(package_dir)
+    else:
+        # Running from the zipapp: the package directory lives in the archive.
+        import zipfile
+
+        archive, package = os.path.split(package_dir)
+        with zipfile.ZipFile(archive) as zf:
+            names = [
+                name.split("/", 1)[1]
+                for name in zf.namelist()
+                if name.startswith(f"{package}/") and name.count("/") == 1
+            ]
+    return sorted(name for name in names if name.endswith(".py"))
+
+
+def code_digest():
+    """sha256 over the sources of this package, so a new action version never hits old entries."""
+    digest = hashlib.sha256()
+    package_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in _package_sources(package_dir):
+        data = __loader__.get_data(os.path.join(package_dir, name))
+        digest.update(f"{name}\0{len(data)}\0".encode())
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def cache_key(files, arguments, today):
+    """Hash the content of *files* (missing ones included as such), *arguments* and *today*.
+
+    *arguments* is serialized as JSON; values JSON does not know (dates) use str().
+    """
+    digest = hashlib.sha256(code_digest().encode())
+    for path in files:
+        try:
+            with open(path, "rb") as fh:
+                data = fh.read()
+        except OSError:
+            digest.update(b"\0missing\0")
+            continue
+        digest.update(f"\0{len(data)}\0".encode())
+        digest.update(data)
+    digest.update(json.dumps(arguments, sort_keys=True, default=str).encode())
+    digest.update(today.isoformat().encode())
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """Directory of ``<key>.out`` payloads bounded by *max_bytes*.
+
+    Every operation swallows OSError: a cache that cannot be read or written
+    only costs the time it would have saved.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def load(self, key):
+        """Return the payload stored under *key* and mark it as recently used, or None."""
+        path = self._path(key)
+        try:
+            with open(path, "rb") as fh:
+                payload = fh.read()
+            os.utime(path)
+        except OSError:
+            return None
+        return payload
+
+    def store(self, key, payload):
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until the total size fits *max_bytes*."""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(_SUFFIX):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
@@ -0,0 +1,74 @@
+"""Duration-aware ordering and sharding of matrix entries (``--timings``).
+
+The timing history is a JSON object of past durations in seconds keyed by
+``"<version>/<build>/<serverConfPythonVersion>"``; the variant part may be
+empty or left out (``"<version>/<build>"``) and a bare ``"<version>"`` acts as
+a fallback for every build of that version. Entries without any history are
+estimated at the median of the known durations.
+"""
+import heapq
+import json
+
+
+def load_timings(path):
+    """Read a timing history file; raises ValueError if it is not a JSON object of numbers."""
+    with open(path) as fh:
+        try:
+            timings = json.load(fh)
+        except ValueError as e:
+            raise ValueError(f"Invalid timing history {path}: {e}") from None
+    if not isinstance(timings, dict) or not all(
+        isinstance(value, (int, float)) and not isinstance(value, bool) and value >= 0
+        for value in timings.values()
+    ):
+        raise ValueError(
+            f"Invalid timing history {path}: expected an object of non-negative durations"
+        )
+    return timings
+
+
+def entry_key(entry):
+    """The timing key of a supportedSplunk(Modinput) entry."""
+    variant = entry.get("serverConfPythonVersion", "")
+    return f"{entry['version']}/{entry['build']}/{variant}"
+
+
+class DurationModel:
+    """Estimated duration of each matrix entry from a timing history."""
+
+    def __init__(self, timings):
+        self.timings = timings
+        known = sorted(timings.values())
+        self.default = known[len(known) // 2] if known else 0
+
+    def estimate(self, entry):
+        key = entry_key(entry)
+        for candidate in (key, key.rsplit("/", 1)[0], entry["version"]):
+            if candidate in self.timings:
+                return self.timings[candidate]
+        return self.default
+
+    def longest_first(self, entries):
+        """Return *entries* sorted by descending duration; ties keep their order."""
+        return sorted(entries, key=self.estimate, reverse=True)
+
+    def shard(self, entries, count):
+        """Pack *entries* into *count* shards with the longest-processing-time rule.
+
+        Each entry goes, longest first, to the shard with the smallest total so
+        far (lowest index on ties). Empty shards are dropped.
+        """
+        shards = [[] for _ in range(count)]
+        totals = [0] * count
+        heap = [(0, index) for index in range(count)]
+        for entry in self.longest_first(entries):
+            total, index = heapq.heappop(heap)
+            duration = self.estimate(entry)
+            shards[index].append(entry)
+            totals[index] = total + duration
+            heapq.heappush(heap, (total + duration, index))
+        return [
+            {"index": index, "estimatedSeconds": totals[index], "entries": shard}
+            for index, shard in enumerate(shards)
+            if shard
+        ]
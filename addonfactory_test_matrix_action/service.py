@@ -0,0 +1,339 @@
+"""Long-lived matrix service for self-hosted runner pools.
+
+``serve`` keeps the parsed matrices in memory and answers over HTTP, on a TCP
+``host:port`` or a ``unix:/path`` socket:
+
+* ``GET /splunk``, ``/splunk-modinput``, ``/sc4s`` and ``/vendors`` return the
+  matching output, with ``features`` and ``as_of`` as query parameters;
+* ``POST /outputs`` takes ``{"argv": [...], "vendormatrix": text or null}``
+  and returns ``{"outputs": <GITHUB_OUTPUT text>, "log": [...]}`` for the same
+  arguments as ``main``.
+
+Before each request the conf files are stat'ed; the model is rebuilt only when
+one of them changed and its content hash differs from the loaded one.
+
+``client`` is the thin entry point for jobs: it sends its arguments and the
+workspace's .vendormatrix to the service and appends the result to
+GITHUB_OUTPUT. It exits with status 3 when the service cannot answer, so the
+caller can fall back to running ``main`` itself.
+"""
+import argparse
+import configparser
+import hashlib
+import http.client
+import json
+import os
+import socket
+import socketserver
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from addonfactory_test_matrix_action import main as matrix
+from addonfactory_test_matrix_action.outputs import write_atomic
+from addonfactory_test_matrix_action.snapshot import SNAPSHOT_NAME
+
+_UNIX_PREFIX = "unix:"
+# Exit status of ``client`` when the service is unreachable or rejects the call.
+UNAVAILABLE = 3
+
+
+class ModelHolder:
+    """The matrix model of *path*, reloaded when its conf files change."""
+
+    def __init__(self, path, vendors_matrix=matrix._VENDOR_MATRIX):
+        self.path = path
+        self.vendors_matrix = vendors_matrix
+        self._lock = threading.Lock()
+        self._stamp = None
+        self._digest = None
+        self._model = None
+        self.reloads = 0
+
+    def _files(self):
+        return (
+            matrix._splunk_matrix_path(self.path),
+            os.path.join(self.path, "SC4S_matrix.conf"),
+            os.path.join(self.path, SNAPSHOT_NAME),
+            self.vendors_matrix,
+        )
+
+    def _stat(self):
+        stamp = []
+        for path in self._files():
+            try:
+                st = os.stat(path)
+            except OSError:
+                stamp.append(None)
+            else:
+                stamp.append((st.st_ino, st.st_size, st.st_mtime_ns))
+        return tuple(stamp)
+
+    def _hash(self):
+        digest = hashlib.sha256()
+        for path in self._files():
+            try:
+                with open(path, "rb") as fh:
+                    data = fh.read()
+            except OSError:
+                digest.update(b"\0missing\0")
+                continue
+            digest.update(f"\0{len(data)}\0".encode())
+            digest.update(data)
+        return digest.hexdigest()
+
+    def model(self):
+        """Return the current model; a touched but unchanged file does not reload it."""
+        with self._lock:
+            stamp = self._stat()
+            if stamp != self._stamp:
+                digest = self._hash()
+                if digest != self._digest:
+                    self._model = matrix._load_model(self.path, self.vendors_matrix)
+                    self._digest = digest
+                    self.reloads += 1
+                self._stamp = stamp
+            return self._model
+
+
+class RequestError(ValueError):
+    """A request the service rejects with 400 Bad Request."""
+
+
+class UnknownEndpoint(KeyError):
+    """A path the service answers with 404 Not Found."""
+
+
+def _query_args(query):
+    values = {name: items[-1] for name, items in parse_qs(query).items()}
+    args = argparse.Namespace(features=values.get("features") or None, as_of=None)
+    try:
+        matrix.parse_features(args.features)
+        if values.get("as_of"):
+            args.as_of = matrix._parse_as_of(values["as_of"])
+    except (ValueError, argparse.ArgumentTypeError) as e:
+        raise RequestError(str(e)) from None
+    return args
+
+
+def query(holder, endpoint, query_string=""):
+    """Answer ``GET <endpoint>?<query_string>``; raises UnknownEndpoint for an unknown one."""
+    args = _query_args(query_string)
+    model = holder.model()
+    if endpoint == "/splunk":
+        return matrix._generate_supported_splunk(args, holder.path, model)
+    if endpoint == "/splunk-modinput":
+        return matrix._generate_supported_splunk_modinput(args, holder.path, model)
+    if endpoint == "/sc4s":
+        return matrix._generate_supported_sc4s(args, holder.path, model)
+    if endpoint == "/vendors":
+        modinput_functional, ui = matrix._vendor_outputs(args, holder.path, model)
+        return {
+            "supportedModinputFunctionalVendors": modinput_functional,
+            "supportedUIVendors": ui,
+        }
+    raise UnknownEndpoint(endpoint)
+
+
+def render(holder, argv, vendormatrix=None):
+    """Return ``(outputs text, log lines)`` of ``main`` for *argv*.
+
+    *vendormatrix* is the content of the job's .vendormatrix, or None when the
+    job has none.
+    """
+    if "--timings" in argv or any(arg.startswith("--timings=") for arg in argv):
+        raise RequestError("--timings refers to the job's workspace; run locally")
+    try:
+        args, excludes, strength, durations = matrix._parse_arguments(argv)
+    except ValueError as e:
+        raise RequestError(str(e)) from None
+    vendors_config = None
+    if vendormatrix is not None:
+        vendors_config = configparser.ConfigParser()
+        try:
+            vendors_config.read_string(vendormatrix)
+        except configparser.Error as e:
+            raise RequestError(f"Invalid .vendormatrix: {e}") from None
+    model = holder.model().with_vendors(vendors_config)
+    log = []
+    outputs = matrix._render_outputs(
+        args, holder.path, model, excludes, strength, durations, log.append
+    )
+    return outputs.render(), log
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "addonfactory-test-matrix-service"
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _answer(self, produce):
+        try:
+            self._send(200, produce())
+        except UnknownEndpoint:
+            self._send(404, {"error": f"unknown endpoint {self.path}"})
+        except RequestError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            # Answer instead of dropping the connection; the client falls back.
+            self.log_error("error answering %s: %r", self.path, e)
+            self._send(500, {"error": f"internal error: {e}"})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        self._answer(lambda: query(self.server.holder, url.path, url.query))
+
+    def do_POST(self):
+        def produce():
+            if urlsplit(self.path).path != "/outputs":
+                raise UnknownEndpoint(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                request = json.loads(self.rfile.read(length))
+                argv = [str(arg) for arg in request.get("argv", [])]
+            except (ValueError, AttributeError, TypeError):
+                raise RequestError("expected {'argv': [...], 'vendormatrix': ...}")
+            text, log = render(self.server.holder, argv, request.get("vendormatrix"))
+            return {"outputs": text, "log": log}
+
+        self._answer(produce)
+
+    def address_string(self):
+        # Unix socket peers have no address.
+        return self.client_address[0] if self.client_address else "unix"
+
+
+class _ThreadingUnixHTTPServer(
+    socketserver.ThreadingMixIn, socketserver.UnixStreamServer
+):
+    daemon_threads = True
+
+
+def make_server(address, holder):
+    """Bind a threading HTTP server for ``host:port`` or ``unix:/path``."""
+    if address.startswith(_UNIX_PREFIX):
+        socket_path = address[len(_UNIX_PREFIX) :]
+        try:
+            os.unlink(socket_path)
+        except FileNotFoundError:
+            pass
+        server = _ThreadingUnixHTTPServer(socket_path, _Handler)
+    else:
+        host, _, port = address.rpartition(":")
+        server = ThreadingHTTPServer((host or "127.0.0.1", int(port)), _Handler)
+    server.holder = holder
+    return server
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path, timeout):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def _connection(address, timeout):
+    if address.startswith(_UNIX_PREFIX):
+        return _UnixHTTPConnection(address[len(_UNIX_PREFIX) :], timeout)
+    address = address.split("://", 1)[-1].rstrip("/")
+    return http.client.HTTPConnection(address, timeout=timeout)
+
+
+def fetch_outputs(address, argv, vendormatrix=None, timeout=10):
+    """POST /outputs to the service at *address*; returns ``(outputs text, log lines)``.
+
+    Raises OSError if the service is unreachable and RequestError if it rejects
+    the arguments.
+    """
+    body = json.dumps({"argv": list(argv), "vendormatrix": vendormatrix})
+    connection = _connection(address, timeout)
+    try:
+        connection.request(
+            "POST", "/outputs", body, {"Content-Type": "application/json"}
+        )
+        response = connection.getresponse()
+        answer = json.loads(response.read())
+    except (http.client.HTTPException, ValueError) as e:
+        raise OSError(f"Invalid answer from {address}: {e}") from None
+    finally:
+        connection.close()
+    if response.status != 200:
+        raise RequestError(answer.get("error", f"HTTP {response.status}"))
+    return answer["outputs"], answer["log"]
+
+
+def _serve(options):
+    holder = ModelHolder(options.config or matrix._config_dir(), options.vendormatrix)
+    holder.model()
+    server = make_server(options.listen, holder)
+    print(f"Serving the matrix of {holder.path} on {options.listen}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def _client(options, argv):
+    try:
+        with open(options.vendormatrix) as fh:
+            vendormatrix = fh.read()
+    except FileNotFoundError:
+        vendormatrix = None
+    try:
+        text, log = fetch_outputs(options.service, argv, vendormatrix, options.timeout)
+    except (OSError, RequestError) as e:
+        print(f"::warning::Matrix service {options.service} unavailable: {e}")
+        return UNAVAILABLE
+    for line in log:
+        matrix._log(line)
+    write_atomic(os.environ["GITHUB_OUTPUT"], text.encode())
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Matrix service and its client")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser(
+        "serve", help="Keep the matrix in memory and answer over HTTP"
+    )
+    serve.add_argument(
+        "--listen",
+        default="127.0.0.1:8765",
+        help="host:port or unix:/path/to/socket",
+    )
+    serve.add_argument("--config", help="Config directory (default: the bundled one)")
+    serve.add_argument(
+        "--vendormatrix",
+        default=matrix._VENDOR_MATRIX,
+        help=".vendormatrix for GET /vendors",
+    )
+    client = commands.add_parser(
+        "client",
+        allow_abbrev=False,
+        help="Write GITHUB_OUTPUT from a running service; other arguments go to main",
+    )
+    client.add_argument("--service", required=True, help="host:port or unix:/path")
+    client.add_argument("--vendormatrix", default=matrix._VENDOR_MATRIX)
+    client.add_argument("--timeout", type=float, default=10)
+    options, rest = parser.parse_known_args(argv)
+    if options.command == "serve":
+        if rest:
+            parser.error(f"unrecognized arguments: {' '.join(rest)}")
+        return _serve(options)
+    return _client(options, rest)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
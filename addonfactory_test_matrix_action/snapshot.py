@@ -0,0 +1,135 @@
+"""Precompiled JSON snapshot of the bundled Splunk and SC4S matrices.
+
+The snapshot is built once when the action's image is built
+(``python -m addonfactory_test_matrix_action.snapshot /config``) and carries a
+hash of the conf files it was compiled from; ``main`` uses it only while that
+hash still matches and parses the conf files otherwise.
+"""
+import hashlib
+import json
+import os
+
+from addonfactory_test_matrix_action.model import MatrixModel
+
+SNAPSHOT_NAME = "matrix_snapshot.json"
+SNAPSHOT_FORMAT = 1
+
+
+def source_hash(splunk_matrix, sc4s_matrix):
+    """Return the sha256 over both conf files, or None if either is missing."""
+    digest = hashlib.sha256()
+    for path in (splunk_matrix, sc4s_matrix):
+        try:
+            with open(path, "rb") as fh:
+                content = fh.read()
+        except FileNotFoundError:
+            return None
+        digest.update(len(content).to_bytes(8, "big"))
+        digest.update(content)
+    return digest.hexdigest()
+
+
+def _validate(model):
+    sections = {splunk.section for splunk in model.splunk}
+    if not sections:
+        raise ValueError("splunk_matrix.conf defines no version stanzas")
+    for name, section in (("LATEST", model.latest), ("OLDEST", model.oldest)):
+        if section not in sections:
+            raise ValueError(f"[GENERAL] {name} = {section!r} has no matching stanza")
+
+
+def compile_snapshot(splunk_matrix, sc4s_matrix):
+    """Parse and validate both conf files and return the JSON-serializable snapshot."""
+    digest = source_hash(splunk_matrix, sc4s_matrix)
+    if digest is None:
+        raise FileNotFoundError(f"{splunk_matrix} and {sc4s_matrix} must both exist")
+    import configparser
+
+    splunk_config = configparser.ConfigParser()
+    splunk_config.read(splunk_matrix)
+    sc4s_config = configparser.ConfigParser()
+    sc4s_config.read(sc4s_matrix)
+    model = MatrixModel.from_configs(splunk_config, sc4s_config)
+    _validate(model)
+    return {
+        "format": SNAPSHOT_FORMAT,
+        "source_hash": digest,
+        "latest": model.latest,
+        "oldest": model.oldest,
+        "splunk": [
+            {
+                "section": splunk.section,
+                "version": splunk.version,
+                "build": splunk.build,
+                "supported": splunk.supported.isoformat(),
+                "server_conf_python_versions": list(splunk.server_conf_python_versions),
+                "props": dict(splunk.props),
+            }
+            for splunk in model.splunk
+        ],
+        "sc4s": [
+            {
+                "section": sc4s.section,
+                "version": sc4s.version,
+                "docker_registry": sc4s.docker_registry,
+                "supported": (
+                    sc4s.supported.isoformat() if sc4s.supported is not None else None
+                ),
+                "props": dict(sc4s.props),
+            }
+            for sc4s in model.sc4s
+        ],
+        "eol_timeline": [
+            [supported.isoformat(), section]
+            for supported, section in model.eol_timeline
+        ],
+    }
+
+
+def load_snapshot(snapshot_path, splunk_matrix, sc4s_matrix):
+    """Return the snapshot at *snapshot_path* if it was compiled from the given files.
+
+    Returns None when the snapshot is missing, unreadable, of another format or
+    stale, so the caller can fall back to parsing the conf files.
+    """
+    try:
+        with open(snapshot_path, "rb") as fh:
+            snapshot = json.loads(fh.read())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        return None
+    digest = snapshot.get("source_hash")
+    if digest is None or digest != source_hash(splunk_matrix, sc4s_matrix):
+        return None
+    return snapshot
+
+
+def write_snapshot(config_dir):
+    """Compile the conf files in *config_dir* into ``config_dir/matrix_snapshot.json``."""
+    snapshot = compile_snapshot(
+        os.path.join(config_dir, "splunk_matrix.conf"),
+        os.path.join(config_dir, "SC4S_matrix.conf"),
+    )
+    path = os.path.join(config_dir, SNAPSHOT_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(snapshot, fh, separators=(",", ":"))
+    os.replace(tmp_path, path)
+    return path
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compile the matrix snapshot")
+    parser.add_argument(
+        "config_dir",
+        help="Directory holding splunk_matrix.conf and SC4S_matrix.conf",
+    )
+    args = parser.parse_args()
+    print(write_snapshot(args.config_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Covering-array size and build time versus the full combined product.
+
+Usage: python benchmarks/bench_covering.py [values per axis ...]
+Also collected by the pytest-benchmark suite (python -m pytest benchmarks).
+"""
+import math
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from addonfactory_test_matrix_action.covering import generate_covering  # noqa: E402
+
+# Splunk variants, SC4S, modinput vendors, UI vendors.
+AXIS_SHAPES = {10: (10, 3, 10, 10), 30: (30, 5, 30, 30), 50: (50, 5, 50, 50)}
+
+
+def axes(sizes):
+    return [
+        (name, [{"version": f"{name}-{v}"} for v in range(size)])
+        for name, size in zip(("splunk", "sc4s", "vendor", "ui_vendor"), sizes)
+    ]
+
+
+@pytest.mark.parametrize("values", sorted(AXIS_SHAPES))
+@pytest.mark.parametrize("strength", [2, 3])
+def bench_covering(benchmark, values, strength):
+    sizes = AXIS_SHAPES[values]
+    if strength == 3 and values > 10:
+        pytest.skip("t=3 over 30+ values per axis is not a CI-sized matrix")
+    jobs, _ = benchmark.pedantic(
+        generate_covering, (axes(sizes), strength), rounds=3, iterations=1
+    )
+    benchmark.extra_info["jobs"] = len(jobs)
+    benchmark.extra_info["full_product"] = math.prod(sizes)
+
+
+def run(values):
+    sizes = AXIS_SHAPES.get(values, (values, 5, values, values))
+    full = math.prod(sizes)
+    for strength in (2, 3):
+        start = time.perf_counter()
+        jobs, _ = generate_covering(axes(sizes), strength)
+        elapsed = time.perf_counter() - start
+        print(
+            f"axes {sizes}  t={strength}: {len(jobs):>7} jobs vs {full:>9} "
+            f"({len(jobs) / full:7.2%}) in {elapsed * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    for count in map(int, sys.argv[1:] or ["10", "30"]):
+        run(count)
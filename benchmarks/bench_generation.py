@@ -0,0 +1,68 @@
+"""pytest-benchmark suite over synthetic matrices; see benchmarks/pytest.ini.
+
+Usage: python -m pytest benchmarks [--benchmark-compare]
+"""
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import splunk_matrix_update  # noqa: E402
+from addonfactory_test_matrix_action import main  # noqa: E402
+
+
+@pytest.mark.benchmark(group="splunk")
+def bench_iter_splunk_sections(benchmark, matrix, args):
+    result = benchmark(
+        lambda: list(main._iter_splunk_sections(args, matrix.splunk_config))
+    )
+    assert len(result) == matrix.size - (matrix.size + 9) // 10
+
+
+@pytest.mark.benchmark(group="splunk")
+def bench_generate_supported_splunk_modinput(benchmark, matrix, args):
+    result = benchmark(
+        main._generate_supported_splunk_modinput, args, matrix.path, matrix.model
+    )
+    assert len(result) >= matrix.size - (matrix.size + 9) // 10
+
+
+@pytest.mark.benchmark(group="sc4s")
+def bench_generate_supported_sc4s(benchmark, matrix, args):
+    result = benchmark(main._generate_supported_sc4s, args, matrix.path, matrix.model)
+    assert len(result) == matrix.size
+
+
+@pytest.mark.benchmark(group="vendors")
+def bench_generate_supported_vendors(benchmark, matrix, args):
+    modinput, ui = benchmark(
+        main._generate_supported_vendors, args, matrix.path, matrix.model
+    )
+    assert len(modinput) == matrix.size
+
+
+@pytest.mark.benchmark(group="docker-hub")
+def bench_get_latest_image(benchmark, docker_hub_tags):
+    latest = benchmark(splunk_matrix_update.get_latest_image, "9.4", docker_hub_tags)
+    assert latest.startswith("9.4.")
+
+
+@pytest.mark.benchmark(group="docker-hub")
+def bench_get_latest_image_indexed(benchmark, docker_hub_tags):
+    index = splunk_matrix_update.ImageIndex(docker_hub_tags)
+    latest = benchmark(splunk_matrix_update.get_latest_image, "9.4", index)
+    assert latest.startswith("9.4.")
+
+
+@pytest.mark.benchmark(group="docker-hub")
+def bench_fixture_registry_index(benchmark, docker_hub_tags, tmp_path):
+    from registry_backends import FixtureBackend, write_fixture
+
+    path = str(tmp_path / "tags.json")
+    write_fixture(path, docker_hub_tags)
+    backend = FixtureBackend(path)
+    index = benchmark(
+        lambda: splunk_matrix_update.ImageIndex(
+            record for page in backend.iter_pages(None) for record in page
+        )
+    )
+    assert index.latest("9.4").startswith("9.4.")
@@ -0,0 +1,85 @@
+"""ImageIndex lookups versus the former per-stanza scans over every tag.
+
+Usage: python benchmarks/bench_image_index.py [tags]
+"""
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import splunk_matrix_update  # noqa: E402
+from benchmarks import synthetic  # noqa: E402
+
+
+def _legacy_latest_image(stanza, images):
+    stanza_regex = r"\.".join(re.escape(part) for part in stanza.split("."))
+    regex_image = rf"{stanza_regex}\.\d+|{stanza_regex}\.\d+\.\d+"
+    versions = [image["name"] for image in images]
+    filtered_images = re.findall(regex_image, str(versions))
+    if filtered_images:
+        filtered_images = [image.replace("'", "") for image in filtered_images]
+        filtered_images.sort(key=lambda s: list(map(int, s.split("."))))
+        return filtered_images[-1]
+    return None
+
+
+def _legacy_digest(image, images):
+    return next(
+        (
+            image_data["digest"]
+            for d in images
+            if d["name"] == image
+            for image_data in d.get("images", [])
+        ),
+        None,
+    )
+
+
+def _legacy_build(digest, images):
+    return next(
+        (
+            d["name"]
+            for d in images
+            for image in d.get("images", [])
+            if image["digest"] == digest and re.match(r"[0-9a-z]{12}", d["name"])
+        ),
+        None,
+    )
+
+
+def run(tags, stanzas, number=3):
+    images = synthetic.docker_hub_tags(tags, minors=stanzas)
+    names = splunk_matrix_update.get_all_major_minor_versions(images)
+
+    def legacy():
+        for stanza in names:
+            latest = _legacy_latest_image(stanza, images)
+            _legacy_build(_legacy_digest(latest, images), images)
+
+    def build():
+        return splunk_matrix_update.ImageIndex(images)
+
+    index = build()
+
+    def lookup():
+        for stanza in names:
+            latest = splunk_matrix_update.get_latest_image(stanza, index)
+            digest = splunk_matrix_update.get_image_digest(latest, index)
+            splunk_matrix_update.get_build_number(digest, index)
+
+    legacy_time = timeit.timeit(legacy, number=number) / number
+    build_time = timeit.timeit(build, number=number) / number
+    lookup_time = timeit.timeit(lookup, number=number) / number
+    print(
+        f"{tags:>7} tags x {len(names):>3} stanzas: "
+        f"legacy {legacy_time * 1000:9.1f} ms  "
+        f"index build {build_time * 1000:7.1f} ms + lookups {lookup_time * 1000:6.3f} ms"
+    )
+
+
+if __name__ == "__main__":
+    tags = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    for stanzas in (5, 20, 50):
+        run(tags, stanzas)
@@ -0,0 +1,70 @@
+"""Parse-once MatrixModel versus the former per-generator config parsing.
+
+Usage: python benchmarks/bench_matrix_model.py [sections ...]
+"""
+import argparse
+import configparser
+import os
+import re
+import sys
+import tempfile
+import timeit
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from addonfactory_test_matrix_action import main  # noqa: E402
+from benchmarks import synthetic  # noqa: E402
+
+
+def _legacy_generate(args, config_path):
+    """The pre-MatrixModel flow: read and coerce the matrix once per generator."""
+    results = []
+    for _ in range(2):
+        config = configparser.ConfigParser()
+        config.read(config_path)
+        today = datetime.now().date()
+        entries = []
+        for section in config.sections():
+            if not re.search(r"^\d+", section):
+                continue
+            eol = datetime.strptime(config[section]["SUPPORTED"], "%Y-%m-%d").date()
+            if today >= eol:
+                continue
+            props = {}
+            for k in config[section].keys():
+                try:
+                    value = config[section].getboolean(k)
+                except ValueError:
+                    value = config[section][k]
+                props[k] = value
+            entries.append((props["version"], props["build"]))
+        results.append(entries)
+    return results
+
+
+def _model_generate(args, config_dir):
+    model = main._load_model(config_dir)
+    main._generate_supported_splunk(args, config_dir, model)
+    main._generate_supported_splunk_modinput(args, config_dir, model)
+
+
+def run(sections, number=3):
+    args = argparse.Namespace(features=None)
+    with tempfile.TemporaryDirectory() as config_dir:
+        config_path = os.path.join(config_dir, "splunk_matrix.conf")
+        with open(config_path, "w") as fh:
+            fh.write(synthetic.splunk_matrix(sections))
+        legacy = timeit.timeit(
+            lambda: _legacy_generate(args, config_path), number=number
+        )
+        model = timeit.timeit(lambda: _model_generate(args, config_dir), number=number)
+    print(
+        f"{sections:>7} sections: legacy {legacy / number * 1000:9.1f} ms  "
+        f"model {model / number * 1000:9.1f} ms  ({legacy / model:.2f}x)"
+    )
+
+
+if __name__ == "__main__":
+    for count in map(int, sys.argv[1:] or ["10", "1000", "20000"]):
+        run(count)
@@ -0,0 +1,91 @@
+"""Import time and end-to-end wall time of the action's entry points.
+
+Compares ``python -m addonfactory_test_matrix_action.main`` against the
+stdlib-only zipapp (``python -I -S matrix_action.pyz``) with a snapshot, and
+lists the slowest imports reported by ``-X importtime``.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO)
+
+from addonfactory_test_matrix_action import snapshot  # noqa: E402
+from build_zipapp import build_zipapp  # noqa: E402
+
+
+def parse_importtime(stderr):
+    """Return ``{module: cumulative microseconds}`` from ``-X importtime`` output."""
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def build_runtime(directory):
+    """Lay out ``directory`` like the Docker image: the zipapp next to config/."""
+    config_dir = os.path.join(directory, "config")
+    os.makedirs(config_dir)
+    for name in ("splunk_matrix.conf", "SC4S_matrix.conf"):
+        shutil.copy(os.path.join(REPO, "config", name), config_dir)
+    snapshot.write_snapshot(config_dir)
+    return build_zipapp(os.path.join(directory, "matrix_action.pyz"))
+
+
+def entry_points(pyz):
+    return {
+        "module": [sys.executable, "-m", "addonfactory_test_matrix_action.main"],
+        "zipapp": [sys.executable, "-I", "-S", pyz],
+    }
+
+
+def run_entry_point(command, workdir, importtime=False):
+    """Run one entry point; return (wall seconds, stderr, GITHUB_OUTPUT content)."""
+    output = os.path.join(workdir, "github_output")
+    if os.path.exists(output):
+        os.remove(output)
+    env = dict(os.environ, GITHUB_OUTPUT=output, PYTHONPATH=REPO)
+    if importtime:
+        command = [command[0], "-X", "importtime", *command[1:]]
+    start = time.perf_counter()
+    result = subprocess.run(
+        command,
+        cwd=workdir,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    with open(output) as fh:
+        return elapsed, result.stderr, fh.read()
+
+
+def run(runs=10, slowest=8):
+    with tempfile.TemporaryDirectory() as workdir:
+        pyz = build_runtime(workdir)
+        for name, command in entry_points(pyz).items():
+            walls = [run_entry_point(command, workdir)[0] for _ in range(runs)]
+            _, stderr, _ = run_entry_point(command, workdir, importtime=True)
+            times = parse_importtime(stderr)
+            print(
+                f"{name:>7}: median {statistics.median(walls) * 1000:7.1f} ms  "
+                f"min {min(walls) * 1000:7.1f} ms  ({len(times)} modules imported)"
+            )
+            for module, micros in sorted(times.items(), key=lambda i: -i[1])[:slowest]:
+                print(f"         {micros / 1000:7.1f} ms  {module}")
+
+
+if __name__ == "__main__":
+    run(*map(int, sys.argv[1:2]))
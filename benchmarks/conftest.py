@@ -0,0 +1,48 @@
+import argparse
+import configparser
+
+import pytest
+
+from addonfactory_test_matrix_action.model import MatrixModel
+from benchmarks import synthetic
+
+SECTION_COUNTS = [10, 1000, 50000]
+DOCKER_HUB_TAGS = 100000
+
+
+def _config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+class Matrix:
+    """Synthetic conf files of one size, on disk and parsed."""
+
+    def __init__(self, directory, size):
+        self.size = size
+        self.path = str(directory)
+        splunk = synthetic.splunk_matrix(size)
+        sc4s = synthetic.sc4s_matrix(size)
+        vendors = synthetic.vendor_matrix(size)
+        (directory / "splunk_matrix.conf").write_text(splunk)
+        (directory / "SC4S_matrix.conf").write_text(sc4s)
+        self.splunk_config = _config(splunk)
+        self.model = MatrixModel.from_configs(
+            self.splunk_config, _config(sc4s), _config(vendors)
+        )
+
+
+@pytest.fixture(scope="session", params=SECTION_COUNTS, ids=str)
+def matrix(request, tmp_path_factory):
+    return Matrix(tmp_path_factory.mktemp(f"matrix-{request.param}"), request.param)
+
+
+@pytest.fixture(scope="session")
+def args():
+    return argparse.Namespace(features=None)
+
+
+@pytest.fixture(scope="session")
+def docker_hub_tags():
+    return synthetic.docker_hub_tags(DOCKER_HUB_TAGS)
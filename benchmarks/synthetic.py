@@ -0,0 +1,63 @@
+"""Synthetic matrices and Docker Hub tag listings for the benchmarks."""
+import datetime
+
+
+def splunk_matrix(sections, flags=4):
+    """Return splunk_matrix.conf text with *sections* ``[X.Y]`` stanzas."""
+    today = datetime.date.today()
+    names = [f"{1 + i // 100}.{i % 100}" for i in range(sections)]
+    lines = ["[GENERAL]", f"LATEST = {names[-1]}", f"OLDEST = {names[0]}", ""]
+    for i, name in enumerate(names):
+        # Every tenth stanza is past its end of support.
+        offset = -30 if i % 10 == 0 else 30 + i
+        lines += [
+            f"[{name}]",
+            f"VERSION = {name}.{i % 17}",
+            f"BUILD = {i:012x}",
+            f"SUPPORTED = {(today + datetime.timedelta(days=offset)).isoformat()}",
+        ]
+        lines += [
+            f"FLAG{f} = {'true' if (i >> f) & 1 else 'false'}" for f in range(flags)
+        ]
+        if i % 3 == 0:
+            lines.append("SERVER_CONF_PYTHON_VERSIONS = python3,force_python3")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def sc4s_matrix(sections):
+    """Return SC4S_matrix.conf text with *sections* numbered stanzas."""
+    lines = []
+    for i in range(sections):
+        lines += [
+            f"[{i + 1}]",
+            f"VERSION = 3.{i}.0",
+            f"DOCKER_REGISTRY = ghcr.io/splunk/splunk-connect-for-syslog/container{i}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def vendor_matrix(sections):
+    """Return .vendormatrix text with *sections* numbered stanzas."""
+    lines = []
+    for i in range(sections):
+        lines += [
+            f"[{i + 1}]",
+            f"VERSION = {i}.0",
+            f"DOCKER_IMAGE = vendor/appliance:{i}.0",
+            f"TRIGGER_UI = {'false' if i % 4 == 0 else 'true'}",
+            "",
+        ]
+    return "\n".join(lines)
+
+
+def docker_hub_tags(count, minors=50):
+    """Return *count* Docker Hub tag records: version tags paired with build hashes."""
+    images = []
+    for i in range(count // 2):
+        digest = f"sha256:{i:064x}"
+        name = f"{9 + (i % minors) // 10}.{(i % minors) % 10}.{i // minors}"
+        images.append({"name": name, "images": [{"digest": digest}]})
+        images.append({"name": f"{i:012x}", "images": [{"digest": digest}]})
+    return images
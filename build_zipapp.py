@@ -0,0 +1,56 @@
+"""
+Builds a stdlib-only zipapp of addonfactory_test_matrix_action.
+
+The archive holds each module's source next to its bytecode, compiled with
+unchecked hash-based pycs so zipimport never recompiles or stats the sources.
+Bytecode is interpreter specific: build the archive with the Python that runs
+it (the Docker image does so at build time).
+
+Usage: python build_zipapp.py [target]
+"""
+import os
+import py_compile
+import sys
+import tempfile
+import zipfile
+
+PACKAGE = "addonfactory_test_matrix_action"
+DEFAULT_TARGET = "matrix_action.pyz"
+ARCHIVE_MAIN = f"from {PACKAGE}.main import main\n\nmain()\n"
+
+
+def build_zipapp(target: str = DEFAULT_TARGET) -> str:
+    """
+    Writes the zipapp to *target*.
+
+    Args:
+        target (str): Path of the archive to create.
+
+    Returns:
+        str: *target*.
+    """
+    package_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), PACKAGE)
+    with tempfile.TemporaryDirectory() as build_dir, zipfile.ZipFile(
+        target, "w", compression=zipfile.ZIP_STORED
+    ) as archive:
+        archive.writestr("__main__.py", ARCHIVE_MAIN)
+        for name in sorted(os.listdir(package_dir)):
+            if not name.endswith(".py"):
+                continue
+            source = os.path.join(package_dir, name)
+            arcname = f"{PACKAGE}/{name}"
+            pyc = os.path.join(build_dir, name + "c")
+            py_compile.compile(
+                source,
+                cfile=pyc,
+                dfile=arcname,
+                doraise=True,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH,
+            )
+            archive.write(source, arcname)
+            archive.write(pyc, arcname + "c")
+    return target
+
+
+if __name__ == "__main__":
+    print(build_zipapp(*sys.argv[1:2]))
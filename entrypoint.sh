@@ -16,9 +16,49 @@
 #   ######################################################################## 
 set -e
 . /venv/bin/activate
+export PYTHONPATH=/
 
-if [ -n "$INPUT_FEATURES" ] && [ "$INPUT_FEATURES" != "" ]; then
-    python /addonfactory_test_matrix_action/main.py --features "$INPUT_FEATURES"
-else
-    python /addonfactory_test_matrix_action/main.py
+set --
+if [ -n "$INPUT_FEATURES" ]; then
+    set -- "$@" --features "$INPUT_FEATURES"
 fi
+if [ -n "$INPUT_COMBINED_EXCLUDE" ]; then
+    set -- "$@" --combined-exclude "$INPUT_COMBINED_EXCLUDE"
+fi
+if [ -n "$INPUT_COVERAGE" ]; then
+    set -- "$@" --coverage "$INPUT_COVERAGE"
+fi
+if [ -n "$INPUT_TIMINGS" ]; then
+    set -- "$@" --timings "$INPUT_TIMINGS"
+fi
+if [ -n "$INPUT_SHARDS" ]; then
+    set -- "$@" --shards "$INPUT_SHARDS"
+fi
+if [ -n "$INPUT_AS_OF" ]; then
+    set -- "$@" --as-of "$INPUT_AS_OF"
+fi
+if [ -n "$INPUT_FORECAST_MONTHS" ]; then
+    set -- "$@" --forecast-months "$INPUT_FORECAST_MONTHS"
+fi
+if [ -n "$INPUT_CACHE_DIR" ]; then
+    set -- "$@" --cache-dir "$INPUT_CACHE_DIR"
+fi
+if [ "$INPUT_PIN_DIGESTS" = "true" ]; then
+    set -- "$@" --pin-digests
+fi
+if [ -n "$INPUT_MAX_JOBS" ]; then
+    set -- "$@" --max-jobs "$INPUT_MAX_JOBS"
+fi
+
+# A matrix service on the runner answers without parsing the matrices again;
+# when it cannot, the outputs are computed here.
+if [ -n "$INPUT_SERVICE" ] && python -m addonfactory_test_matrix_action.service \
+    client --service "$INPUT_SERVICE" "$@"; then
+    exit 0
+fi
+
+# The stdlib-only zipapp built into the image starts without site-packages.
+if [ -f /matrix_action.pyz ]; then
+    exec python -I -S /matrix_action.pyz "$@"
+fi
+exec python -m addonfactory_test_matrix_action.main "$@"
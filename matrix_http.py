@@ -0,0 +1,538 @@
+"""
+HTTP access for the matrix updaters: one pooled session with per-host
+connection limits, a helper to run independent fetches concurrently, an
+optional on-disk cache that revalidates stored responses using ETag /
+Last-Modified, and rate-limit-aware retries within an overall deadline.
+"""
+import email.utils
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Well above the weekly update_deps schedule, so scheduled runs revalidate.
+DEFAULT_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_CONNECTIONS_PER_HOST = 4
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_REQUESTS_PER_SECOND = 10.0
+# Throttling and transient gateway errors; anything else is final.
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+
+
+class DeadlineExceeded(requests.exceptions.RequestException):
+    """
+    Raised when a request, or the wait before retrying it, would end after
+    the client's deadline.
+    """
+
+
+class RetryPolicy:
+    """
+    How often and how long to retry a throttled or failed request.
+
+    The n-th retry waits a uniformly random time up to
+    min(max_delay, base_delay * 2 ** n) ("full jitter"). A delay the server
+    asks for through Retry-After / X-RateLimit-Reset pauses the host's token
+    bucket instead, so the retry waits for whichever ends later.
+
+    Args:
+        max_attempts (int): Attempts per request, the first one included.
+        base_delay (float): Backoff cap of the first retry in seconds.
+        max_delay (float): Upper bound of the backoff cap in seconds.
+        jitter (Callable[[float, float], float]): Draws the wait from a range.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        jitter: Callable[[float, float], float] = random.uniform,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.jitter = jitter
+
+    def backoff(self, retry: int) -> float:
+        """
+        Returns the wait before retry number *retry* (0-based).
+        """
+        return self.jitter(0, min(self.max_delay, self.base_delay * 2**retry))
+
+
+class TokenBucket:
+    """
+    Spaces requests to one host: *rate* tokens per second, at most *capacity*
+    saved up. A server that reports an exhausted quota pauses the bucket
+    until the quota resets, so every thread waits instead of piling on 429s.
+
+    Args:
+        rate (float): Tokens added per second.
+        capacity (float): Burst size.
+        clock (Callable[[], float]): Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Takes one token and returns how long the caller must wait before using it.
+        """
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(wait, self._paused_until - now)
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every request for *seconds* from now.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+
+
+class HttpStats:
+    """
+    Where a client's time went: *transfer_seconds* inside requests,
+    *wait_seconds* in rate limiting and backoff.
+    """
+
+    def __init__(self) -> None:
+        self.requests = 0
+        self.retries = 0
+        self.transfer_seconds = 0.0
+        self.wait_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def add(self, **amounts: float) -> None:
+        with self._lock:
+            for name, amount in amounts.items():
+                setattr(self, name, getattr(self, name) + amount)
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} HTTP requests ({self.retries} retried): "
+            f"{self.transfer_seconds:.1f}s transferring, {self.wait_seconds:.1f}s waiting"
+        )
+
+
+def _header_seconds(headers, now: float) -> Optional[float]:
+    """
+    The delay a response asks for: Retry-After (seconds or HTTP date), or the
+    time until X-RateLimit-Reset (epoch seconds) once X-RateLimit-Remaining is 0.
+    """
+    retry_after = headers.get("Retry-After")
+    if isinstance(retry_after, str):
+        if retry_after.strip().isdigit():
+            return float(retry_after)
+        try:
+            return max(
+                0.0, email.utils.parsedate_to_datetime(retry_after).timestamp() - now
+            )
+        except (TypeError, ValueError):
+            pass
+    remaining = headers.get("X-RateLimit-Remaining")
+    reset = headers.get("X-RateLimit-Reset")
+    if isinstance(remaining, str) and isinstance(reset, str):
+        try:
+            if int(remaining) <= 0:
+                return max(0.0, float(reset) - now)
+        except ValueError:
+            pass
+    return None
+
+
+class CachedResponse:
+    """
+    A stored response replayed after the server answered 304 Not Modified.
+
+    Exposes the subset of requests.Response used by the updaters.
+    """
+
+    status_code = 200
+    not_modified = True
+
+    def __init__(self, url: str, content: bytes, headers: Dict[str, str]):
+        self.url = url
+        self.content = content
+        self.headers = headers
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        return None
+
+
+class HttpCache:
+    """
+    Directory of cached responses keyed by URL.
+
+    Each entry is a "<sha256(url)>.json" metadata file holding the validators
+    plus a "<sha256(url)>.body" file. Entries neither stored nor revalidated
+    within *ttl* are dropped, and the least recently used entries are dropped
+    once the bodies exceed *max_bytes*.
+
+    Args:
+        directory (str): Where entries live; created on first use.
+        ttl (float): Seconds an entry lives after it was last stored or
+            revalidated.
+        max_bytes (int): Upper bound on the total size of cached bodies.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        ttl: float = DEFAULT_TTL_SECONDS,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, key + suffix)
+
+    def _read_meta(self, path: str) -> Optional[Dict]:
+        try:
+            with open(path) as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, data: bytes) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp_path, path)
+
+    def lookup(self, url: str) -> Optional[Dict]:
+        """
+        Returns the metadata of a live entry for *url*, or None.
+        """
+        meta = self._read_meta(self._path(url, ".json"))
+        if meta is None or meta.get("url") != url:
+            return None
+        if time.time() - meta["stored_at"] > self.ttl:
+            self._remove(url)
+            return None
+        return meta
+
+    def load(self, url: str, meta: Dict) -> Optional[CachedResponse]:
+        """
+        Returns the stored body for *url* after a 304; the entry is marked as
+        recently used and its age restarts, as the server just confirmed it.
+        """
+        try:
+            with open(self._path(url, ".body"), "rb") as fh:
+                content = fh.read()
+        except OSError:
+            return None
+        meta["stored_at"] = meta["last_used"] = time.time()
+        self._write(self._path(url, ".json"), json.dumps(meta).encode())
+        return CachedResponse(url, content, meta.get("headers", {}))
+
+    def store(self, url: str, response) -> None:
+        """
+        Stores *response* if it carries an ETag or Last-Modified validator.
+        """
+        headers = {
+            name: response.headers[name]
+            for name in ("ETag", "Last-Modified", "Content-Type", "Link")
+            if name in response.headers
+        }
+        if "ETag" not in headers and "Last-Modified" not in headers:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        self._write(self._path(url, ".body"), response.content)
+        meta = {
+            "url": url,
+            "headers": headers,
+            "stored_at": now,
+            "last_used": now,
+            "size": len(response.content),
+        }
+        self._write(self._path(url, ".json"), json.dumps(meta).encode())
+        self.evict()
+
+    def _remove(self, url: str) -> None:
+        for suffix in (".json", ".body"):
+            try:
+                os.remove(self._path(url, suffix))
+            except FileNotFoundError:
+                pass
+
+    def evict(self) -> None:
+        """
+        Drops expired entries, then least recently used ones above *max_bytes*.
+        """
+        if not os.path.isdir(self.directory):
+            return
+        now = time.time()
+        live = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json") or name == "state.json":
+                continue
+            meta = self._read_meta(os.path.join(self.directory, name))
+            if meta is None or "url" not in meta:
+                continue
+            if now - meta["stored_at"] > self.ttl:
+                self._remove(meta["url"])
+            else:
+                live.append(meta)
+        total = sum(meta["size"] for meta in live)
+        for meta in sorted(live, key=lambda m: m["last_used"]):
+            if total <= self.max_bytes:
+                break
+            self._remove(meta["url"])
+            total -= meta["size"]
+
+    def read_state(self, key: str) -> Optional[str]:
+        """
+        Returns a value recorded with write_state(), or None.
+        """
+        state = self._read_meta(os.path.join(self.directory, "state.json")) or {}
+        return state.get(key)
+
+    def write_state(self, key: str, value: str) -> None:
+        """
+        Records a small value next to the cached responses.
+        """
+        path = os.path.join(self.directory, "state.json")
+        state = self._read_meta(path) or {}
+        state[key] = value
+        os.makedirs(self.directory, exist_ok=True)
+        self._write(path, json.dumps(state).encode())
+
+
+class HttpClient:
+    """
+    GET and HEAD HTTP client used by the updaters.
+
+    All requests share one requests.Session whose connection pools are capped
+    at *max_connections_per_host*; callers beyond the cap wait for a free
+    connection. With a cache, every request carries If-None-Match /
+    If-Modified-Since for the stored entry and a 304 answer is served from disk.
+
+    Requests to one host pass a shared token bucket. Throttled (429), gateway
+    (502-504) and connection failures are retried with *retry*, and no request
+    or wait may end after *deadline* seconds from the client's creation.
+
+    Args:
+        cache (Optional[HttpCache]): Where to keep validated responses.
+        max_connections_per_host (int): Concurrent connections allowed per host.
+        retry (Optional[RetryPolicy]): Defaults to RetryPolicy().
+        deadline (Optional[float]): Time budget of all requests in seconds.
+        requests_per_second (float): Token bucket rate per host.
+        clock (Callable[[], float]): Monotonic time source.
+        sleep (Callable[[float], None]): Used for every wait.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[HttpCache] = None,
+        max_connections_per_host: int = DEFAULT_CONNECTIONS_PER_HOST,
+        retry: Optional[RetryPolicy] = None,
+        deadline: Optional[float] = None,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.cache = cache
+        self.retry = retry or RetryPolicy()
+        self.clock = clock
+        self.sleep = sleep
+        self.deadline = clock() + deadline if deadline is not None else None
+        self.requests_per_second = requests_per_second
+        self.stats = HttpStats()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_maxsize=max_connections_per_host,
+            pool_block=True,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.requests = 0
+        self.not_modified = 0
+        self._lock = threading.Lock()
+
+    def _bucket(self, url: str) -> TokenBucket:
+        host = urlsplit(url).netloc
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = self._buckets[host] = TokenBucket(
+                    self.requests_per_second, self.requests_per_second, self.clock
+                )
+            return bucket
+
+    def _wait(self, seconds: float, url: str) -> None:
+        if seconds <= 0:
+            return
+        if self.deadline is not None and self.clock() + seconds > self.deadline:
+            raise DeadlineExceeded(f"Deadline reached before {url} could be fetched")
+        self.sleep(seconds)
+        self.stats.add(wait_seconds=seconds)
+
+    def _timeout(self, timeout: float, url: str) -> float:
+        if self.deadline is None:
+            return timeout
+        remaining = self.deadline - self.clock()
+        if remaining <= 0:
+            raise DeadlineExceeded(f"Deadline reached before {url} could be fetched")
+        return min(timeout, remaining)
+
+    def _send(
+        self, url: str, headers: Dict[str, str], timeout: float, method: str = "get"
+    ):
+        """
+        One logical request: waits for the host's bucket and retries throttled
+        or failed attempts. The last response of a retryable status is returned.
+        """
+        send = getattr(self.session, method)
+        bucket = self._bucket(url)
+        for attempt in range(self.retry.max_attempts):
+            self._wait(bucket.reserve(), url)
+            last_attempt = attempt == self.retry.max_attempts - 1
+            start = self.clock()
+            try:
+                if headers:
+                    response = send(
+                        url, headers=headers, timeout=self._timeout(timeout, url)
+                    )
+                else:
+                    response = send(url, timeout=self._timeout(timeout, url))
+            except (requests.ConnectionError, requests.Timeout):
+                self.stats.add(requests=1, transfer_seconds=self.clock() - start)
+                if last_attempt:
+                    raise
+            else:
+                self.stats.add(requests=1, transfer_seconds=self.clock() - start)
+                server_delay = _header_seconds(response.headers, time.time())
+                if server_delay is not None:
+                    # Throttled, or the quota is used up: hold back every
+                    # request to this host, this one's retry included.
+                    bucket.pause(server_delay)
+                if response.status_code not in RETRY_STATUSES or last_attempt:
+                    return response
+            self.stats.add(retries=1)
+            self._wait(self.retry.backoff(attempt), url)
+
+    @property
+    def all_not_modified(self) -> bool:
+        """
+        True when at least one request was made and every one returned 304.
+        """
+        return self.requests > 0 and self.requests == self.not_modified
+
+    def get(
+        self, url: str, timeout: float = 30, headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Performs a GET request and raises requests.HTTPError on 4xx/5xx, or
+        DeadlineExceeded once the client's deadline does not allow another try.
+
+        Args:
+            url (str): The URL to fetch.
+            timeout (float): Connect and read timeout in seconds.
+            headers (Optional[Dict[str, str]]): Extra request headers.
+
+        Returns:
+            requests.Response or CachedResponse.
+        """
+        meta = self.cache.lookup(url) if self.cache else None
+        headers = dict(headers or {})
+        if meta:
+            if "ETag" in meta["headers"]:
+                headers["If-None-Match"] = meta["headers"]["ETag"]
+            if "Last-Modified" in meta["headers"]:
+                headers["If-Modified-Since"] = meta["headers"]["Last-Modified"]
+        with self._lock:
+            self.requests += 1
+        response = self._send(url, headers, timeout)
+        if meta and response.status_code == 304:
+            cached = self.cache.load(url, meta)
+            if cached is not None:
+                with self._lock:
+                    self.not_modified += 1
+                return cached
+            # The body vanished underneath us; fetch it unconditionally.
+            headers.pop("If-None-Match", None)
+            headers.pop("If-Modified-Since", None)
+            response = self._send(url, headers, timeout)
+        response.raise_for_status()
+        if self.cache:
+            self.cache.store(url, response)
+        return response
+
+    def head(
+        self, url: str, timeout: float = 30, headers: Optional[Dict[str, str]] = None
+    ):
+        """
+        Performs an uncached HEAD request, retried like get(); raises
+        requests.HTTPError on 4xx/5xx.
+        """
+        with self._lock:
+            self.requests += 1
+        response = self._send(url, dict(headers or {}), timeout, "head")
+        response.raise_for_status()
+        return response
+
+
+def fetch_concurrently(
+    tasks: Dict[str, Callable[[], Any]], max_workers: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Runs independent fetches in parallel threads and waits for all of them.
+
+    Args:
+        tasks (Dict[str, Callable[[], Any]]): Zero-argument callables by name.
+        max_workers (Optional[int]): Thread count; defaults to one per task.
+
+    Returns:
+        Dict[str, Any]: Each task's return value under its name.
+
+    Raises:
+        Exception: The first failure in *tasks* order, once every task is done.
+    """
+    if not tasks:
+        return {}
+    with ThreadPoolExecutor(max_workers=max_workers or len(tasks)) as pool:
+        futures = {name: pool.submit(task) for name, task in tasks.items()}
+    return {name: future.result() for name, future in futures.items()}
@@ -0,0 +1,346 @@
+"""
+Registries the Splunk matrix updater can list splunk/splunk tags from.
+
+Every backend yields pages of trimmed tag records,
+{"name": <tag>, "images": [{"digest": <digest>}, ...]}, which the updater
+indexes with ImageIndex:
+
+- DockerHubBackend: the Docker Hub v2 API, newest first by "last_updated".
+- OciBackend: any OCI distribution registry (e.g. a mirror), through
+  /v2/<name>/tags/list and manifest HEAD requests for digests.
+- FixtureBackend: a recorded listing in a JSON file, for offline runs.
+
+Backends take the HttpClient per call, so they follow whichever client the
+updater is configured with.
+"""
+import datetime
+import json
+import os
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit
+
+import requests
+
+from matrix_http import DEFAULT_CONNECTIONS_PER_HOST, HttpClient
+
+# Release tags are X.Y.Z or X.Y.Z.W; anything else (build hashes, "latest",
+# "-rc" suffixes, OS-flavoured variants) is not a Splunk release.
+RELEASE_TAG_REGEX = re.compile(r"^(\d+)\.(\d+)\.(\d+)(?:\.(\d+))?$")
+# Build tags are the 12-character commit hashes Splunk publishes next to releases.
+BUILD_TAG_REGEX = re.compile(r"[0-9a-z]{12}")
+
+DOCKER_HUB_TAGS_URL = "https://hub.docker.com/v2/repositories/splunk/splunk/tags?page_size=100&ordering=last_updated"
+
+# Manifest media types a registry may answer a HEAD with; the digest of the
+# multi-arch index is the same for a release tag and its build-hash tag.
+MANIFEST_ACCEPT = ", ".join(
+    [
+        "application/vnd.oci.image.index.v1+json",
+        "application/vnd.docker.distribution.manifest.list.v2+json",
+        "application/vnd.oci.image.manifest.v1+json",
+        "application/vnd.docker.distribution.manifest.v2+json",
+    ]
+)
+
+
+class TagListing:
+    """
+    What one walk over a tag listing saw.
+
+    Attributes:
+        newest (Optional[str]): The newest "last_updated" timestamp listed.
+        reached_watermark (bool): Whether the walk stopped at the watermark.
+    """
+
+    def __init__(self) -> None:
+        self.newest: Optional[str] = None
+        self.reached_watermark = False
+
+    def saw(self, last_updated: str) -> None:
+        if self.newest is None or _parse_timestamp(last_updated) > _parse_timestamp(
+            self.newest
+        ):
+            self.newest = last_updated
+
+
+def _parse_timestamp(value: str) -> datetime.datetime:
+    # Docker Hub writes UTC as "Z", which fromisoformat only accepts from 3.11 on.
+    return datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def _trim(record: Dict) -> Dict:
+    return {
+        "name": record["name"],
+        "images": [
+            {"digest": image["digest"]}
+            for image in record.get("images", [])
+            if image.get("digest")
+        ],
+    }
+
+
+def _until_watermark(
+    records: Iterable[Dict],
+    watermark: Optional[datetime.datetime],
+    listing: Optional[TagListing],
+) -> Tuple[List[Dict], bool]:
+    """
+    Trims *records* (newest first) up to the first one not newer than
+    *watermark*; returns the kept records and whether the watermark was hit.
+    """
+    kept = []
+    for record in records:
+        last_updated = record.get("last_updated")
+        if last_updated and listing is not None:
+            listing.saw(last_updated)
+        if (
+            watermark is not None
+            and last_updated
+            and _parse_timestamp(last_updated) <= watermark
+        ):
+            if listing is not None:
+                listing.reached_watermark = True
+            return kept, True
+        kept.append(_trim(record))
+    return kept, False
+
+
+class RegistryBackend(ABC):
+    """
+    Interface of a tag source.
+
+    Attributes:
+        incremental (bool): Whether the listing is ordered by "last_updated",
+            so the updater's watermark applies.
+    """
+
+    incremental = False
+
+    @abstractmethod
+    def iter_pages(
+        self,
+        client: HttpClient,
+        since: Optional[str] = None,
+        listing: Optional[TagListing] = None,
+    ) -> Iterator[List[Dict]]:
+        """
+        Yields pages of trimmed tag records.
+
+        Args:
+            client (HttpClient): Performs the requests.
+            since (Optional[str]): "last_updated" watermark; backends whose
+                listing carries timestamps stop at the first tag not newer.
+            listing (Optional[TagListing]): Collects the newest timestamp seen.
+        """
+
+
+class DockerHubBackend(RegistryBackend):
+    """
+    The Docker Hub v2 tags API, following the "next" links.
+
+    Args:
+        url (str): The first page, ordered by "last_updated".
+    """
+
+    incremental = True
+
+    def __init__(self, url: str = DOCKER_HUB_TAGS_URL):
+        self.url = url
+
+    def iter_pages(self, client, since=None, listing=None):
+        watermark = _parse_timestamp(since) if since else None
+        url = self.url
+        while url:
+            page = client.get(url, timeout=30).json()
+            records, stopped = _until_watermark(page["results"], watermark, listing)
+            url = None if stopped else page.get("next")
+            yield records
+
+
+def _next_link(headers, base: str) -> Optional[str]:
+    """
+    The rel="next" target of an RFC 5988 Link header, resolved against *base*.
+    """
+    link = headers.get("Link")
+    if not isinstance(link, str):
+        return None
+    for part in link.split(","):
+        target, _, params = part.partition(";")
+        if 'rel="next"' in params.replace(" ", "") or "rel=next" in params:
+            return urljoin(base, target.strip().strip("<>"))
+    return None
+
+
+def _release_key(name: str) -> Tuple[int, ...]:
+    return tuple(map(int, name.split(".")))
+
+
+class OciBackend(RegistryBackend):
+    """
+    An OCI distribution registry, such as a pull-through mirror of Docker Hub.
+
+    Tag lists carry neither timestamps nor digests, so the listing is read in
+    full and then only the manifests that matter are HEADed: the newest
+    release of every "major.minor" and the build-hash tags, until each of
+    those releases has found its build. Other releases are listed by name only.
+
+    Args:
+        registry (str): Base URL, e.g. "https://mirror.example".
+        repository (str): Repository name, e.g. "splunk/splunk".
+        token (Optional[str]): Bearer token sent with every request.
+        page_size (int): Tags requested per tags/list page.
+    """
+
+    def __init__(
+        self,
+        registry: str,
+        repository: str = "splunk/splunk",
+        token: Optional[str] = None,
+        page_size: int = 1000,
+    ):
+        self.registry = registry.rstrip("/")
+        self.repository = repository.strip("/")
+        self.token = token
+        self.page_size = page_size
+
+    def _headers(self, **extra: str) -> Dict[str, str]:
+        headers = dict(extra)
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        return headers
+
+    def list_tags(self, client: HttpClient) -> List[str]:
+        """
+        Returns every tag of the repository, following Link pagination.
+        """
+        url = f"{self.registry}/v2/{self.repository}/tags/list?n={self.page_size}"
+        tags: List[str] = []
+        while url:
+            response = client.get(url, timeout=30, headers=self._headers())
+            tags.extend(response.json().get("tags") or [])
+            url = _next_link(response.headers, url)
+        return tags
+
+    def digest(self, client: HttpClient, tag: str) -> Optional[str]:
+        """
+        Returns the manifest digest of *tag* from a HEAD request, or None when
+        the tag has no manifest (e.g. it was deleted after the listing).
+        """
+        try:
+            response = client.head(
+                f"{self.registry}/v2/{self.repository}/manifests/{tag}",
+                timeout=30,
+                headers=self._headers(Accept=MANIFEST_ACCEPT),
+            )
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code == 404:
+                return None
+            raise
+        return response.headers.get("Docker-Content-Digest")
+
+    def iter_pages(self, client, since=None, listing=None):
+        tags = self.list_tags(client)
+        newest: Dict[str, str] = {}
+        for tag in tags:
+            if RELEASE_TAG_REGEX.match(tag):
+                major_minor = ".".join(tag.split(".")[:2])
+                current = newest.get(major_minor)
+                if current is None or _release_key(tag) > _release_key(current):
+                    newest[major_minor] = tag
+        builds = [tag for tag in tags if BUILD_TAG_REGEX.match(tag)]
+        with ThreadPoolExecutor(DEFAULT_CONNECTIONS_PER_HOST) as pool:
+
+            def digests(names: List[str]) -> Dict[str, Optional[str]]:
+                return dict(
+                    zip(names, pool.map(lambda tag: self.digest(client, tag), names))
+                )
+
+            release_digests = digests(sorted(newest.values()))
+            wanted = {digest for digest in release_digests.values() if digest}
+            build_digests: Dict[str, Optional[str]] = {}
+            for start in range(0, len(builds), DEFAULT_CONNECTIONS_PER_HOST * 4):
+                if not wanted:
+                    break
+                chunk = digests(
+                    builds[start : start + DEFAULT_CONNECTIONS_PER_HOST * 4]
+                )
+                build_digests.update(chunk)
+                wanted.difference_update(chunk.values())
+
+        def record(tag: str, digest: Optional[str]) -> Dict:
+            return {"name": tag, "images": [{"digest": digest}] if digest else []}
+
+        yield [
+            record(tag, release_digests.get(tag))
+            for tag in tags
+            if RELEASE_TAG_REGEX.match(tag)
+        ] + [record(tag, digest) for tag, digest in build_digests.items()]
+
+
+class FixtureBackend(RegistryBackend):
+    """
+    A recorded listing: a JSON file {"tags": [<Docker Hub tag record>, ...]}
+    newest first, served in pages like Docker Hub, watermark included.
+
+    Args:
+        path (str): The fixture file.
+        page_size (int): Records per page.
+    """
+
+    incremental = True
+
+    def __init__(self, path: str, page_size: int = 100):
+        self.path = path
+        self.page_size = page_size
+
+    def iter_pages(self, client, since=None, listing=None):
+        with open(self.path) as fh:
+            records = json.load(fh)["tags"]
+        watermark = _parse_timestamp(since) if since else None
+        for start in range(0, len(records), self.page_size):
+            page, stopped = _until_watermark(
+                records[start : start + self.page_size], watermark, listing
+            )
+            yield page
+            if stopped:
+                return
+
+
+def write_fixture(path: str, records: Iterable[Dict]) -> None:
+    """
+    Records tag *records* (e.g. Docker Hub "results") for FixtureBackend.
+    """
+    with open(path, "w") as fh:
+        json.dump({"tags": list(records)}, fh, indent=1)
+        fh.write("\n")
+
+
+def backend_from_spec(spec: Optional[str]) -> Optional[RegistryBackend]:
+    """
+    Parses --registry: "dockerhub" (or empty), "oci:<registry URL>/<repository>"
+    or "fixture:<path>". Returns None for Docker Hub, whose URL the updater
+    owns.
+
+    Raises:
+        ValueError: On an unknown or incomplete spec.
+    """
+    if not spec or spec == "dockerhub":
+        return None
+    kind, _, target = spec.partition(":")
+    if kind == "fixture" and target:
+        return FixtureBackend(target)
+    if kind == "oci" and target:
+        url = urlsplit(target)
+        if url.scheme in ("http", "https") and url.netloc and url.path.strip("/"):
+            return OciBackend(
+                f"{url.scheme}://{url.netloc}",
+                url.path,
+                token=os.environ.get("MATRIX_REGISTRY_TOKEN"),
+            )
+    raise ValueError(
+        f"Invalid registry {spec!r}: expected 'dockerhub', "
+        "'oci:https://<registry>/<repository>' or 'fixture:<path>'"
+    )
@@ -0,0 +1,170 @@
+import argparse
+import configparser
+import os
+import re
+import sys
+from packaging import version
+from typing import Dict, List, Optional
+
+import splunk_matrix_update
+from matrix_http import HttpClient
+
+SC4S_RELEASES_URL = "https://api.github.com/repos/splunk/splunk-connect-for-syslog/releases?per_page=100"
+SC4S_CONFIG_PATH = "config/SC4S_matrix.conf"
+
+# Registries are published per major line, e.g. ".../container3" for 3.x.
+REGISTRY_MAJOR_REGEX = re.compile(r"^(.*/container)(\d+)$")
+
+
+def get_sc4s_releases(client: Optional[HttpClient] = None) -> List[str]:
+    """
+    Fetches the published (non-draft, non-prerelease) SC4S release versions
+    from the GitHub releases API.
+
+    Args:
+        client (Optional[HttpClient]): Defaults to the Splunk updater's client, so
+            both updaters share one pooled session and cache.
+
+    Returns:
+        List[str]: Release versions without the leading "v" (e.g. "3.40.0").
+    """
+    client = client or splunk_matrix_update.http_client
+    headers = {"Accept": "application/vnd.github+json"}
+    if os.environ.get("GITHUB_TOKEN"):
+        headers["Authorization"] = f"Bearer {os.environ['GITHUB_TOKEN']}"
+    releases = client.get(SC4S_RELEASES_URL, timeout=30, headers=headers).json()
+    versions = []
+    for release in releases:
+        if release.get("draft") or release.get("prerelease"):
+            continue
+        tag = release["tag_name"].lstrip("v")
+        try:
+            parsed = version.Version(tag)
+        except version.InvalidVersion:
+            continue
+        if not parsed.is_prerelease:
+            versions.append(tag)
+    return versions
+
+
+def latest_releases_by_major(releases: List[str]) -> Dict[int, str]:
+    """
+    Returns the highest release of each major line.
+    """
+    latest: Dict[int, str] = {}
+    for release in releases:
+        major = version.parse(release).major
+        if major not in latest or version.parse(release) > version.parse(latest[major]):
+            latest[major] = release
+    return latest
+
+
+def set_stanza_option(lines: List[str], section: str, key: str, value: str) -> bool:
+    """
+    Rewrites "KEY = value" inside [section] in place, keeping comments,
+    spacing and every other line untouched.
+
+    Returns True if a line was changed.
+    """
+    option = re.compile(rf"^(\s*{re.escape(key)}\s*[=:]\s*)(.*?)(\s*)$", re.IGNORECASE)
+    current = None
+    for i, line in enumerate(lines):
+        header = re.match(r"^\s*\[([^\]]+)\]", line)
+        if header:
+            current = header.group(1).strip()
+            continue
+        if current != section:
+            continue
+        match = option.match(line)
+        if match:
+            if match.group(2) == value:
+                return False
+            lines[i] = f"{match.group(1)}{value}{match.group(3)}"
+            return True
+    return False
+
+
+def update_sc4s_version(
+    releases: Optional[List[str]] = None, client: Optional[HttpClient] = None
+) -> str:
+    """
+    Updates config/SC4S_matrix.conf:
+    - Moves every stanza to the latest release of its own major line.
+    - Moves the newest stanza to a newer major line when one is released, and
+      points a ".../containerN" DOCKER_REGISTRY at the new major.
+
+    Args:
+        releases (Optional[List[str]]): Release versions; fetched when None.
+        client (Optional[HttpClient]): Fetches the releases; see get_sc4s_releases.
+            Callers running splunk_matrix_update as a script must pass theirs, as
+            the module this one imports is a second, unconfigured copy.
+
+    Returns:
+        str: "True" if the config was changed, "False" otherwise.
+    """
+    if not os.path.isfile(SC4S_CONFIG_PATH):
+        return "False"
+
+    with open(SC4S_CONFIG_PATH) as fh:
+        lines = fh.read().splitlines(keepends=True)
+    config = configparser.ConfigParser()
+    config.read_string("".join(lines))
+    stanzas = [s for s in config.sections() if re.search(r"^\d+", s)]
+    if not stanzas:
+        return "False"
+
+    latest = latest_releases_by_major(
+        releases if releases is not None else get_sc4s_releases(client)
+    )
+    if not latest:
+        return "False"
+    newest_stanza = max(stanzas, key=lambda s: version.parse(config[s]["VERSION"]))
+    newest_major = max(latest)
+
+    update_file = False
+    for stanza in stanzas:
+        current = config[stanza]["VERSION"]
+        major = version.parse(current).major
+        if stanza == newest_stanza and newest_major > major:
+            major = newest_major
+            registry = REGISTRY_MAJOR_REGEX.match(
+                config[stanza].get("DOCKER_REGISTRY", "")
+            )
+            if registry and set_stanza_option(
+                lines, stanza, "DOCKER_REGISTRY", f"{registry.group(1)}{major}"
+            ):
+                update_file = True
+        candidate = latest.get(major)
+        if candidate and version.parse(candidate) > version.parse(current):
+            if set_stanza_option(lines, stanza, "VERSION", candidate):
+                update_file = True
+
+    if update_file:
+        with open(SC4S_CONFIG_PATH, "w") as fh:
+            fh.write("".join(lines))
+        return "True"
+
+    return "False"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Update config/SC4S_matrix.conf")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("MATRIX_HTTP_CACHE_DIR"),
+        help="Directory for the HTTP response cache (default: $MATRIX_HTTP_CACHE_DIR, disabled when unset)",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=splunk_matrix_update.DEFAULT_DEADLINE_SECONDS,
+        help="Seconds all HTTP requests of the run, retries and waits included, must finish in",
+    )
+    args = parser.parse_args()
+    client = splunk_matrix_update.configure_http_cache(
+        args.cache_dir, deadline=args.deadline
+    )
+    result = update_sc4s_version(client=client)
+    print(client.stats.summary(), file=sys.stderr)
+    print(result)
+    sys.exit(0)
@@ -1,49 +1,238 @@
+import argparse
 import configparser
 import datetime
+import functools
+import hashlib
 import json
 import os
 import re
 import sys
 from packaging import version
-import requests
-from typing import List, Dict, Optional
+from typing import Iterable, List, Dict, Optional, Set, Tuple, Union
+
+from matrix_http import (
+    DEFAULT_MAX_ATTEMPTS,
+    DEFAULT_MAX_BYTES,
+    DEFAULT_TTL_SECONDS,
+    HttpCache,
+    HttpClient,
+    RetryPolicy,
+    fetch_concurrently,
+)
+from registry_backends import (
+    BUILD_TAG_REGEX,
+    DOCKER_HUB_TAGS_URL,
+    RELEASE_TAG_REGEX,
+    DockerHubBackend,
+    RegistryBackend,
+    TagListing,
+    backend_from_spec,
+)
+
+
+SUPPORT_POLICY_URL = (
+    "https://www.splunk.com/en_us/legal/splunk-software-support-policy.html"
+)
+
+# Scheduled runs fail within this budget instead of hanging on a throttled API.
+DEFAULT_DEADLINE_SECONDS = 900.0
+
+http_client = HttpClient()
+
+
+def configure_http_cache(
+    cache_dir: Optional[str],
+    ttl: float = DEFAULT_TTL_SECONDS,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    deadline: Optional[float] = None,
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+) -> HttpClient:
+    """
+    Routes the updater's requests through an on-disk cache in *cache_dir*.
+
+    Args:
+        cache_dir (Optional[str]): Cache location; None disables caching.
+        ttl (float): Maximum age of a cached response in seconds.
+        max_bytes (int): Upper bound on the total size of cached responses.
+        deadline (Optional[float]): Seconds from now all requests must finish in.
+        max_attempts (int): Attempts per request on throttling or transient errors.
+
+    Returns:
+        HttpClient: The client now used by the module.
+    """
+    global http_client
+    cache = HttpCache(cache_dir, ttl, max_bytes) if cache_dir else None
+    http_client = HttpClient(
+        cache, retry=RetryPolicy(max_attempts=max_attempts), deadline=deadline
+    )
+    get_support_policy.cache_clear()
+    return http_client
+
+
+# Sidecar of config/splunk_matrix.conf holding the newest tag timestamp applied.
+STATE_PATH = "config/splunk_matrix.state.json"
+
+# Where tags are listed from; None means Docker Hub at DOCKER_HUB_TAGS_URL.
+registry_backend: Optional[RegistryBackend] = None
 
 
-def get_images_details() -> List[Dict]:
+def configure_registry(spec: Optional[str]) -> Optional[RegistryBackend]:
     """
-    Fetches the details of images from the Docker Hub Splunk repository.
+    Selects the tag source from a --registry spec (see backend_from_spec).
+
+    Raises:
+        ValueError: On an invalid spec.
+    """
+    global registry_backend
+    registry_backend = backend_from_spec(spec)
+    return registry_backend
+
+
+def _registry() -> RegistryBackend:
+    return registry_backend or DockerHubBackend(DOCKER_HUB_TAGS_URL)
+
+
+def get_images_details(
+    config: Optional[configparser.ConfigParser] = None,
+    since: Optional[str] = None,
+    listing: Optional[TagListing] = None,
+) -> List[Dict]:
+    """
+    Fetches the details of images from the configured registry (Docker Hub
+    unless configure_registry() chose another backend).
+
+    Docker Hub lists tags newest first, so when *config* is given the listing stops
+    after the first page on which every stanza has resolved to a release at
+    least as new as its VERSION together with that release's build hash. With
+    *since*, it also stops at the first tag not updated after that watermark.
+
+    Args:
+        config (Optional[configparser.ConfigParser]): The matrix being updated.
+        since (Optional[str]): "last_updated" watermark of the previous run.
+        listing (Optional[TagListing]): Collects the newest timestamp seen.
 
     Returns:
         List[Dict]: A list of dictionaries containing details about each image tag.
     """
-    get_images_details_endpoint = "https://hub.docker.com/v2/repositories/splunk/splunk/tags?page_size=1000&ordering=last_updated"
-    image_details_response = requests.get(get_images_details_endpoint)
-    image_details_response.raise_for_status()
-    image_details = image_details_response.json()["results"]
+    stanzas = (
+        [(s, config.get(s, "VERSION")) for s in config.sections() if s != "GENERAL"]
+        if config is not None
+        else []
+    )
+    index = ImageIndex()
+    image_details = []
+    for page in _registry().iter_pages(http_client, since, listing):
+        image_details.extend(page)
+        if not stanzas:
+            continue
+        for record in page:
+            index.add(record)
+        if all(_is_resolved(index, stanza, current) for stanza, current in stanzas):
+            break
     return image_details
 
 
-def get_latest_image(stanza: str, images: List[Dict]) -> Optional[str]:
+class ImageIndex:
+    """
+    Index over Docker Hub tag records, built in a single pass.
+
+    Maps each "major.minor" prefix to the sorted list of release tags
+    published under it, each tag to its digests, and each digest to the
+    build-hash tag pointing at it, so per-stanza lookups no longer rescan
+    every tag.
+    """
+
+    def __init__(self, images: Iterable[Dict] = ()):
+        self._releases: Dict[str, List[Tuple[Tuple[int, ...], str]]] = {}
+        self._unsorted: Set[str] = set()
+        self._major_minor_versions: Set[str] = set()
+        self._digests_by_tag: Dict[str, List[str]] = {}
+        self._build_by_digest: Dict[str, str] = {}
+        for image in images:
+            self.add(image)
+
+    def add(self, image: Dict) -> None:
+        """
+        Adds one tag record to the index.
+
+        Args:
+            image (Dict): A Docker Hub tag record with at least a "name" key.
+        """
+        name = image["name"]
+        digests = [entry["digest"] for entry in image.get("images", [])]
+        # First record wins, matching the order of the Docker Hub listing.
+        self._digests_by_tag.setdefault(name, digests)
+        if BUILD_TAG_REGEX.match(name):
+            for digest in digests:
+                self._build_by_digest.setdefault(digest, name)
+        # Cheap rejection of build hashes and named tags before the regex.
+        if "." not in name or not RELEASE_TAG_REGEX.match(name):
+            return
+        parsed = tuple(map(int, name.split(".")))
+        major_minor = f"{parsed[0]}.{parsed[1]}"
+        self._releases.setdefault(major_minor, []).append((parsed, name))
+        self._unsorted.add(major_minor)
+        if len(parsed) == 3:
+            self._major_minor_versions.add(major_minor)
+
+    def latest(self, major_minor: str) -> Optional[str]:
+        """
+        Returns the highest release tag under "major.minor", or None.
+        """
+        releases = self._releases.get(major_minor)
+        if not releases:
+            return None
+        if major_minor in self._unsorted:
+            releases.sort()
+            self._unsorted.discard(major_minor)
+        return releases[-1][1]
+
+    def major_minor_versions(self) -> List[str]:
+        """
+        Returns the "major.minor" prefixes that have at least one X.Y.Z tag.
+        """
+        return list(self._major_minor_versions)
+
+    def digest(self, tag: str) -> Optional[str]:
+        """
+        Returns the first digest published under *tag*, or None.
+        """
+        digests = self._digests_by_tag.get(tag)
+        return digests[0] if digests else None
+
+    def build_for_digest(self, digest: str) -> Optional[str]:
+        """
+        Returns the build-hash tag that points at *digest*, or None.
+        """
+        return self._build_by_digest.get(digest)
+
+
+def _is_resolved(index: ImageIndex, stanza: str, current_version: str) -> bool:
+    latest = index.latest(stanza)
+    if latest is None or version.parse(latest) < version.parse(current_version):
+        return False
+    digest = index.digest(latest)
+    return digest is not None and index.build_for_digest(digest) is not None
+
+
+def _as_index(images: Union[List[Dict], ImageIndex]) -> ImageIndex:
+    return images if isinstance(images, ImageIndex) else ImageIndex(images)
+
+
+def get_latest_image(
+    stanza: str, images: Union[List[Dict], ImageIndex]
+) -> Optional[str]:
     """
     Finds the latest image version that matches the given stanza version.
 
     Args:
         stanza (str): The version string from the config file.
-        images (List[Dict]): A list of dictionaries containing image details.
+        images (Union[List[Dict], ImageIndex]): Image details, or an index built from them.
 
     Returns:
         Optional[str]: The latest image version that matches the stanza pattern, or None if no match is found.
     """
-    stanza_regex = r"\.".join(re.escape(part) for part in stanza.split("."))
-    regex_image = rf"{stanza_regex}\.\d+|{stanza_regex}\.\d+\.\d+"
-    versions = [image["name"] for image in images]
-    filtered_images = re.findall(regex_image, str(versions))
-
-    if filtered_images:
-        filtered_images = [image.replace("'", "") for image in filtered_images]
-        filtered_images.sort(key=lambda s: list(map(int, s.split("."))))
-        return filtered_images[-1]
-    return None
+    return _as_index(images).latest(stanza)
 
 
 def is_latest_image(latest_image: str, stanza_image: str) -> bool:
@@ -60,66 +249,48 @@ def is_latest_image(latest_image: str, stanza_image: str) -> bool:
     return version.parse(latest_image) > version.parse(stanza_image)
 
 
-def get_build_number(latest_image_digest: str, image_list: List[Dict]) -> Optional[str]:
+def get_build_number(
+    latest_image_digest: str, image_list: Union[List[Dict], ImageIndex]
+) -> Optional[str]:
     """
     Retrieves the build number which is SHA corresponding to the latest image digest.
 
     Args:
         latest_image_digest (str): The digest of the latest image.
-        image_list (List[Dict]): A list of dictionaries containing image details.
+        image_list (Union[List[Dict], ImageIndex]): Image details, or an index built from them.
 
     Returns:
         Optional[str]: The build number if found, None otherwise.
     """
-    return next(
-        (
-            d["name"]
-            for d in image_list
-            for image in d.get("images", [])
-            if image["digest"] == latest_image_digest
-            and re.match(r"[0-9a-z]{12}", d["name"])
-        ),
-        None,
-    )
+    return _as_index(image_list).build_for_digest(latest_image_digest)
 
 
-def get_image_digest(image: str, image_list: List[Dict]) -> Optional[str]:
+def get_image_digest(
+    image: str, image_list: Union[List[Dict], ImageIndex]
+) -> Optional[str]:
     """
     Retrieves the digest for a specific image version.
 
     Args:
         image (str): The name of the image version.
-        image_list (List[Dict]): A list of dictionaries containing image details.
+        image_list (Union[List[Dict], ImageIndex]): Image details, or an index built from them.
 
     Returns:
         Optional[str]: The digest of the image if found, None otherwise.
     """
-    return next(
-        (
-            image_data["digest"]
-            for d in image_list
-            if d["name"] == image
-            for image_data in d.get("images", [])
-        ),
-        None,
-    )
+    return _as_index(image_list).digest(image)
 
 
-def get_all_major_minor_versions(images: List[Dict]) -> List[str]:
+def get_all_major_minor_versions(images: Union[List[Dict], ImageIndex]) -> List[str]:
     """
     Returns unique major.minor version prefixes found in Docker Hub image tags.
     Only considers tags matching X.Y.Z (excludes build hashes, 'latest', pre-release).
     """
-    seen = set()
-    for image in images:
-        if re.match(r"^\d+\.\d+\.\d+$", image["name"]):
-            parts = image["name"].split(".")
-            seen.add(f"{parts[0]}.{parts[1]}")
-    return list(seen)
+    return _as_index(images).major_minor_versions()
 
 
 def get_new_versions(
-    config: configparser.ConfigParser, images: List[Dict]
+    config: configparser.ConfigParser, images: Union[List[Dict], ImageIndex]
 ) -> List[str]:
     """
     Returns major.minor versions present on Docker Hub that have no stanza in config.
@@ -128,42 +299,76 @@ def get_new_versions(
     return [v for v in get_all_major_minor_versions(images) if v not in existing]
 
 
+# One row of the support policy table:
+#   <td>X.Y</td><td>RELEASE_DATE</td><td>EOL_DATE</td><td>...</td>
+# The version cell must be exactly X.Y, so "10.4" never matches "10.40".
+SUPPORT_POLICY_ROW_REGEX = re.compile(
+    r"<td>(\d+\.\d+)</td>\s*<td>([^<]*)</td>\s*<td>([^<]+)</td>", re.IGNORECASE
+)
+
+
+def _parse_policy_date(value: str) -> Optional[str]:
+    try:
+        return datetime.datetime.strptime(value.strip(), "%b %d %Y").strftime(
+            "%Y-%m-%d"
+        )
+    except ValueError:
+        return None
+
+
+def parse_support_policy(html: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """
+    Parses the version table of Splunk's software support policy page in one pass.
+
+    Dates are formatted as "Mon DD YYYY" (e.g. "May 18 2028") on the page and
+    "YYYY-MM-DD" in the result. Cells that are not dates ("Not Released") map
+    to None. The first row wins if a version is listed twice.
+
+    Args:
+        html (str): The page source.
+
+    Returns:
+        Dict[str, Tuple[Optional[str], Optional[str]]]: {major.minor: (release, eol)}.
+    """
+    table: Dict[str, Tuple[Optional[str], Optional[str]]] = {}
+    for match in SUPPORT_POLICY_ROW_REGEX.finditer(html):
+        major_minor, release, eol = match.groups()
+        if major_minor not in table:
+            table[major_minor] = (_parse_policy_date(release), _parse_policy_date(eol))
+    return table
+
+
+@functools.lru_cache(maxsize=None)
+def get_support_policy() -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """
+    Fetches and parses the support policy page once per process.
+
+    Failures raise and are not memoized, so a later call fetches again.
+    """
+    response = http_client.get(SUPPORT_POLICY_URL, timeout=15)
+    return parse_support_policy(response.text)
+
+
 def get_supported_date(major_minor: str) -> str:
     """
-    Scrapes Splunk's software support policy page for the end-of-support date
-    of the given major.minor version (e.g. "10.4").
+    Looks up the end-of-support date of the given major.minor version
+    (e.g. "10.4") in Splunk's software support policy.
 
     Returns a "YYYY-MM-DD" string on success, or "UNKNOWN" on any failure
     (network error, HTTP error, version not yet listed, "Not Released", parse failure).
-
-    Page table structure (one row per version):
-      <td>X.Y</td><td>RELEASE_DATE</td><td>EOL_DATE</td><td>...</td>
-    Dates are formatted as "Mon DD YYYY" (e.g. "May 18 2028").
-    EOL_DATE may be "Not Released" for versions not yet GA → returns "UNKNOWN".
     """
-    url = "https://www.splunk.com/en_us/legal/splunk-software-support-policy.html"
     try:
-        response = requests.get(url, timeout=15)
-        response.raise_for_status()
-        escaped = re.escape(major_minor)
-        # Match the version cell, skip the release-date cell, capture the EOL-date cell.
-        # (?!\d) prevents "10.4" matching "10.40".
-        pattern = rf"<td>{escaped}(?!\d)</td>\s*<td>[^<]*</td>\s*<td>([^<]+)</td>"
-        match = re.search(pattern, response.text, re.IGNORECASE)
-        if not match:
-            return "UNKNOWN"
-        date_str = match.group(1).strip()
-        if date_str == "Not Released":
-            return "UNKNOWN"
-        return datetime.datetime.strptime(date_str, "%b %d %Y").strftime("%Y-%m-%d")
+        table = get_support_policy()
     except Exception:
         return "UNKNOWN"
+    _, eol = table.get(major_minor, (None, None))
+    return eol or "UNKNOWN"
 
 
 def add_new_version_stanza(
     config: configparser.ConfigParser,
     major_minor: str,
-    images: List[Dict],
+    images: Union[List[Dict], ImageIndex],
 ) -> bool:
     """
     Adds a new [major.minor] stanza to config for a previously unseen Splunk version.
@@ -186,6 +391,7 @@ def add_new_version_stanza(
     except ValueError:
         return False
 
+    images = _as_index(images)
     latest_version = get_latest_image(major_minor, images)
     if not latest_version:
         return False
@@ -255,29 +461,18 @@ def update_general_section(config: configparser.ConfigParser) -> bool:
     return changed
 
 
-def update_splunk_version() -> str:
+def apply_upstream_changes(
+    config: configparser.ConfigParser, image_index: ImageIndex
+) -> bool:
     """
-    Updates config/splunk_matrix.conf:
-    - Discovers and adds new Splunk major.minor versions from Docker Hub.
-    - Updates patch versions for all existing stanzas.
-    - Removes stanzas whose end-of-support date has passed.
-    - Syncs GENERAL.LATEST and GENERAL.OLDEST.
+    Adds new major.minor stanzas and bumps patch versions from the tag index.
 
-    Returns "True" if the config was changed, "False" otherwise.
+    Returns True if the config was changed.
     """
-    config_path = "config/splunk_matrix.conf"
-
-    if not os.path.isfile(config_path):
-        return "False"
-
-    config = configparser.ConfigParser()
-    config.optionxform = str
-    config.read(config_path)
     update_file = False
-    all_images_list = get_images_details()
 
     # Discover and add new major.minor versions
-    new_versions = get_new_versions(config, all_images_list)
+    new_versions = get_new_versions(config, image_index)
     for major_minor in new_versions:
         supported = get_supported_date(major_minor)
         if supported == "UNKNOWN":
@@ -288,27 +483,199 @@ def update_splunk_version() -> str:
                 file=sys.stderr,
             )
             sys.exit(1)
-        if add_new_version_stanza(config, major_minor, all_images_list):
+        if add_new_version_stanza(config, major_minor, image_index):
             update_file = True
 
     # Update patch versions for all stanzas (including newly added ones)
     for stanza in config.sections():
         if stanza != "GENERAL":
-            latest_image_version = get_latest_image(stanza, all_images_list)
+            latest_image_version = get_latest_image(stanza, image_index)
             if latest_image_version:
                 stanza_image_version = config.get(stanza, "VERSION")
                 if is_latest_image(latest_image_version, stanza_image_version):
                     latest_image_digest = get_image_digest(
-                        latest_image_version, all_images_list
-                    )
-                    build_number = get_build_number(
-                        latest_image_digest, all_images_list
+                        latest_image_version, image_index
                     )
+                    build_number = get_build_number(latest_image_digest, image_index)
                     config.set(stanza, "VERSION", latest_image_version)
                     if build_number:
                         config.set(stanza, "BUILD", build_number)
                     update_file = True
 
+    return update_file
+
+
+def _prefetch_support_policy() -> None:
+    try:
+        get_support_policy()
+    except Exception:
+        # get_supported_date reports the failure if the table is ever needed.
+        pass
+
+
+def _file_digest(path: str) -> str:
+    with open(path, "rb") as fh:
+        return hashlib.sha256(fh.read()).hexdigest()
+
+
+def read_watermark(state_path: str, config_path: str) -> Optional[str]:
+    """
+    Returns the "last_updated" watermark of the previous run, or None.
+
+    The watermark only holds for the config that run wrote: a missing or
+    unreadable state file, or a config edited since, means a full listing.
+
+    Args:
+        state_path (str): The sidecar state file.
+        config_path (str): The matrix the state belongs to.
+
+    Returns:
+        Optional[str]: The newest tag timestamp already applied.
+    """
+    try:
+        with open(state_path) as fh:
+            state = json.load(fh)
+        if state["config_sha256"] != _file_digest(config_path):
+            return None
+        return state["last_updated"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def write_watermark(state_path: str, config_path: str, last_updated: str) -> None:
+    """
+    Records *last_updated* as the watermark for the current content of *config_path*.
+
+    The file is only rewritten when its content changes.
+    """
+    state = {"config_sha256": _file_digest(config_path), "last_updated": last_updated}
+    text = json.dumps(state, indent=2, sort_keys=True) + "\n"
+    try:
+        with open(state_path) as fh:
+            if fh.read() == text:
+                return
+    except OSError:
+        pass
+    with open(state_path, "w") as fh:
+        fh.write(text)
+
+
+def _awaiting_builds(
+    config: configparser.ConfigParser, image_index: ImageIndex
+) -> List[str]:
+    """
+    New, still supported major.minor versions that were skipped because their
+    release tag is listed but its build tag is not published yet.
+
+    The watermark must not pass their release tags: the next partial listing
+    would only hold the build tag and never add the version.
+    """
+    today = datetime.date.today()
+    waiting = []
+    for major_minor in get_new_versions(config, image_index):
+        latest = image_index.latest(major_minor)
+        if latest is None:
+            continue
+        try:
+            if datetime.date.fromisoformat(get_supported_date(major_minor)) <= today:
+                continue
+        except ValueError:
+            continue
+        digest = image_index.digest(latest)
+        if digest is None or image_index.build_for_digest(digest) is None:
+            waiting.append(major_minor)
+    return waiting
+
+
+def _has_unresolved_builds(
+    config: configparser.ConfigParser, image_index: ImageIndex
+) -> bool:
+    """
+    Whether a release in a partial listing would be applied without its build
+    hash, because the build tag was published before the watermark.
+    """
+    major_minors = set(config.sections()) - {"GENERAL"}
+    major_minors.update(get_new_versions(config, image_index))
+    for major_minor in major_minors:
+        latest = image_index.latest(major_minor)
+        if latest is None:
+            continue
+        if config.has_section(major_minor) and not is_latest_image(
+            latest, config.get(major_minor, "VERSION")
+        ):
+            continue
+        digest = image_index.digest(latest)
+        if digest is None or image_index.build_for_digest(digest) is None:
+            return True
+    return False
+
+
+def update_splunk_version(full: bool = False) -> str:
+    """
+    Updates config/splunk_matrix.conf:
+    - Discovers and adds new Splunk major.minor versions from Docker Hub.
+    - Updates patch versions for all existing stanzas.
+    - Removes stanzas whose end-of-support date has passed.
+    - Syncs GENERAL.LATEST and GENERAL.OLDEST.
+
+    With an HTTP cache configured, the Docker Hub step is skipped when every
+    upstream request was answered with 304 and the config is unchanged since
+    the last completed run; the date-based pruning still runs.
+
+    The newest tag timestamp applied is kept in config/splunk_matrix.state.json;
+    later runs only list the tags updated after it, unless *full* is set.
+
+    Returns "True" if the config was changed, "False" otherwise.
+    """
+    config_path = "config/splunk_matrix.conf"
+    state_path = STATE_PATH
+
+    if not os.path.isfile(config_path):
+        return "False"
+
+    config = configparser.ConfigParser()
+    config.optionxform = str
+    config.read(config_path)
+    update_file = False
+    watermark = previous_watermark = (
+        read_watermark(state_path, config_path)
+        if not full and _registry().incremental
+        else None
+    )
+    listing = TagListing()
+    # The support policy page does not depend on the tag listing; fetch both
+    # at once so the stage takes as long as the slower of the two.
+    upstream = fetch_concurrently(
+        {
+            "images": lambda: get_images_details(config, watermark, listing),
+            "support_policy": _prefetch_support_policy,
+        }
+    )
+    image_index = ImageIndex(upstream["images"])
+    if watermark is not None:
+        print(
+            f"{len(upstream['images'])} tags updated since {watermark}.",
+            file=sys.stderr,
+        )
+        if _has_unresolved_builds(config, image_index):
+            print(
+                "Build tags predate the watermark; listing all tags.", file=sys.stderr
+            )
+            watermark = None
+            listing = TagListing()
+            image_index = ImageIndex(get_images_details(config, None, listing))
+
+    cache = http_client.cache
+    upstream_unchanged = (
+        cache is not None
+        and http_client.all_not_modified
+        and cache.read_state(config_path) == _file_digest(config_path)
+    )
+    if upstream_unchanged:
+        print("Upstream listings unchanged since the last run.", file=sys.stderr)
+    elif apply_upstream_changes(config, image_index):
+        update_file = True
+
     # Remove stanzas whose support window has closed
     if remove_expired_versions(config):
         update_file = True
@@ -320,11 +687,97 @@ def update_splunk_version() -> str:
     if update_file:
         with open(config_path, "w") as configfile:
             config.write(configfile)
-        return "True"
-
-    return "False"
+    if cache is not None:
+        cache.write_state(config_path, _file_digest(config_path))
+    last_updated = listing.newest or watermark
+    waiting = _awaiting_builds(config, image_index)
+    if waiting:
+        print(
+            f"{', '.join(waiting)} awaiting build tags; keeping the previous watermark.",
+            file=sys.stderr,
+        )
+        last_updated = previous_watermark
+    if last_updated is not None:
+        write_watermark(state_path, config_path, last_updated)
+
+    return "True" if update_file else "False"
 
 
 if __name__ == "__main__":
-    update_file = update_splunk_version()
+    parser = argparse.ArgumentParser(description="Update config/splunk_matrix.conf")
+    parser.add_argument(
+        "--cache-dir",
+        default=os.environ.get("MATRIX_HTTP_CACHE_DIR"),
+        help="Directory for the HTTP response cache (default: $MATRIX_HTTP_CACHE_DIR, disabled when unset)",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        type=float,
+        default=DEFAULT_TTL_SECONDS,
+        help="Seconds a cached response may be revalidated before it is dropped",
+    )
+    parser.add_argument(
+        "--cache-max-bytes",
+        type=int,
+        default=DEFAULT_MAX_BYTES,
+        help="Total size of cached responses before least recently used ones are dropped",
+    )
+    parser.add_argument(
+        "--deadline",
+        type=float,
+        default=DEFAULT_DEADLINE_SECONDS,
+        help="Seconds all HTTP requests of the run, retries and waits included, must finish in",
+    )
+    parser.add_argument(
+        "--max-attempts",
+        type=int,
+        default=DEFAULT_MAX_ATTEMPTS,
+        help="Attempts per request when throttled (429) or on gateway and connection errors",
+    )
+    parser.add_argument(
+        "--registry",
+        default=os.environ.get("MATRIX_REGISTRY", "dockerhub"),
+        help="Tag source: 'dockerhub', 'oci:https://<registry>/<repository>' (token in "
+        "$MATRIX_REGISTRY_TOKEN) or 'fixture:<path>' (default: $MATRIX_REGISTRY or dockerhub)",
+    )
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="Ignore the last_updated watermark and list every Docker Hub tag",
+    )
+    parser.add_argument(
+        "--with-sc4s",
+        action="store_true",
+        help="Also update config/SC4S_matrix.conf over the same HTTP session",
+    )
+    args = parser.parse_args()
+    try:
+        configure_registry(args.registry)
+    except ValueError as e:
+        parser.error(str(e))
+    configure_http_cache(
+        args.cache_dir,
+        args.cache_ttl,
+        args.cache_max_bytes,
+        args.deadline,
+        args.max_attempts,
+    )
+    if args.with_sc4s:
+        import sc4s_matrix_update
+
+        results = fetch_concurrently(
+            {
+                "splunk": lambda: update_splunk_version(args.full),
+                # This file runs as __main__: pass the configured client, not
+                # the one of the splunk_matrix_update copy sc4s imports.
+                "sc4s": lambda: sc4s_matrix_update.update_sc4s_version(
+                    client=http_client
+                ),
+            }
+        )
+        print(f"SC4S config updated: {results['sc4s']}", file=sys.stderr)
+        update_file = results["splunk"]
+    else:
+        update_file = update_splunk_version(args.full)
+    print(http_client.stats.summary(), file=sys.stderr)
     print(update_file)
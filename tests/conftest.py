@@ -0,0 +1,97 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+
+class FakeUpstream:
+    """
+    Local HTTP stand-in for Docker Hub, the Splunk support policy page and the
+    GitHub releases API.
+
+    Each route serves a list of responses in order; the last one repeats.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.hits = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        upstream = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                upstream._serve(self)
+
+            do_HEAD = do_GET
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, path):
+        return self.base_url + path
+
+    def route(self, path, *responses):
+        """
+        Registers *responses* for *path*: (status, body, headers, delay) tuples,
+        or a bare body (str, bytes or JSON-serializable) served as 200.
+        """
+        normalized = []
+        for response in responses:
+            if not isinstance(response, tuple):
+                response = (200, response)
+            status, body, headers, delay = response + (None, 0)[len(response) - 2 :]
+            if not isinstance(body, (str, bytes)):
+                body = json.dumps(body)
+            if isinstance(body, str):
+                body = body.encode()
+            normalized.append((status, body, headers or {}, delay))
+        self.routes[path] = normalized
+
+    def _serve(self, handler):
+        with self._lock:
+            self.hits.append(handler.path)
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            responses = self.routes.get(handler.path)
+            if responses is None:
+                response = (404, b"not found", {}, 0)
+            elif len(responses) > 1:
+                response = responses.pop(0)
+            else:
+                response = responses[0]
+        status, body, headers, delay = response
+        try:
+            time.sleep(delay)
+            handler.send_response(status)
+            for name, value in headers.items():
+                handler.send_header(name, value)
+            handler.send_header("Content-Length", str(len(body)))
+            handler.end_headers()
+            if handler.command != "HEAD":
+                handler.wfile.write(body)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def fake_upstream():
+    upstream = FakeUpstream()
+    yield upstream
+    upstream.close()
@@ -0,0 +1,80 @@
+import io
+import json
+import os
+
+import pytest
+
+from addonfactory_test_matrix_action import batch, main
+
+_CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
+
+
+def _run(requests, jobs=1):
+    lines = [json.dumps(request) + "\n" for request in requests]
+    out = io.StringIO()
+    errors = batch.run(lines, out, jobs=jobs, path=_CONFIG_DIR)
+    return errors, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+@pytest.fixture
+def vendormatrix(tmp_path):
+    path = tmp_path / ".vendormatrix"
+    path.write_text("[1]\nVERSION = 7.0\nDOCKER_IMAGE = vendor:7.0\n")
+    return str(path)
+
+
+def test_records_match_the_single_run_outputs(vendormatrix):
+    requests = [
+        {"name": "a", "features": "python39"},
+        {"name": "b", "vendormatrix": vendormatrix, "args": ["--coverage=pairwise"]},
+    ]
+    errors, records = _run(requests)
+    assert errors == 0
+    assert [record["name"] for record in records] == ["a", "b"]
+
+    model = main._load_model(_CONFIG_DIR, vendors_matrix=None)
+    args, excludes, strength, durations = main._parse_arguments(
+        ["--features", "python39"]
+    )
+    expected = main._render_outputs(
+        args, _CONFIG_DIR, model, excludes, strength, durations, lambda line: None
+    )
+    assert records[0]["outputs"] == {
+        key: json.loads(value) for key, value in expected.items()
+    }
+    assert records[1]["outputs"]["supportedUIVendors"] == [
+        {"version": "7.0", "image": "vendor:7.0"}
+    ]
+
+
+def test_invalid_requests_become_error_records():
+    lines = ["not json\n", json.dumps({"name": "bad", "features": "(a"}) + "\n"]
+    out = io.StringIO()
+    assert batch.run(lines, out, path=_CONFIG_DIR) == 2
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert records[0]["name"] is None and "Invalid request" in records[0]["error"]
+    assert records[1]["name"] == "bad" and "--features" in records[1]["error"]
+
+
+def test_warnings_are_collected(tmp_path):
+    missing = str(tmp_path / "timings.json")
+    errors, records = _run([{"name": "a", "args": ["--timings", missing]}])
+    assert errors == 0
+    assert records[0]["warnings"] == [f"::warning::Timing history {missing} not found"]
+
+
+def test_process_pool_keeps_the_input_order():
+    requests = [
+        {"name": str(i), "features": "python39" if i % 2 else None} for i in range(12)
+    ]
+    _, sequential = _run(requests)
+    _, pooled = _run(requests, jobs=2)
+    assert pooled == sequential
+
+
+@pytest.mark.parametrize("flag", ["--help", "-h"])
+def test_help_is_an_error_record_and_prints_nothing(flag, capsys):
+    errors, records = _run([{"name": "a", "args": [flag]}])
+    assert errors == 1
+    assert records == [{"name": "a", "error": f"unrecognized arguments: {flag}"}]
+    assert capsys.readouterr().out == ""
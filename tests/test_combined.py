@@ -0,0 +1,96 @@
+import pytest
+
+from addonfactory_test_matrix_action.combined import (
+    generate_combined,
+    iter_combined,
+    parse_excludes,
+)
+
+_SPLUNK = [
+    {"version": "10.2.5", "build": "a"},
+    {"version": "9.4.13", "build": "b", "serverConfPythonVersion": "python3"},
+    {"version": "9.4.13", "build": "b", "serverConfPythonVersion": "force_python3"},
+]
+_SC4S = [{"version": "3.40.0"}, {"version": "2.9.0"}]
+_VENDORS = [{"version": "7.1", "image": "v:7.1"}, {"version": "7.2", "image": "v:7.2"}]
+_AXES = [("splunk", _SPLUNK), ("sc4s", _SC4S), ("vendor", _VENDORS)]
+
+
+def _versions(jobs):
+    return [
+        tuple(job[axis]["version"] for axis in ("splunk", "sc4s", "vendor"))
+        for job in jobs
+    ]
+
+
+def test_full_product_in_axis_order():
+    jobs = list(iter_combined(_AXES))
+    assert len(jobs) == 3 * 2 * 2
+    assert jobs[0] == {"splunk": _SPLUNK[0], "sc4s": _SC4S[0], "vendor": _VENDORS[0]}
+    assert _versions(jobs)[:2] == [
+        ("10.2.5", "3.40.0", "7.1"),
+        ("10.2.5", "3.40.0", "7.2"),
+    ]
+
+
+def test_excludes_are_glob_matched_across_axes():
+    excludes = parse_excludes(
+        '[{"splunk.version": "9.*", "sc4s.version": "2.*"},'
+        ' {"splunk.serverConfPythonVersion": "force_*"}]'
+    )
+    jobs = list(iter_combined(_AXES, excludes))
+    assert ("9.4.13", "2.9.0", "7.1") not in _versions(jobs)
+    assert all(
+        job["splunk"].get("serverConfPythonVersion") != "force_python3" for job in jobs
+    )
+    assert len(jobs) == 2 * 2 + 1 * 1 * 2
+
+
+def test_excluded_subtrees_are_never_expanded():
+    visited = []
+
+    class Recording(list):
+        def __iter__(self):
+            visited.append(True)
+            return super().__iter__()
+
+    axes = [("splunk", _SPLUNK), ("sc4s", _SC4S), ("vendor", Recording(_VENDORS))]
+    jobs = list(iter_combined(axes, parse_excludes('[{"splunk.version": "9.*"}]')))
+    assert len(jobs) == 1 * 2 * 2
+    # Only the two SC4S branches under 10.2.5 reach the vendor axis.
+    assert len(visited) == 2
+
+
+def test_budget_stops_enumeration():
+    jobs, truncated = generate_combined(_AXES, max_jobs=5)
+    assert len(jobs) == 5 and truncated
+    jobs, truncated = generate_combined(_AXES, max_jobs=12)
+    assert len(jobs) == 12 and not truncated
+
+
+def test_rules_on_missing_axes_never_match():
+    axes = _AXES[:2]
+    jobs = list(iter_combined(axes, parse_excludes('[{"vendor.version": "*"}]')))
+    assert len(jobs) == 6
+
+
+def test_an_empty_axis_empties_the_product():
+    axes = [_AXES[0], ("sc4s", []), _AXES[2]]
+    assert list(iter_combined(axes)) == []
+    assert generate_combined(axes) == ([], False)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "{",
+        '{"splunk.version": "9.*"}',
+        "[{}]",
+        '[{"os.name": "x"}]',
+        '[{"splunk": "x"}]',
+        '[{"splunk.version": 9}]',
+    ],
+)
+def test_invalid_excludes(text):
+    with pytest.raises(ValueError, match="--combined-exclude"):
+        parse_excludes(text)
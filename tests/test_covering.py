@@ -0,0 +1,103 @@
+import itertools
+
+import pytest
+
+from addonfactory_test_matrix_action.combined import parse_excludes
+from addonfactory_test_matrix_action.covering import generate_covering, parse_coverage
+
+
+def _axes(*sizes):
+    return [
+        (f"a{i}", [{"version": f"{i}.{v}"} for v in range(size)])
+        for i, size in enumerate(sizes)
+    ]
+
+
+def _assert_covers(axes, jobs, strength, skip=lambda tuple_: False):
+    for combo in itertools.combinations(axes, strength):
+        for entries in itertools.product(*(entries for _, entries in combo)):
+            wanted = {name: entry for (name, _), entry in zip(combo, entries)}
+            if skip(wanted):
+                continue
+            assert any(
+                all(job[name] == entry for name, entry in wanted.items())
+                for job in jobs
+            ), wanted
+
+
+@pytest.mark.parametrize(
+    "strength, sizes", [(1, (4, 3, 5)), (2, (4, 3, 5, 2)), (3, (3, 3, 3, 3))]
+)
+def test_covers_every_t_tuple(strength, sizes):
+    axes = _axes(*sizes)
+    jobs, truncated = generate_covering(axes, strength)
+    assert not truncated
+    _assert_covers(axes, jobs, strength)
+    assert len(jobs) < len(list(itertools.product(*(e for _, e in axes))))
+
+
+def test_pairwise_is_much_smaller_than_the_product():
+    jobs, _ = generate_covering(_axes(20, 10, 20, 20), 2)
+    assert 400 <= len(jobs) <= 600
+    assert len(jobs) < 20 * 10 * 20 * 20 // 50
+
+
+def test_is_deterministic():
+    axes = _axes(7, 5, 6)
+    assert generate_covering(axes, 2) == generate_covering(axes, 2)
+
+
+def test_strength_above_axis_count_is_the_full_product():
+    jobs, _ = generate_covering(_axes(2, 3), 3)
+    assert len(jobs) == 6
+
+
+def test_required_entries_survive_the_budget():
+    axes = _axes(10, 10, 10)
+    jobs, truncated = generate_covering(
+        axes, 2, max_jobs=2, required=[("a0", 9), ("a0", 4)]
+    )
+    assert truncated
+    assert [job["a0"]["version"] for job in jobs] == ["0.9", "0.4"]
+
+
+def test_excludes_are_respected():
+    axes = _axes(3, 3, 3)
+    excludes = parse_excludes(
+        '[{"a0.version": "0.0", "a1.version": "1.[01]"}]', {"a0", "a1", "a2"}
+    )
+    jobs, _ = generate_covering(axes, 2, excludes)
+    assert not any(
+        job["a0"]["version"] == "0.0" and job["a1"]["version"] in ("1.0", "1.1")
+        for job in jobs
+    )
+    _assert_covers(
+        axes,
+        jobs,
+        2,
+        skip=lambda wanted: wanted.get("a0", {}).get("version") == "0.0"
+        and wanted.get("a1", {}).get("version") in ("1.0", "1.1"),
+    )
+
+
+def test_excludes_that_forbid_a_value_entirely():
+    axes = _axes(2, 2)
+    excludes = parse_excludes('[{"a1.version": "1.1"}]', {"a0", "a1"})
+    jobs, _ = generate_covering(axes, 2, excludes)
+    assert sorted((j["a0"]["version"], j["a1"]["version"]) for j in jobs) == [
+        ("0.0", "1.0"),
+        ("0.1", "1.0"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "text, strength", [(None, None), ("full", None), ("pairwise", 2), ("t=3", 3)]
+)
+def test_parse_coverage(text, strength):
+    assert parse_coverage(text) == strength
+
+
+@pytest.mark.parametrize("text", ["t=0", "t=x", "triple", ""])
+def test_parse_coverage_rejects(text):
+    with pytest.raises(ValueError, match="--coverage"):
+        parse_coverage(text)
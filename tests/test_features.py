@@ -0,0 +1,109 @@
+import configparser
+import textwrap
+from types import MappingProxyType
+
+import pytest
+
+from addonfactory_test_matrix_action.features import (
+    FeatureIndex,
+    evaluate,
+    parse_features,
+)
+from addonfactory_test_matrix_action.model import MatrixModel
+
+_SPLUNK = textwrap.dedent(
+    """\
+    [GENERAL]
+    LATEST = 3.0
+    OLDEST = 1.0
+
+    [3.0]
+    VERSION = 3.0.0
+    BUILD = aaaaaaaaaaaa
+    SUPPORTED = 2099-01-01
+    PYTHON39 = true
+    PYTHON37 = false
+    FIPS = yes
+
+    [2.0]
+    VERSION = 2.0.0
+    BUILD = bbbbbbbbbbbb
+    SUPPORTED = 2099-01-01
+    PYTHON39 = true
+    PYTHON37 = true
+
+    [1.0]
+    VERSION = 1.0.0
+    BUILD = cccccccccccc
+    SUPPORTED = 2099-01-01
+    PYTHON37 = true
+"""
+)
+
+
+@pytest.fixture(scope="module")
+def model():
+    config = configparser.ConfigParser()
+    config.read_string(_SPLUNK)
+    return MatrixModel.from_configs(config)
+
+
+def _select(model, text):
+    return [s.section for s in model.feature_index.select(text, model.splunk)]
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        (None, ["3.0", "2.0", "1.0"]),
+        ("", ["3.0", "2.0", "1.0"]),
+        ("python39", ["3.0", "2.0"]),
+        ("PYTHON39,python37", ["2.0"]),
+        ("python39 & python37", ["2.0"]),
+        ("python39,!python37", ["3.0"]),
+        ("!python39", ["1.0"]),
+        ("fips|python37", ["3.0", "2.0", "1.0"]),
+        ("(fips | !python39), python37", ["1.0"]),
+        ("!(python39,python37)", ["3.0", "1.0"]),
+        ("!!fips", ["3.0"]),
+        ("unknown", []),
+        ("!unknown", ["3.0", "2.0", "1.0"]),
+        ("python39,!unknown", ["3.0", "2.0"]),
+    ],
+)
+def test_index_matches_props_evaluation(model, text, expected):
+    assert _select(model, text) == expected
+    node = parse_features(text)
+    assert [s.section for s in model.splunk if evaluate(node, s.props)] == expected
+
+
+def test_masks_cover_every_boolean_flag(model):
+    index = model.feature_index
+    assert set(index.bits) == {"python39", "python37", "fips"}
+    assert index.masks[0] == (1 << index.bits["python39"]) | (1 << index.bits["fips"])
+
+
+def test_precedence_and_binds_tighter_than_or():
+    assert parse_features("a|b,c") == (
+        "or",
+        (("flag", "a"), ("and", (("flag", "b"), ("flag", "c")))),
+    )
+
+
+@pytest.mark.parametrize("text", ["a,", "a||b", "(a", "a)", "!", "a b", "a;b"])
+def test_malformed_expressions_raise(text):
+    with pytest.raises(ValueError, match="Invalid --features expression"):
+        parse_features(text)
+
+
+def test_predicates_are_compiled_once(model):
+    index = FeatureIndex(model.splunk)
+    assert index.predicate("python39") is index.predicate("python39")
+
+
+def test_has_features_on_plain_props():
+    props = MappingProxyType({"python39": True, "python37": False})
+    from addonfactory_test_matrix_action.main import has_features
+
+    assert has_features("python39,!python37", props)
+    assert not has_features("python39,python37", props)
@@ -1,16 +1,25 @@
 import argparse
 import configparser
 import textwrap
+from datetime import date
 from unittest.mock import patch
 
 import pytest
 
 from addonfactory_test_matrix_action.main import (
     _ALLOWED_SERVER_CONF_PYTHON_VERSIONS,
+    _config_dir,
+    _add_months,
+    _generate_forecast,
+    _generate_supported_sc4s,
     _generate_supported_splunk,
     _generate_supported_splunk_modinput,
     _load_splunk_config,
     _iter_splunk_sections,
+    _load_model,
+    _parse_arguments,
+    _render_outputs,
+    main,
 )
 
 # ---------------------------------------------------------------------------
@@ -179,3 +188,110 @@ class TestGenerateSupportedSplunkModinput:
 
     def test_allowlist_contents(self):
         assert _ALLOWED_SERVER_CONF_PYTHON_VERSIONS == {"python3", "force_python3"}
+
+
+class TestAsOf:
+    def _args(self, as_of):
+        args = _args()
+        args.as_of = date.fromisoformat(as_of)
+        return args
+
+    def test_generators_answer_for_the_given_day(self):
+        with _mock_load(_MATRIX_TEMPLATE):
+            before = _generate_supported_splunk(self._args("2020-01-01"), path="unused")
+            after = _generate_supported_splunk(self._args("2099-01-01"), path="unused")
+        assert len(before) == _MATRIX_TEMPLATE.count("SUPPORTED")
+        assert after == []
+
+    def test_sc4s_as_of(self, tmp_path):
+        (tmp_path / "SC4S_matrix.conf").write_text(
+            "[1]\nVERSION = 1.0.0\nSUPPORTED = 2024-06-01\n\n[2]\nVERSION = 2.0.0\n"
+        )
+
+        def versions(day):
+            entries = _generate_supported_sc4s(self._args(day), path=str(tmp_path))
+            return [entry["version"] for entry in entries]
+
+        assert versions("2024-05-31") == ["1.0.0", "2.0.0"]
+        assert versions("2024-06-01") == ["2.0.0"]
+
+    def test_invalid_as_of_is_a_usage_error(self, monkeypatch, capsys):
+        monkeypatch.setattr("sys.argv", ["main", "--as-of", "tomorrow"])
+        with pytest.raises(SystemExit):
+            main()
+        assert "expected YYYY-MM-DD" in capsys.readouterr().err
+
+
+class TestForecast:
+    _SC4S = "[1]\nVERSION = 1.0.0\nSUPPORTED = 2027-02-01\n\n[2]\nVERSION = 2.0.0\n"
+
+    def _forecast(self, tmp_path, as_of, months):
+        (tmp_path / "splunk_matrix.conf").write_text(_MATRIX_TEMPLATE)
+        (tmp_path / "SC4S_matrix.conf").write_text(self._SC4S)
+        args = _args()
+        args.as_of = date.fromisoformat(as_of)
+        args.forecast_months = months
+        return _generate_forecast(args, path=str(tmp_path))
+
+    def test_one_snapshot_per_boundary_in_the_window(self, tmp_path):
+        forecast = self._forecast(tmp_path, "2026-07-01", 12)
+        assert [f["date"] for f in forecast] == [
+            "2026-07-01",
+            "2026-07-24",
+            "2026-12-16",
+            "2027-02-01",
+        ]
+        versions = [[s["version"] for s in f["supportedSplunk"]] for f in forecast]
+        assert versions == [
+            ["10.2.2", "9.4.10", "9.3.11"],
+            ["10.2.2", "9.4.10"],
+            ["10.2.2"],
+            ["10.2.2"],
+        ]
+        assert [s["version"] for s in forecast[3]["supportedSC4S"]] == ["2.0.0"]
+        assert forecast[2]["supportedSC4S"][0]["version"] == "1.0.0"
+
+    def test_snapshots_match_as_of_queries(self, tmp_path):
+        for snapshot in self._forecast(tmp_path, "2026-01-01", 30):
+            args = _args()
+            args.as_of = date.fromisoformat(snapshot["date"])
+            with _mock_load(_MATRIX_TEMPLATE):
+                assert snapshot["supportedSplunk"] == _generate_supported_splunk(
+                    args, path="unused"
+                )
+
+    def test_add_months_clamps(self):
+        assert _add_months(date(2026, 1, 31), 1) == date(2026, 2, 28)
+        assert _add_months(date(2026, 11, 15), 3) == date(2027, 2, 15)
+
+
+class TestEmptyAxes:
+    @pytest.mark.parametrize(
+        "argv", [["--as-of", "2099-01-01"], ["--features", "python27"]]
+    )
+    def test_no_supported_splunk(self, argv, tmp_path, monkeypatch):
+        output = tmp_path / "output"
+        monkeypatch.setenv("GITHUB_OUTPUT", str(output))
+        monkeypatch.setattr("sys.argv", ["main", "--cache-dir=", *argv])
+        main()
+        text = output.read_text()
+        assert "supportedSplunkModinput=[]\n" in text
+        assert "combinedMatrix=[]\n" in text
+
+    def test_ui_only_vendor_matrix(self, tmp_path):
+        vendormatrix = tmp_path / ".vendormatrix"
+        vendormatrix.write_text(
+            "[1]\nVERSION = 7.0\nDOCKER_IMAGE = vendor:7.0\n"
+            "TRIGGER_MODINPUT_FUNCTIONAL = false\n"
+        )
+        path = _config_dir()
+        model = _load_model(path, vendors_matrix=str(vendormatrix))
+        args, excludes, strength, durations = _parse_arguments([])
+        outputs = dict(
+            _render_outputs(
+                args, path, model, excludes, strength, durations, lambda line: None
+            ).items()
+        )
+        assert outputs["supportedModinputFunctionalVendors"] == "[]"
+        assert outputs["supportedUIVendors"] != "[]"
+        assert outputs["combinedMatrix"] == "[]"
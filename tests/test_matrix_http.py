@@ -0,0 +1,267 @@
+import json
+import os
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from matrix_http import (
+    DeadlineExceeded,
+    HttpCache,
+    HttpClient,
+    RetryPolicy,
+    TokenBucket,
+    fetch_concurrently,
+)
+
+
+def _response(status_code=200, content=b"{}", headers=None) -> MagicMock:
+    mock = MagicMock()
+    mock.status_code = status_code
+    mock.content = content
+    mock.text = content.decode()
+    mock.json.side_effect = lambda: json.loads(content)
+    mock.headers = headers or {}
+    mock.raise_for_status = MagicMock()
+    if status_code >= 400:
+        mock.raise_for_status.side_effect = Exception("HTTP error")
+    return mock
+
+
+def test_client_without_cache_sends_plain_requests():
+    client = HttpClient()
+    with patch(
+        "matrix_http.requests.Session.get", return_value=_response()
+    ) as mock_get:
+        client.get("https://example.test/a")
+    mock_get.assert_called_once_with("https://example.test/a", timeout=30)
+    assert not client.all_not_modified
+
+
+def test_client_revalidates_with_etag_and_serves_304_from_disk(tmp_path):
+    client = HttpClient(HttpCache(str(tmp_path)))
+    first = _response(content=b'{"v": 1}', headers={"ETag": '"abc"'})
+    with patch("matrix_http.requests.Session.get", return_value=first):
+        assert client.get("https://example.test/a").json() == {"v": 1}
+    assert not client.all_not_modified
+
+    client = HttpClient(HttpCache(str(tmp_path)))
+    with patch(
+        "matrix_http.requests.Session.get", return_value=_response(304, b"")
+    ) as mock_get:
+        response = client.get("https://example.test/a")
+    assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+    assert response.json() == {"v": 1}
+    assert client.all_not_modified
+
+
+def test_client_sends_if_modified_since(tmp_path):
+    client = HttpClient(HttpCache(str(tmp_path)))
+    stamp = "Wed, 21 Oct 2026 07:28:00 GMT"
+    with patch(
+        "matrix_http.requests.Session.get",
+        return_value=_response(content=b"<td>", headers={"Last-Modified": stamp}),
+    ):
+        client.get("https://example.test/page")
+    with patch(
+        "matrix_http.requests.Session.get", return_value=_response(304, b"")
+    ) as mock_get:
+        assert client.get("https://example.test/page").text == "<td>"
+    assert mock_get.call_args.kwargs["headers"] == {"If-Modified-Since": stamp}
+
+
+def test_responses_without_validators_are_not_cached(tmp_path):
+    client = HttpClient(HttpCache(str(tmp_path)))
+    with patch("matrix_http.requests.Session.get", return_value=_response()):
+        client.get("https://example.test/a")
+    assert not os.listdir(tmp_path)
+
+
+def test_http_errors_are_raised(tmp_path):
+    client = HttpClient(HttpCache(str(tmp_path)))
+    with patch("matrix_http.requests.Session.get", return_value=_response(500)):
+        with pytest.raises(Exception, match="HTTP error"):
+            client.get("https://example.test/a")
+
+
+def test_expired_entries_are_dropped(tmp_path):
+    cache = HttpCache(str(tmp_path), ttl=60)
+    cache.store("https://example.test/a", _response(headers={"ETag": "x"}))
+    meta_path = next(p for p in tmp_path.iterdir() if p.suffix == ".json")
+    meta = json.loads(meta_path.read_text())
+    meta["stored_at"] = time.time() - 120
+    meta_path.write_text(json.dumps(meta))
+    assert cache.lookup("https://example.test/a") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_revalidation_restarts_the_ttl(tmp_path):
+    url = "https://example.test/a"
+    cache = HttpCache(str(tmp_path), ttl=60)
+    cache.store(url, _response(content=b'{"v": 1}', headers={"ETag": '"abc"'}))
+    meta_path = next(p for p in tmp_path.iterdir() if p.suffix == ".json")
+
+    def age(seconds):
+        meta = json.loads(meta_path.read_text())
+        meta["stored_at"] -= seconds
+        meta_path.write_text(json.dumps(meta))
+
+    # Two revalidations 50s apart: the entry is 100s old, above the TTL.
+    for _ in range(2):
+        age(50)
+        client = HttpClient(cache)
+        with patch(
+            "matrix_http.requests.Session.get", return_value=_response(304, b"")
+        ) as mock_get:
+            assert client.get(url).json() == {"v": 1}
+        assert mock_get.call_args.kwargs["headers"] == {"If-None-Match": '"abc"'}
+        assert client.all_not_modified
+
+
+def test_size_eviction_drops_least_recently_used(tmp_path):
+    cache = HttpCache(str(tmp_path), max_bytes=25)
+    for name in ("a", "b"):
+        cache.store(
+            f"https://example.test/{name}",
+            _response(content=b"x" * 10, headers={"ETag": name}),
+        )
+    # Touch "a" so that "b" becomes the least recently used entry.
+    time.sleep(0.01)
+    cache.load("https://example.test/a", cache.lookup("https://example.test/a"))
+    cache.store(
+        "https://example.test/c", _response(content=b"x" * 10, headers={"ETag": "c"})
+    )
+    assert cache.lookup("https://example.test/a") is not None
+    assert cache.lookup("https://example.test/b") is None
+    assert cache.lookup("https://example.test/c") is not None
+
+
+def test_state_round_trip(tmp_path):
+    cache = HttpCache(str(tmp_path / "cache"))
+    assert cache.read_state("config") is None
+    cache.write_state("config", "digest")
+    assert cache.read_state("config") == "digest"
+
+
+def test_fetch_concurrently_overlaps_requests(fake_upstream):
+    for name in ("a", "b", "c"):
+        fake_upstream.route(f"/{name}", (200, name, None, 0.3))
+    client = HttpClient()
+    start = time.monotonic()
+    results = fetch_concurrently(
+        {
+            name: (lambda name=name: client.get(fake_upstream.url(f"/{name}")).text)
+            for name in ("a", "b", "c")
+        }
+    )
+    elapsed = time.monotonic() - start
+    assert results == {"a": "a", "b": "b", "c": "c"}
+    assert fake_upstream.max_in_flight == 3
+    assert elapsed < 0.8
+
+
+def test_client_caps_connections_per_host(fake_upstream):
+    for name in ("a", "b", "c"):
+        fake_upstream.route(f"/{name}", (200, name, None, 0.2))
+    client = HttpClient(max_connections_per_host=1)
+    fetch_concurrently(
+        {
+            name: (lambda name=name: client.get(fake_upstream.url(f"/{name}")))
+            for name in "abc"
+        }
+    )
+    assert fake_upstream.max_in_flight == 1
+
+
+def test_fetch_concurrently_reraises_after_all_tasks_finish():
+    finished = []
+
+    def slow():
+        time.sleep(0.1)
+        finished.append("slow")
+
+    def broken():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError, match="boom"):
+        fetch_concurrently({"broken": broken, "slow": slow})
+    assert finished == ["slow"]
+
+
+def test_client_reuses_pooled_connections_against_local_server(fake_upstream):
+    fake_upstream.route("/a", (200, "x", {"ETag": '"v1"'}))
+    client = HttpClient()
+    for _ in range(3):
+        assert client.get(fake_upstream.url("/a")).text == "x"
+    assert client.requests == 3
+
+
+def _no_jitter(low, high):
+    return 0.0
+
+
+def test_throttled_requests_are_retried_after_retry_after(fake_upstream):
+    fake_upstream.route(
+        "/tags",
+        (429, "slow down", {"Retry-After": "0"}),
+        (503, "busy"),
+        (200, {"results": []}),
+    )
+    client = HttpClient(retry=RetryPolicy(jitter=_no_jitter))
+    assert client.get(fake_upstream.url("/tags")).json() == {"results": []}
+    assert fake_upstream.hits == ["/tags"] * 3
+    assert (client.stats.requests, client.stats.retries) == (3, 2)
+
+
+def test_retries_give_up_with_the_last_response(fake_upstream):
+    fake_upstream.route("/tags", (429, "slow down"))
+    client = HttpClient(retry=RetryPolicy(max_attempts=2, jitter=_no_jitter))
+    with pytest.raises(requests.HTTPError):
+        client.get(fake_upstream.url("/tags"))
+    assert len(fake_upstream.hits) == 2
+
+
+def test_waits_beyond_the_deadline_fail_fast(fake_upstream):
+    fake_upstream.route("/tags", (429, "slow down", {"Retry-After": "30"}))
+    client = HttpClient(retry=RetryPolicy(jitter=_no_jitter), deadline=2)
+    start = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        client.get(fake_upstream.url("/tags"))
+    assert time.monotonic() - start < 1
+    assert fake_upstream.hits == ["/tags"]
+
+
+def test_exhausted_quota_pauses_the_host(fake_upstream):
+    reset = f"{time.time() + 0.3:.3f}"
+    fake_upstream.route(
+        "/a",
+        (200, "{}", {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}),
+    )
+    fake_upstream.route("/b", (200, "{}", None, 0.2))
+    client = HttpClient()
+    client.get(fake_upstream.url("/a"))
+    client.get(fake_upstream.url("/b"))
+    assert client.stats.wait_seconds >= 0.2
+    assert client.stats.transfer_seconds >= 0.2
+    assert "2 HTTP requests (0 retried)" in client.stats.summary()
+
+
+def test_connection_errors_are_retried():
+    client = HttpClient(retry=RetryPolicy(max_attempts=2, jitter=_no_jitter))
+    with pytest.raises(requests.ConnectionError):
+        # Nothing listens on port 9 (discard) locally.
+        client.get("http://127.0.0.1:9/tags", timeout=1)
+    assert (client.stats.requests, client.stats.retries) == (2, 1)
+
+
+def test_token_bucket_spaces_requests_beyond_the_burst():
+    now = [0.0]
+    bucket = TokenBucket(rate=2, capacity=2, clock=lambda: now[0])
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.5]
+    now[0] = 2.0
+    bucket.pause(1.5)
+    assert bucket.reserve() == 1.5
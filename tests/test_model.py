@@ -0,0 +1,159 @@
+import configparser
+from datetime import date
+import textwrap
+
+import pytest
+
+from addonfactory_test_matrix_action.model import MatrixModel
+
+_SPLUNK = textwrap.dedent(
+    """\
+    [GENERAL]
+    LATEST = 10.2
+    OLDEST = 9.4
+
+    [10.2]
+    VERSION = 10.2.2
+    BUILD = aaaaaaaaaaaa
+    SUPPORTED = 2028-01-15
+    PYTHON39 = true
+    PYTHON37 = false
+
+    [9.4]
+    VERSION = 9.4.10
+    BUILD = bbbbbbbbbbbb
+    SUPPORTED = 2026-12-16
+    PYTHON39 = True
+    SERVER_CONF_PYTHON_VERSIONS = python3, force_python3
+"""
+)
+
+_SC4S = textwrap.dedent(
+    """\
+    [2]
+    VERSION = 3.40.0
+    DOCKER_REGISTRY = ghcr.io/splunk/splunk-connect-for-syslog/container3
+
+    [1]
+    VERSION = 1.0.0
+    SUPPORTED = 2020-01-01
+"""
+)
+
+_VENDORS = textwrap.dedent(
+    """\
+    [1]
+    VERSION = 7.1
+    DOCKER_IMAGE = vendor/appliance:7.1
+    TRIGGER_UI = false
+
+    [2]
+    VERSION = 7.2
+    DOCKER_IMAGE = vendor/appliance:7.2
+"""
+)
+
+
+def _config(text):
+    config = configparser.ConfigParser()
+    config.read_string(text)
+    return config
+
+
+def _model(vendors=None):
+    return MatrixModel.from_configs(
+        _config(_SPLUNK),
+        _config(_SC4S),
+        _config(vendors) if vendors is not None else None,
+    )
+
+
+def test_splunk_values_are_coerced_once():
+    model = _model()
+    v102, v94 = model.splunk
+    assert v102.section == "10.2"
+    assert v102.supported.isoformat() == "2028-01-15"
+    assert v102.props["python39"] is True
+    assert v102.props["python37"] is False
+    assert v94.props["python39"] is True
+    assert v94.server_conf_python_versions == ("python3", "force_python3")
+    assert v102.server_conf_python_versions == ()
+
+
+def test_latest_and_oldest_flags():
+    model = _model()
+    assert [s.islatest for s in model.splunk] == [True, False]
+    assert [s.isoldest for s in model.splunk] == [False, True]
+
+
+def test_sc4s_rolling_and_default_registry():
+    model = _model()
+    rolling, expired = model.sc4s
+    assert rolling.supported is None
+    assert rolling.entry() == {
+        "version": "3.40.0",
+        "docker_registry": "ghcr.io/splunk/splunk-connect-for-syslog/container3",
+    }
+    assert expired.docker_registry == (
+        "ghcr.io/splunk/splunk-connect-for-syslog/container"
+    )
+
+
+def test_vendors_absent_without_vendormatrix():
+    assert _model().vendors is None
+
+
+def test_vendor_triggers():
+    first, second = _model(_VENDORS).vendors
+    assert (first.modinput_functional, first.ui) == (True, False)
+    assert (second.modinput_functional, second.ui) == (True, True)
+    assert second.entry() == {"version": "7.2", "image": "vendor/appliance:7.2"}
+
+
+def test_model_is_immutable():
+    model = _model()
+    with pytest.raises(AttributeError):
+        model.splunk = ()
+    with pytest.raises(AttributeError):
+        model.splunk[0].version = "0"
+    with pytest.raises(TypeError):
+        model.splunk[0].props["version"] = "0"
+    assert not hasattr(model.splunk[0], "__dict__")
+
+
+def test_eol_timeline_is_sorted_by_date():
+    timeline = _model().eol_timeline
+    assert [(d.isoformat(), s) for d, s in timeline] == [
+        ("2026-12-16", "9.4"),
+        ("2028-01-15", "10.2"),
+    ]
+
+
+def test_boolean_states_match_configparser():
+    from addonfactory_test_matrix_action import model
+
+    assert model._BOOLEAN_STATES == configparser.ConfigParser.BOOLEAN_STATES
+
+
+@pytest.mark.parametrize(
+    "day, sections",
+    [
+        ("2020-01-01", {"10.2", "9.4"}),
+        ("2026-12-15", {"10.2", "9.4"}),
+        ("2026-12-16", {"10.2"}),
+        ("2028-01-14", {"10.2"}),
+        ("2028-01-15", set()),
+    ],
+)
+def test_splunk_supported_on(day, sections):
+    model = _model()
+    positions = model.splunk_supported_on(date.fromisoformat(day))
+    assert positions == sorted(positions)
+    assert {model.splunk[i].section for i in positions} == sections
+
+
+@pytest.mark.parametrize(
+    "day, positions", [("2019-12-31", [0, 1]), ("2020-01-01", [0]), ("9999-12-30", [0])]
+)
+def test_sc4s_supported_on_keeps_rolling_versions(day, positions):
+    assert _model().sc4s_supported_on(date.fromisoformat(day)) == positions
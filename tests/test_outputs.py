@@ -0,0 +1,67 @@
+import json
+
+from addonfactory_test_matrix_action.outputs import GithubOutput, write_atomic
+
+
+def _parse(text):
+    """Minimal reader for the GITHUB_OUTPUT file format."""
+    values = {}
+    lines = iter(text.splitlines())
+    for line in lines:
+        if "<<" in line and ("=" not in line or line.index("<<") < line.index("=")):
+            key, delimiter = line.split("<<", 1)
+            body = []
+            for inner in lines:
+                if inner == delimiter:
+                    break
+                body.append(inner)
+            values[key] = "\n".join(body)
+        else:
+            key, value = line.split("=", 1)
+            values[key] = value
+    return values
+
+
+def test_set_returns_serialized_json():
+    outputs = GithubOutput()
+    assert outputs.set("supportedSplunk", [{"version": "1"}]) == '[{"version": "1"}]'
+    assert outputs.set("raw", "text") == "text"
+    assert "supportedSplunk" in outputs
+
+
+def test_small_values_use_single_line_syntax():
+    outputs = GithubOutput()
+    outputs.set("a", [1, 2])
+    outputs.set("b", {"k": "v"})
+    assert outputs.render() == 'a=[1, 2]\nb={"k": "v"}\n'
+
+
+def test_large_values_use_delimiter_syntax():
+    outputs = GithubOutput()
+    big = [{"version": str(i)} for i in range(200)]
+    outputs.set("big", big)
+    outputs.set("multiline", "one\ntwo")
+    rendered = outputs.render()
+    assert rendered.startswith("big<<ghadelimiter_")
+    parsed = _parse(rendered)
+    assert json.loads(parsed["big"]) == big
+    assert parsed["multiline"] == "one\ntwo"
+
+
+def test_write_appends_to_existing_file_in_one_pass(tmp_path):
+    target = tmp_path / "github_output"
+    target.write_text("previous=1\n")
+    target.chmod(0o600)
+    outputs = GithubOutput()
+    outputs.set("a", [1])
+    outputs.set("b", [2])
+    outputs.write(str(target))
+    assert target.read_text() == "previous=1\na=[1]\nb=[2]\n"
+    assert target.stat().st_mode & 0o777 == 0o600
+    assert [p.name for p in tmp_path.iterdir()] == ["github_output"]
+
+
+def test_write_atomic_creates_missing_file(tmp_path):
+    target = tmp_path / "github_output"
+    write_atomic(str(target), b"a=1\n")
+    assert target.read_bytes() == b"a=1\n"
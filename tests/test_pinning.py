@@ -0,0 +1,165 @@
+import json
+import threading
+import time
+
+import pytest
+
+from addonfactory_test_matrix_action import main, pinning
+from addonfactory_test_matrix_action.pinning import (
+    DigestCache,
+    pin_entries,
+    resolve_digest,
+    split_reference,
+)
+
+
+def test_split_reference():
+    assert split_reference("ghcr.io/splunk/sc4s/container3:3.40.0") == (
+        "ghcr.io",
+        "splunk/sc4s/container3",
+        "3.40.0",
+    )
+    assert split_reference("splunk/splunk:9.3.2") == (
+        "registry-1.docker.io",
+        "splunk/splunk",
+        "9.3.2",
+    )
+    assert split_reference("nginx") == (
+        "registry-1.docker.io",
+        "library/nginx",
+        "latest",
+    )
+    assert split_reference("localhost:5000/vendor") == (
+        "localhost:5000",
+        "vendor",
+        "latest",
+    )
+    with pytest.raises(ValueError, match="already pinned"):
+        split_reference("nginx@sha256:0")
+
+
+def test_resolve_digest_fetches_an_anonymous_token(fake_upstream):
+    registry = fake_upstream.base_url.split("://", 1)[1]
+    challenge = (
+        f'Bearer realm="{fake_upstream.url("/token")}",service="test",'
+        'scope="repository:vendor/app:pull"'
+    )
+    fake_upstream.route(
+        "/v2/vendor/app/manifests/7.0",
+        (401, "", {"WWW-Authenticate": challenge}),
+        (200, "", {"Docker-Content-Digest": "sha256:70"}),
+    )
+    fake_upstream.route(
+        "/token?service=test&scope=repository%3Avendor%2Fapp%3Apull",
+        {"token": "t"},
+    )
+    assert resolve_digest(f"{registry}/vendor/app:7.0", scheme="http") == "sha256:70"
+    assert [hit.split("?")[0] for hit in fake_upstream.hits] == [
+        "/v2/vendor/app/manifests/7.0",
+        "/token",
+        "/v2/vendor/app/manifests/7.0",
+    ]
+
+
+def test_pin_entries_resolves_each_image_once_with_bounded_workers():
+    calls = []
+    in_flight = [0, 0]
+    lock = threading.Lock()
+
+    def resolve(reference):
+        with lock:
+            calls.append(reference)
+            in_flight[0] += 1
+            in_flight[1] = max(in_flight)
+        time.sleep(0.02)
+        with lock:
+            in_flight[0] -= 1
+        if reference == "broken:1":
+            raise OSError("connection refused")
+        return f"sha256:{reference.split(':')[1]}"
+
+    entries = [
+        {"version": "3", "docker_registry": "sc4s"},
+        {"version": "7", "image": "vendor:7"},
+        {"version": "7", "image": "vendor:7"},
+        {"version": "", "image": ""},
+        {"version": "1", "image": "broken:1"},
+    ] + [{"version": str(i), "image": f"other:{i}"} for i in range(6)]
+    log = []
+    assert pin_entries(entries, DigestCache(), 2, resolve, log.append) == 9
+    assert sorted(calls) == sorted(
+        ["sc4s:3", "vendor:7", "broken:1"] + [f"other:{i}" for i in range(6)]
+    )
+    assert in_flight[1] == 2
+    assert entries[0]["pinned_image"] == "sc4s:3@sha256:3"
+    assert entries[2]["pinned_image"] == "vendor:7@sha256:7"
+    assert "pinned_image" not in entries[3] and "pinned_image" not in entries[4]
+    assert log == [
+        "::warning::Could not resolve the digest of broken:1: connection refused"
+    ]
+
+
+def test_digest_cache_expires_and_persists(tmp_path):
+    path = str(tmp_path / "digests.json")
+    now = [1000.0]
+    cache = DigestCache(path, ttl=60, clock=lambda: now[0])
+    cache.put("vendor:7", "sha256:7")
+    cache.save()
+
+    now[0] += 59
+    reloaded = DigestCache(path, ttl=60, clock=lambda: now[0])
+    assert reloaded.get("vendor:7") == "sha256:7"
+    assert pin_entries([{"image": "vendor:7"}], reloaded, resolve=None) == 1
+
+    now[0] += 1
+    assert DigestCache(path, ttl=60, clock=lambda: now[0]).get("vendor:7") is None
+    DigestCache(str(tmp_path / "missing" / "digests.json")).save()
+    (tmp_path / "corrupt.json").write_text("{")
+    assert DigestCache(str(tmp_path / "corrupt.json")).get("vendor:7") is None
+
+
+def test_render_outputs_pins_sc4s_and_vendor_entries(tmp_path, monkeypatch):
+    vendormatrix = tmp_path / ".vendormatrix"
+    vendormatrix.write_text("[1]\nVERSION = 7.0\nDOCKER_IMAGE = vendor:7.0\n")
+    monkeypatch.setattr(pinning, "resolve_digest", lambda reference: "sha256:ab")
+    path = main._config_dir()
+    model = main._load_model(path, vendors_matrix=str(vendormatrix))
+    args, excludes, strength, durations = main._parse_arguments(
+        ["--pin-digests", "--cache-dir", str(tmp_path / "cache")]
+    )
+    log = []
+    outputs = dict(
+        main._render_outputs(
+            args, path, model, excludes, strength, durations, log.append
+        ).items()
+    )
+
+    sc4s = json.loads(outputs["supportedSC4S"])
+    assert all(
+        entry["pinned_image"]
+        == f"{entry['docker_registry']}:{entry['version']}@sha256:ab"
+        for entry in sc4s
+    )
+    assert json.loads(outputs["supportedUIVendors"]) == [
+        {
+            "version": "7.0",
+            "image": "vendor:7.0",
+            "pinned_image": "vendor:7.0@sha256:ab",
+        }
+    ]
+    assert json.loads(outputs["combinedMatrix"])[0]["sc4s"]["pinned_image"]
+    assert f"Pinned {len(sc4s) + 2} of {len(sc4s) + 2} image entries" in log
+    cached = json.loads((tmp_path / "cache" / "digests.json").read_text())
+    assert cached["vendor:7.0"]["digest"] == "sha256:ab"
+
+
+def test_parser_defaults_match_the_pinning_defaults():
+    help_text = main._build_parser().format_help()
+    assert f"(default: {pinning.DEFAULT_JOBS})" in help_text
+    assert f"(default: {pinning.DEFAULT_TTL})" in help_text
+
+
+@pytest.mark.parametrize("argv", [["--pin-jobs", "0"], ["--pin-ttl", "-1"]])
+def test_pin_options_are_validated(argv):
+    with pytest.raises(ValueError, match="--pin-"):
+        main._parse_arguments(argv)
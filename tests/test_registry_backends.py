@@ -0,0 +1,152 @@
+import datetime
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import splunk_matrix_update
+from matrix_http import HttpClient
+from registry_backends import (
+    DockerHubBackend,
+    FixtureBackend,
+    OciBackend,
+    RegistryBackend,
+    TagListing,
+    backend_from_spec,
+    write_fixture,
+)
+from splunk_matrix_update import ImageIndex, get_images_details, update_splunk_version
+
+
+def _record(name, digest, last_updated="2026-01-01T00:00:00Z"):
+    return {
+        "name": name,
+        "last_updated": last_updated,
+        "images": [{"digest": digest, "architecture": "amd64"}],
+    }
+
+
+def _oci_routes(upstream, tags_pages, digests):
+    base = "/v2/splunk/splunk"
+    for index, tags in enumerate(tags_pages):
+        path = f"{base}/tags/list?n=2" + (f"&last={index}" if index else "")
+        headers = {}
+        if index + 1 < len(tags_pages):
+            headers["Link"] = f'<{base}/tags/list?n=2&last={index + 1}>; rel="next"'
+        upstream.route(path, (200, {"name": "splunk/splunk", "tags": tags}, headers))
+    for tag, digest in digests.items():
+        upstream.route(
+            f"{base}/manifests/{tag}",
+            (200, "", {"Docker-Content-Digest": digest}),
+        )
+
+
+def test_oci_backend_heads_only_the_newest_releases_and_their_builds(fake_upstream):
+    _oci_routes(
+        fake_upstream,
+        [["9.3.1", "9.3.2"], ["aaaaaaaaaaaa", "bbbbbbbbbbbb"], ["latest"]],
+        {
+            "9.3.2": "sha256:932",
+            "aaaaaaaaaaaa": "sha256:932",
+            "bbbbbbbbbbbb": "sha256:931",
+        },
+    )
+    backend = OciBackend(fake_upstream.base_url, "splunk/splunk", page_size=2)
+    pages = list(backend.iter_pages(HttpClient()))
+    index = ImageIndex(record for page in pages for record in page)
+
+    assert index.latest("9.3") == "9.3.2"
+    assert index.build_for_digest(index.digest("9.3.2")) == "aaaaaaaaaaaa"
+    manifests = sorted(hit for hit in fake_upstream.hits if "/manifests/" in hit)
+    assert [hit.rsplit("/", 1)[1] for hit in manifests] == [
+        "9.3.2",
+        "aaaaaaaaaaaa",
+        "bbbbbbbbbbbb",
+    ]
+
+
+def test_oci_backend_skips_tags_deleted_after_the_listing(fake_upstream):
+    # "aaaaaaaaaaaa" is listed but its manifest is gone: the fake answers 404.
+    _oci_routes(
+        fake_upstream,
+        [["9.3.2", "aaaaaaaaaaaa", "bbbbbbbbbbbb"]],
+        {"9.3.2": "sha256:932", "bbbbbbbbbbbb": "sha256:932"},
+    )
+    backend = OciBackend(fake_upstream.base_url, "splunk/splunk", page_size=2)
+    assert backend.digest(HttpClient(), "aaaaaaaaaaaa") is None
+    index = ImageIndex(
+        record for page in backend.iter_pages(HttpClient()) for record in page
+    )
+    assert index.build_for_digest(index.digest("9.3.2")) == "bbbbbbbbbbbb"
+
+
+def test_oci_backend_sends_the_token(fake_upstream, monkeypatch):
+    _oci_routes(fake_upstream, [["9.3.2"]], {"9.3.2": "sha256:932"})
+    monkeypatch.setenv("MATRIX_REGISTRY_TOKEN", "secret")
+    backend = backend_from_spec(f"oci:{fake_upstream.base_url}/splunk/splunk")
+    assert isinstance(backend, OciBackend) and backend.token == "secret"
+    assert backend._headers() == {"Authorization": "Bearer secret"}
+
+
+def test_fixture_backend_pages_and_honours_the_watermark(tmp_path):
+    path = str(tmp_path / "tags.json")
+    write_fixture(
+        path,
+        [
+            _record("9.3.2", "d2", "2026-03-01T00:00:00Z"),
+            _record("aaaaaaaaaaaa", "d2", "2026-03-01T00:00:00Z"),
+            _record("9.3.1", "d1", "2026-01-01T00:00:00Z"),
+        ],
+    )
+    backend = FixtureBackend(path, page_size=2)
+    assert [len(page) for page in backend.iter_pages(None)] == [2, 1]
+    listing = TagListing()
+    pages = list(backend.iter_pages(None, "2026-02-01T00:00:00Z", listing))
+    assert [r["name"] for page in pages for r in page] == ["9.3.2", "aaaaaaaaaaaa"]
+    assert listing.newest == "2026-03-01T00:00:00Z" and listing.reached_watermark
+
+
+def test_backend_specs():
+    assert backend_from_spec(None) is None
+    assert backend_from_spec("dockerhub") is None
+    assert isinstance(backend_from_spec("fixture:tags.json"), FixtureBackend)
+    for spec in ("oci:mirror.example", "oci:https://mirror.example", "quay:x"):
+        with pytest.raises(ValueError, match="Invalid registry"):
+            backend_from_spec(spec)
+
+
+def test_updater_runs_offline_from_a_fixture(tmp_path, monkeypatch):
+    future = (datetime.date.today() + datetime.timedelta(days=3650)).isoformat()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    conf = tmp_path / "config" / "splunk_matrix.conf"
+    conf.write_text(
+        "[GENERAL]\nLATEST = 9.3\nOLDEST = 9.3\n"
+        f"[9.3]\nVERSION = 9.3.1\nBUILD = cccccccccccc\nSUPPORTED = {future}\n"
+    )
+    write_fixture(
+        str(tmp_path / "tags.json"),
+        [_record("9.3.2", "d2"), _record("aaaaaaaaaaaa", "d2")],
+    )
+    monkeypatch.setattr(splunk_matrix_update, "get_support_policy", lambda: {})
+    monkeypatch.setattr(splunk_matrix_update, "http_client", HttpClient())
+    try:
+        splunk_matrix_update.configure_registry("fixture:tags.json")
+        assert [r["name"] for r in get_images_details()] == ["9.3.2", "aaaaaaaaaaaa"]
+        assert update_splunk_version() == "True"
+    finally:
+        splunk_matrix_update.configure_registry(None)
+    assert "VERSION = 9.3.2" in conf.read_text()
+    assert "BUILD = aaaaaaaaaaaa" in conf.read_text()
+    assert splunk_matrix_update.http_client.stats.requests == 0
+
+
+def test_registry_backend_is_abstract():
+    with pytest.raises(TypeError):
+        RegistryBackend()
+
+
+def test_docker_hub_backend_is_the_default():
+    assert isinstance(splunk_matrix_update._registry(), DockerHubBackend)
@@ -0,0 +1,74 @@
+import datetime
+import os
+from unittest.mock import patch
+
+import pytest
+
+from addonfactory_test_matrix_action import main
+from addonfactory_test_matrix_action.result_cache import ResultCache, cache_key
+
+_TODAY = datetime.date(2026, 1, 1)
+
+
+@pytest.fixture
+def conf(tmp_path):
+    path = tmp_path / "splunk_matrix.conf"
+    path.write_text("[GENERAL]\n")
+    return path
+
+
+def test_key_depends_on_every_input(tmp_path, conf):
+    base = cache_key([str(conf)], {"features": None}, _TODAY)
+    assert base == cache_key([str(conf)], {"features": None}, _TODAY)
+    assert base != cache_key([str(conf)], {"features": "python39"}, _TODAY)
+    assert base != cache_key([str(conf)], {"features": None}, _TODAY.replace(day=2))
+    assert base != cache_key([str(tmp_path / "missing")], {"features": None}, _TODAY)
+    conf.write_text("[GENERAL]\nLATEST = 1.0\n")
+    assert base != cache_key([str(conf)], {"features": None}, _TODAY)
+
+
+def test_store_and_load(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    assert cache.load("k") is None
+    cache.store("k", b"supportedSplunk=[]\n")
+    assert cache.load("k") == b"supportedSplunk=[]\n"
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    for age, key in enumerate(["old", "used", "new"]):
+        cache.store(key, b"x" * 10)
+        os.utime(tmp_path / f"{key}.out", (1000 + age, 1000 + age))
+    cache.load("used")
+    cache.max_bytes = 25
+    cache.store("newest", b"x" * 10)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["newest.out", "used.out"]
+
+
+def test_unwritable_cache_is_ignored(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ResultCache(str(blocker / "cache"))
+    cache.store("k", b"payload")
+    assert cache.load("k") is None
+
+
+def test_main_replays_cached_outputs(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    argv = ["main", "--cache-dir", str(tmp_path / "cache"), "--features", "python39"]
+
+    def run(output):
+        monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / output))
+        with patch("sys.argv", argv):
+            main.main()
+        return (tmp_path / output).read_text()
+
+    first = run("first")
+    with patch.object(main, "_load_model", side_effect=AssertionError("not cached")):
+        assert run("second") == first
+    argv.append("--coverage=pairwise")
+    with pytest.raises(AssertionError, match="not cached"):
+        with patch.object(
+            main, "_load_model", side_effect=AssertionError("not cached")
+        ):
+            run("third")
@@ -0,0 +1,95 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import sc4s_matrix_update
+import splunk_matrix_update
+from sc4s_matrix_update import (
+    get_sc4s_releases,
+    latest_releases_by_major,
+    set_stanza_option,
+    update_sc4s_version,
+)
+
+SC4S_CONF = (
+    "#SC4S Major versions\n"
+    "#\n"
+    "[2]\n"
+    "VERSION=3.40.0\n"
+    "DOCKER_REGISTRY=ghcr.io/splunk/splunk-connect-for-syslog/container3\n"
+    "\n"
+)
+
+
+@pytest.fixture
+def sc4s_conf(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    path = tmp_path / "config" / "SC4S_matrix.conf"
+    path.write_text(SC4S_CONF)
+    return path
+
+
+def test_get_sc4s_releases_skips_drafts_and_prereleases(fake_upstream, monkeypatch):
+    fake_upstream.route(
+        "/releases",
+        [
+            {"tag_name": "v3.41.0", "draft": False, "prerelease": False},
+            {"tag_name": "v4.0.0-beta.1", "draft": False, "prerelease": True},
+            {"tag_name": "v3.42.0", "draft": True, "prerelease": False},
+            {"tag_name": "v3.40.1", "draft": False, "prerelease": False},
+            {"tag_name": "not-a-version", "draft": False, "prerelease": False},
+        ],
+    )
+    monkeypatch.setattr(
+        sc4s_matrix_update, "SC4S_RELEASES_URL", fake_upstream.url("/releases")
+    )
+    splunk_matrix_update.configure_http_cache(None)
+
+    assert get_sc4s_releases() == ["3.41.0", "3.40.1"]
+
+
+def test_latest_releases_by_major():
+    assert latest_releases_by_major(["3.9.0", "3.10.0", "2.50.1", "3.10.0"]) == {
+        2: "2.50.1",
+        3: "3.10.0",
+    }
+
+
+def test_set_stanza_option_only_touches_matching_stanza():
+    lines = ["[1]\n", "VERSION = 1.0.0\n", "[2]\n", "VERSION=2.0.0\n"]
+    assert set_stanza_option(lines, "2", "VERSION", "2.1.0") is True
+    assert lines == ["[1]\n", "VERSION = 1.0.0\n", "[2]\n", "VERSION=2.1.0\n"]
+    assert set_stanza_option(lines, "2", "VERSION", "2.1.0") is False
+
+
+def test_update_sc4s_version_bumps_within_major_and_keeps_formatting(sc4s_conf):
+    assert update_sc4s_version(["3.40.0", "3.41.2", "3.41.10", "2.9.0"]) == "True"
+    assert sc4s_conf.read_text() == SC4S_CONF.replace("3.40.0", "3.41.10")
+
+
+def test_update_sc4s_version_moves_newest_stanza_to_new_major(sc4s_conf):
+    assert update_sc4s_version(["3.41.0", "4.0.0", "4.1.0"]) == "True"
+    assert sc4s_conf.read_text() == (
+        SC4S_CONF.replace("3.40.0", "4.1.0").replace("container3", "container4")
+    )
+
+
+def test_update_sc4s_version_keeps_older_stanzas_on_their_major(sc4s_conf):
+    sc4s_conf.write_text(
+        "[1]\nVERSION = 2.50.0\n\n[2]\nVERSION = 3.40.0\n"
+        "DOCKER_REGISTRY = ghcr.io/splunk/splunk-connect-for-syslog/container3\n"
+    )
+    assert update_sc4s_version(["2.51.0", "3.41.0", "4.0.0"]) == "True"
+    assert sc4s_conf.read_text() == (
+        "[1]\nVERSION = 2.51.0\n\n[2]\nVERSION = 4.0.0\n"
+        "DOCKER_REGISTRY = ghcr.io/splunk/splunk-connect-for-syslog/container4\n"
+    )
+
+
+def test_update_sc4s_version_returns_false_when_current(sc4s_conf):
+    assert update_sc4s_version(["3.39.0", "3.40.0"]) == "False"
+    assert sc4s_conf.read_text() == SC4S_CONF
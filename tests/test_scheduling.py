@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from addonfactory_test_matrix_action.scheduling import (
+    DurationModel,
+    entry_key,
+    load_timings,
+)
+
+_ENTRIES = [
+    {"version": "9.4.13", "build": "b", "serverConfPythonVersion": "python3"},
+    {"version": "9.4.13", "build": "b", "serverConfPythonVersion": "force_python3"},
+    {"version": "10.2.5", "build": "a"},
+    {"version": "10.4.1", "build": "c"},
+    {"version": "9.3.14", "build": "d"},
+]
+_TIMINGS = {
+    "9.4.13/b/python3": 300,
+    "9.4.13/b/force_python3": 500,
+    "10.2.5/a/": 400,
+    "10.4.1": 700,
+}
+
+
+def test_entry_key():
+    assert entry_key(_ENTRIES[0]) == "9.4.13/b/python3"
+    assert entry_key(_ENTRIES[2]) == "10.2.5/a/"
+
+
+def test_estimates_fall_back_to_version_and_median():
+    model = DurationModel(_TIMINGS)
+    assert [model.estimate(e) for e in _ENTRIES] == [300, 500, 400, 700, 500]
+
+
+def test_longest_first_is_stable():
+    model = DurationModel(_TIMINGS)
+    ordered = model.longest_first(_ENTRIES)
+    assert [entry_key(e) for e in ordered] == [
+        "10.4.1/c/",
+        "9.4.13/b/force_python3",
+        "9.3.14/d/",
+        "10.2.5/a/",
+        "9.4.13/b/python3",
+    ]
+    assert DurationModel({}).longest_first(_ENTRIES) == _ENTRIES
+
+
+def test_shards_are_balanced_with_lpt():
+    shards = DurationModel(_TIMINGS).shard(_ENTRIES, 2)
+    assert [shard["estimatedSeconds"] for shard in shards] == [1100, 1300]
+    assert sorted(
+        e for shard in shards for e in map(entry_key, shard["entries"])
+    ) == sorted(map(entry_key, _ENTRIES))
+
+
+def test_more_shards_than_entries_drops_empty_shards():
+    shards = DurationModel(_TIMINGS).shard(_ENTRIES[:2], 4)
+    assert [shard["index"] for shard in shards] == [0, 1]
+
+
+@pytest.mark.parametrize("content", ["[1, 2]", '{"a": "slow"}', '{"a": -1}', "{"])
+def test_invalid_history(tmp_path, content):
+    path = tmp_path / "timings.json"
+    path.write_text(content)
+    with pytest.raises(ValueError, match="Invalid timing history"):
+        load_timings(str(path))
+
+
+def test_load_timings(tmp_path):
+    path = tmp_path / "timings.json"
+    path.write_text(json.dumps(_TIMINGS))
+    assert load_timings(str(path)) == _TIMINGS
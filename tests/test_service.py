@@ -0,0 +1,155 @@
+import http.client
+import json
+import os
+import re
+import threading
+from unittest.mock import patch
+
+import pytest
+
+from addonfactory_test_matrix_action import main, service
+
+_CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
+_VENDORS = "[1]\nVERSION = 7.0\nDOCKER_IMAGE = vendor:7.0\n"
+_DELIMITER = re.compile(r"ghadelimiter_[0-9a-f]{32}")
+
+
+def _normalized(text):
+    return _DELIMITER.sub("ghadelimiter", text)
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    config = tmp_path / "config"
+    config.mkdir()
+    for name in ("splunk_matrix.conf", "SC4S_matrix.conf"):
+        with open(os.path.join(_CONFIG_DIR, name), "rb") as fh:
+            (config / name).write_bytes(fh.read())
+    return config
+
+
+@pytest.fixture
+def holder(config_dir, tmp_path):
+    return service.ModelHolder(str(config_dir), str(tmp_path / ".vendormatrix"))
+
+
+@pytest.fixture
+def address(holder, tmp_path, request):
+    listen = request.param.format(socket=tmp_path / "matrix.sock")
+    server = service.make_server(listen, holder)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    if not listen.startswith("unix:"):
+        listen = f"127.0.0.1:{server.server_address[1]}"
+    yield listen
+    server.shutdown()
+    server.server_close()
+
+
+def test_model_reloads_only_on_content_change(holder, config_dir):
+    model = holder.model()
+    assert holder.model() is model
+    conf = config_dir / "SC4S_matrix.conf"
+    os.utime(conf, ns=(1, 1))
+    assert holder.model() is model
+    conf.write_text(conf.read_text() + "\n[99]\nVERSION = 99.0.0\n")
+    reloaded = holder.model()
+    assert reloaded is not model
+    assert reloaded.sc4s[-1].version == "99.0.0"
+    assert holder.reloads == 2
+
+
+def test_queries_match_the_generators(holder, config_dir):
+    args = main._build_parser().parse_args(["--features", "python39"])
+    model = main._load_model(str(config_dir), "/nonexistent")
+    assert service.query(holder, "/splunk", "features=python39") == (
+        main._generate_supported_splunk(args, str(config_dir), model)
+    )
+    assert service.query(holder, "/sc4s", "as_of=2099-01-01") == [
+        entry.entry() for entry in model.sc4s if entry.supported is None
+    ]
+    with pytest.raises(service.RequestError):
+        service.query(holder, "/splunk", "features=(python39")
+    with pytest.raises(service.UnknownEndpoint):
+        service.query(holder, "/nothing")
+
+
+def test_vendors_without_vendormatrix_match_main(holder):
+    # The holder's .vendormatrix does not exist, like an add-on without one.
+    assert service.query(holder, "/vendors") == {
+        "supportedModinputFunctionalVendors": [{"version": "", "image": ""}],
+        "supportedUIVendors": [{"version": "", "image": ""}],
+    }
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1:0"], indirect=True)
+def test_unexpected_errors_are_answered(address, monkeypatch, capsys):
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(service, "query", broken)
+    host, port = address.rsplit(":", 1)
+    connection = http.client.HTTPConnection(host, int(port), timeout=5)
+    connection.request("GET", "/splunk")
+    response = connection.getresponse()
+    assert response.status == 500
+    assert json.loads(response.read()) == {"error": "internal error: boom"}
+    connection.close()
+
+
+def test_render_matches_main(holder, config_dir, tmp_path, monkeypatch):
+    argv = ["--features", "python39", "--coverage", "pairwise", "--as-of", "2026-01-01"]
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "local"))
+    with patch("sys.argv", ["main", *argv]), patch.object(
+        main, "_config_dir", return_value=str(config_dir)
+    ):
+        main.main()
+    text, log = service.render(holder, argv)
+    assert _normalized(text) == _normalized((tmp_path / "local").read_text())
+    assert log[0].startswith("Supported Splunk versions: ")
+
+
+def test_render_rejects_invalid_arguments(holder):
+    with pytest.raises(service.RequestError, match="--max-jobs"):
+        service.render(holder, ["--max-jobs", "0"])
+    with pytest.raises(service.RequestError, match="--timings"):
+        service.render(holder, ["--timings", "timings.json"])
+
+
+@pytest.mark.parametrize(
+    "address", ["127.0.0.1:0", "unix:{socket}"], indirect=True, ids=["tcp", "unix"]
+)
+def test_client_writes_outputs_from_the_service(address, holder, tmp_path, monkeypatch):
+    vendormatrix = tmp_path / "job.vendormatrix"
+    vendormatrix.write_text(_VENDORS)
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "output"))
+    argv = ["client", "--service", address, "--vendormatrix", str(vendormatrix)]
+    assert service.main(argv + ["--features", "python39"]) == 0
+    expected, _ = service.render(holder, ["--features", "python39"], _VENDORS)
+    assert _normalized((tmp_path / "output").read_text()) == _normalized(expected)
+    assert "vendor:7.0" in expected
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1:0"], indirect=True)
+def test_client_reports_rejected_arguments(address, tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "output"))
+    argv = ["client", "--service", address, "--features", "python39,"]
+    assert service.main(argv) == service.UNAVAILABLE
+    assert "::warning::Matrix service" in capsys.readouterr().out
+    assert not (tmp_path / "output").exists()
+
+
+def test_client_without_service_asks_for_fallback(tmp_path, monkeypatch):
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "output"))
+    argv = ["client", "--service", f"unix:{tmp_path / 'missing.sock'}"]
+    assert service.main(argv) == service.UNAVAILABLE
+
+
+@pytest.mark.parametrize("address", ["127.0.0.1:0"], indirect=True)
+def test_client_renders_an_empty_vendor_axis(address, tmp_path, monkeypatch):
+    vendormatrix = tmp_path / "job.vendormatrix"
+    vendormatrix.write_text(_VENDORS + "TRIGGER_MODINPUT_FUNCTIONAL = false\n")
+    monkeypatch.setenv("GITHUB_OUTPUT", str(tmp_path / "output"))
+    argv = ["client", "--service", address, "--vendormatrix", str(vendormatrix)]
+    assert service.main(argv) == 0
+    assert "combinedMatrix=[]\n" in (tmp_path / "output").read_text()
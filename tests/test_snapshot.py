@@ -0,0 +1,75 @@
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from addonfactory_test_matrix_action import main, snapshot
+from addonfactory_test_matrix_action.model import MatrixModel
+
+_CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "config")
+
+
+@pytest.fixture
+def config_dir(tmp_path):
+    for name in ("splunk_matrix.conf", "SC4S_matrix.conf"):
+        with open(os.path.join(_CONFIG_DIR, name), "rb") as fh:
+            (tmp_path / name).write_bytes(fh.read())
+    return tmp_path
+
+
+def _paths(config_dir):
+    return (
+        str(config_dir / snapshot.SNAPSHOT_NAME),
+        str(config_dir / "splunk_matrix.conf"),
+        str(config_dir / "SC4S_matrix.conf"),
+    )
+
+
+def test_snapshot_model_matches_parsed_model(config_dir):
+    snapshot.write_snapshot(str(config_dir))
+    loaded = snapshot.load_snapshot(*_paths(config_dir))
+    assert loaded is not None
+
+    with patch.object(main, "load_snapshot", return_value=None):
+        parsed = main._load_model(str(config_dir))
+    restored = MatrixModel.from_snapshot(loaded)
+    assert repr(restored.splunk) == repr(parsed.splunk)
+    assert repr(restored.sc4s) == repr(parsed.sc4s)
+    assert restored.eol_timeline == parsed.eol_timeline
+    assert restored.splunk_timeline == parsed.splunk_timeline
+    assert restored.sc4s_timeline == parsed.sc4s_timeline
+    assert (restored.latest, restored.oldest) == (parsed.latest, parsed.oldest)
+
+
+def test_stale_snapshot_is_ignored(config_dir):
+    snapshot.write_snapshot(str(config_dir))
+    with open(config_dir / "SC4S_matrix.conf", "a") as fh:
+        fh.write("\n[3]\nVERSION = 4.0.0\n")
+    assert snapshot.load_snapshot(*_paths(config_dir)) is None
+    versions = [sc4s.version for sc4s in main._load_model(str(config_dir)).sc4s]
+    assert "4.0.0" in versions
+
+
+def test_main_uses_matching_snapshot(config_dir):
+    snapshot_path = snapshot.write_snapshot(str(config_dir))
+    with open(snapshot_path) as fh:
+        data = json.load(fh)
+    data["sc4s"][0]["version"] = "from-snapshot"
+    with open(snapshot_path, "w") as fh:
+        json.dump(data, fh)
+    model = main._load_model(str(config_dir))
+    assert model.sc4s[0].version == "from-snapshot"
+
+
+@pytest.mark.parametrize("content", [b"", b"{not json", b'{"format": 0}'])
+def test_unusable_snapshot_falls_back(config_dir, content):
+    (config_dir / snapshot.SNAPSHOT_NAME).write_bytes(content)
+    assert snapshot.load_snapshot(*_paths(config_dir)) is None
+
+
+def test_compile_rejects_dangling_latest(config_dir):
+    conf = config_dir / "splunk_matrix.conf"
+    conf.write_text(conf.read_text().replace("LATEST = ", "LATEST = 99.", 1))
+    with pytest.raises(ValueError, match="LATEST"):
+        snapshot.compile_snapshot(*_paths(config_dir)[1:])
@@ -1,15 +1,29 @@
 import configparser
 import datetime
+import json
 import sys
 import os
+import time
 from unittest.mock import patch, MagicMock
 
+import pytest
+
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+import splunk_matrix_update
+from matrix_http import HttpClient
+from registry_backends import write_fixture
 from splunk_matrix_update import (
+    ImageIndex,
     get_all_major_minor_versions,
+    get_build_number,
+    get_image_digest,
+    get_images_details,
+    get_latest_image,
     get_new_versions,
+    get_support_policy,
     get_supported_date,
+    parse_support_policy,
     add_new_version_stanza,
     remove_expired_versions,
     update_general_section,
@@ -17,6 +31,20 @@ from splunk_matrix_update import (
 )
 
 
+@pytest.fixture(autouse=True)
+def _fresh_support_policy():
+    get_support_policy.cache_clear()
+    yield
+    get_support_policy.cache_clear()
+
+
+@pytest.fixture
+def offline_support_policy():
+    # update_splunk_version prefetches the policy page alongside Docker Hub.
+    with patch("splunk_matrix_update.get_support_policy", return_value={}):
+        yield
+
+
 def make_config(content: str) -> configparser.ConfigParser:
     config = configparser.ConfigParser()
     config.optionxform = str
@@ -42,6 +70,36 @@ def test_get_all_major_minor_versions_empty():
     assert get_all_major_minor_versions([]) == []
 
 
+def test_get_latest_image_orders_numerically():
+    images = [{"name": "9.3.9"}, {"name": "9.3.11"}, {"name": "9.3.10"}]
+    assert get_latest_image("9.3", images) == "9.3.11"
+
+
+def test_get_latest_image_ignores_substring_and_prerelease_tags():
+    images = [
+        {"name": "9.3.1"},
+        {"name": "19.3.7"},
+        {"name": "9.3.5-rc1"},
+        {"name": "9.3.4-redhat"},
+        {"name": "109.3.9"},
+    ]
+    assert get_latest_image("9.3", images) == "9.3.1"
+    assert get_latest_image("9.4", images) is None
+
+
+def test_get_latest_image_includes_four_part_versions():
+    images = [{"name": "8.2.12"}, {"name": "8.2.12.1"}]
+    assert get_latest_image("8.2", images) == "8.2.12.1"
+
+
+def test_image_index_is_reusable_across_lookups():
+    index = ImageIndex([{"name": "10.4.0"}, {"name": "9.3.11"}, {"name": "latest"}])
+    index.add({"name": "10.4.1"})
+    assert get_latest_image("10.4", index) == "10.4.1"
+    assert get_latest_image("9.3", index) == "9.3.11"
+    assert sorted(get_all_major_minor_versions(index)) == ["10.4", "9.3"]
+
+
 def test_get_new_versions_returns_versions_not_in_config():
     config = make_config(
         "[GENERAL]\nLATEST = 10.2\nOLDEST = 9.3\n"
@@ -72,30 +130,30 @@ def _mock_response(text: str, status_code: int = 200) -> MagicMock:
 def test_get_supported_date_parses_table_structure():
     # Real page format: <td>X.Y</td><td>RELEASE</td><td>EOL</td>
     html = "<td>10.4</td><td>May 18 2026</td><td>May 18 2028</td>"
-    with patch("splunk_matrix_update.requests.get", return_value=_mock_response(html)):
+    with patch("matrix_http.requests.Session.get", return_value=_mock_response(html)):
         assert get_supported_date("10.4") == "2028-05-18"
 
 
 def test_get_supported_date_returns_unknown_for_not_released():
     html = "<td>10.3</td><td>Mar 24 2026</td><td>Not Released</td>"
-    with patch("splunk_matrix_update.requests.get", return_value=_mock_response(html)):
+    with patch("matrix_http.requests.Session.get", return_value=_mock_response(html)):
         assert get_supported_date("10.3") == "UNKNOWN"
 
 
 def test_get_supported_date_returns_unknown_on_network_error():
-    with patch("splunk_matrix_update.requests.get", side_effect=Exception("timeout")):
+    with patch("matrix_http.requests.Session.get", side_effect=Exception("timeout")):
         assert get_supported_date("10.4") == "UNKNOWN"
 
 
 def test_get_supported_date_returns_unknown_when_version_not_found():
     html = "<html>No relevant content here</html>"
-    with patch("splunk_matrix_update.requests.get", return_value=_mock_response(html)):
+    with patch("matrix_http.requests.Session.get", return_value=_mock_response(html)):
         assert get_supported_date("10.4") == "UNKNOWN"
 
 
 def test_get_supported_date_returns_unknown_on_http_error():
     with patch(
-        "splunk_matrix_update.requests.get", return_value=_mock_response("", 500)
+        "matrix_http.requests.Session.get", return_value=_mock_response("", 500)
     ):
         assert get_supported_date("10.4") == "UNKNOWN"
 
@@ -106,17 +164,132 @@ def test_get_supported_date_does_not_match_adjacent_version():
         "<td>10.40</td><td>Jan 1 2025</td><td>Jan 1 2029</td>"
         "<td>10.4</td><td>May 18 2026</td><td>May 18 2028</td>"
     )
-    with patch("splunk_matrix_update.requests.get", return_value=_mock_response(html)):
+    with patch("matrix_http.requests.Session.get", return_value=_mock_response(html)):
         assert get_supported_date("10.4") == "2028-05-18"
 
 
 def test_get_supported_date_returns_unknown_when_version_absent_from_table():
     # Version not present in the table at all
     html = "<td>10.5</td><td>Jun 1 2027</td><td>Jun 1 2029</td>"
-    with patch("splunk_matrix_update.requests.get", return_value=_mock_response(html)):
+    with patch("matrix_http.requests.Session.get", return_value=_mock_response(html)):
         assert get_supported_date("10.4") == "UNKNOWN"
 
 
+def _page(records, next_url=None) -> MagicMock:
+    mock = MagicMock()
+    mock.json.return_value = {"results": records, "next": next_url}
+    return mock
+
+
+def _tag(name: str, digest: str, last_updated: str = "2026-01-01T00:00:00Z") -> dict:
+    return {
+        "name": name,
+        "last_updated": last_updated,
+        "images": [{"digest": digest, "architecture": "amd64", "size": 1}],
+    }
+
+
+def test_get_images_details_follows_next_links_and_trims_records():
+    pages = [
+        _page([_tag("10.4.1", "d1")], "https://hub.example/page2"),
+        _page([_tag("abc123def456", "d1")]),
+    ]
+    with patch("matrix_http.requests.Session.get", side_effect=pages) as mock_get:
+        result = get_images_details()
+    assert mock_get.call_count == 2
+    assert mock_get.call_args_list[1].args[0] == "https://hub.example/page2"
+    assert result == [
+        {"name": "10.4.1", "images": [{"digest": "d1"}]},
+        {"name": "abc123def456", "images": [{"digest": "d1"}]},
+    ]
+
+
+def test_get_images_details_stops_once_every_stanza_is_resolved():
+    config = make_config(
+        "[GENERAL]\nLATEST = 10.4\nOLDEST = 10.4\n[10.4]\nVERSION = 10.4.0\n"
+    )
+    pages = [
+        _page([_tag("10.4.1", "d1")], "https://hub.example/page2"),
+        _page([_tag("abc123def456", "d1")], "https://hub.example/page3"),
+        _page([_tag("10.4.0", "d0")]),
+    ]
+    with patch("matrix_http.requests.Session.get", side_effect=pages) as mock_get:
+        result = get_images_details(config)
+    assert mock_get.call_count == 2
+    assert [r["name"] for r in result] == ["10.4.1", "abc123def456"]
+
+
+def test_get_images_details_reads_all_pages_when_a_stanza_is_unresolved():
+    config = make_config("[9.3]\nVERSION = 9.3.11\n[10.4]\nVERSION = 10.4.0\n")
+    pages = [
+        _page([_tag("10.4.1", "d1"), _tag("abc123def456", "d1")], "https://p2"),
+        _page([_tag("9.3.10", "d9")]),
+    ]
+    with patch("matrix_http.requests.Session.get", side_effect=pages) as mock_get:
+        result = get_images_details(config)
+    assert mock_get.call_count == 2
+    assert len(result) == 3
+
+
+def test_get_images_details_stops_at_the_watermark():
+    pages = [
+        _page(
+            [
+                _tag("10.4.2", "d2", "2026-03-02T10:00:00.123456Z"),
+                _tag("abc123def456", "d2", "2026-03-02T09:00:00Z"),
+                _tag("10.4.1", "d1", "2026-03-01T00:00:00Z"),
+            ],
+            "https://hub.example/page2",
+        ),
+        _page([_tag("10.4.0", "d0", "2026-01-01T00:00:00Z")]),
+    ]
+    listing = splunk_matrix_update.TagListing()
+    with patch("matrix_http.requests.Session.get", side_effect=pages) as mock_get:
+        result = get_images_details(None, "2026-03-01T00:00:00Z", listing)
+    assert mock_get.call_count == 1
+    assert [r["name"] for r in result] == ["10.4.2", "abc123def456"]
+    assert listing.newest == "2026-03-02T10:00:00.123456Z"
+    assert listing.reached_watermark
+
+
+def test_parse_support_policy_builds_table_in_one_pass():
+    html = (
+        "<tr><td>10.4</td><td>May 18 2026</td><td>May 18 2028</td><td>x</td></tr>"
+        "<tr><td>10.3</td><td>Mar 24 2026</td><td>Not Released</td><td>x</td></tr>"
+        "<tr><TD>9.4</TD> <TD>Dec 16 2024</TD> <TD>Dec 16 2026</TD></tr>"
+    )
+    assert parse_support_policy(html) == {
+        "10.4": ("2026-05-18", "2028-05-18"),
+        "10.3": ("2026-03-24", None),
+        "9.4": ("2024-12-16", "2026-12-16"),
+    }
+
+
+def test_get_supported_date_fetches_policy_page_once():
+    html = (
+        "<td>10.4</td><td>May 18 2026</td><td>May 18 2028</td>"
+        "<td>10.2</td><td>Jan 15 2026</td><td>Jan 15 2028</td>"
+    )
+    with patch(
+        "matrix_http.requests.Session.get", return_value=_mock_response(html)
+    ) as mock_get:
+        assert get_supported_date("10.4") == "2028-05-18"
+        assert get_supported_date("10.2") == "2028-01-15"
+        assert get_supported_date("10.4") == "2028-05-18"
+        assert get_supported_date("9.9") == "UNKNOWN"
+    assert mock_get.call_count == 1
+
+
+def test_get_supported_date_retries_after_a_failed_fetch():
+    html = "<td>10.4</td><td>May 18 2026</td><td>May 18 2028</td>"
+    with patch(
+        "matrix_http.requests.Session.get",
+        side_effect=[Exception("timeout"), _mock_response(html)],
+    ):
+        assert get_supported_date("10.4") == "UNKNOWN"
+        assert get_supported_date("10.4") == "2028-05-18"
+
+
 SAMPLE_IMAGES = [
     {"name": "10.4.1", "images": [{"digest": "sha256-abc"}]},
     {"name": "10.4.0", "images": [{"digest": "sha256-xyz"}]},
@@ -124,6 +297,28 @@ SAMPLE_IMAGES = [
 ]
 
 
+def test_get_image_digest_and_build_number_from_index():
+    index = ImageIndex(SAMPLE_IMAGES)
+    assert get_image_digest("10.4.1", index) == "sha256-abc"
+    assert get_image_digest("10.4.0", index) == "sha256-xyz"
+    assert get_image_digest("10.9.9", index) is None
+    assert get_build_number("sha256-abc", index) == "abc123def456"
+    assert get_build_number("sha256-xyz", index) is None
+
+
+def test_get_build_number_prefers_first_listed_build_tag():
+    images = [
+        {"name": "aaaaaaaaaaaa", "images": [{"digest": "d1"}]},
+        {"name": "bbbbbbbbbbbb", "images": [{"digest": "d1"}]},
+        {"name": "latest", "images": [{"digest": "d1"}]},
+    ]
+    assert get_build_number("d1", images) == "aaaaaaaaaaaa"
+
+
+def test_get_image_digest_tolerates_records_without_images():
+    assert get_image_digest("10.4.1", [{"name": "10.4.1"}]) is None
+
+
 def test_add_new_version_stanza_adds_stanza_with_correct_fields():
     config = make_config("[GENERAL]\nLATEST = 10.2\nOLDEST = 9.3\n")
     with patch("splunk_matrix_update.get_supported_date", return_value="2028-06-15"):
@@ -243,6 +438,7 @@ def test_update_general_section_returns_false_when_unchanged():
     assert result is False
 
 
+@pytest.mark.usefixtures("offline_support_policy")
 def test_update_splunk_version_adds_new_minor_and_updates_general(
     tmp_path, monkeypatch
 ):
@@ -288,6 +484,7 @@ def test_update_splunk_version_adds_new_minor_and_updates_general(
     assert config.get("GENERAL", "OLDEST") == "9.3"
 
 
+@pytest.mark.usefixtures("offline_support_policy")
 def test_update_splunk_version_exits_on_unknown_eol_for_new_version(
     tmp_path, monkeypatch
 ):
@@ -316,3 +513,256 @@ def test_update_splunk_version_exits_on_unknown_eol_for_new_version(
         update_splunk_version()
 
     mock_exit.assert_called_once_with(1)
+
+
+@pytest.mark.usefixtures("offline_support_policy")
+def test_update_splunk_version_short_circuits_when_upstream_unchanged(
+    tmp_path, monkeypatch
+):
+    future_date = (datetime.date.today() + datetime.timedelta(days=3650)).isoformat()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "splunk_matrix.conf").write_text(
+        "[GENERAL]\nLATEST = 9.3\nOLDEST = 9.3\n"
+        f"[9.3]\nVERSION = 9.3.10\nBUILD = aabbccddee00\nSUPPORTED = {future_date}\n"
+    )
+    client = splunk_matrix_update.configure_http_cache(str(tmp_path / "cache"))
+    docker_images = [
+        {"name": "9.3.11", "images": [{"digest": "sha256-9311"}]},
+        {"name": "aabbccddee11", "images": [{"digest": "sha256-9311"}]},
+    ]
+    try:
+        # First run: nothing cached yet, so the update is applied and recorded.
+        with patch(
+            "splunk_matrix_update.get_images_details", return_value=docker_images
+        ):
+            assert update_splunk_version() == "True"
+
+        # Second run: every request revalidated with 304 and the config is the
+        # one the previous run wrote, so the tag listing is not re-applied.
+        client.requests = client.not_modified = 1
+        with patch(
+            "splunk_matrix_update.get_images_details", return_value=docker_images
+        ), patch("splunk_matrix_update.apply_upstream_changes") as mock_apply:
+            assert update_splunk_version() == "False"
+        mock_apply.assert_not_called()
+
+        # A hand-edited config is always re-checked.
+        conf = tmp_path / "config" / "splunk_matrix.conf"
+        conf.write_text(conf.read_text().replace("9.3.11", "9.3.10"))
+        with patch(
+            "splunk_matrix_update.get_images_details", return_value=docker_images
+        ):
+            assert update_splunk_version() == "True"
+    finally:
+        splunk_matrix_update.configure_http_cache(None)
+
+
+def test_update_splunk_version_fetches_upstreams_concurrently(
+    tmp_path, monkeypatch, fake_upstream
+):
+    future_date = (datetime.date.today() + datetime.timedelta(days=3650)).isoformat()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "splunk_matrix.conf").write_text(
+        "[GENERAL]\nLATEST = 9.3\nOLDEST = 9.3\n"
+        f"[9.3]\nVERSION = 9.3.10\nBUILD = aabbccddee00\nSUPPORTED = {future_date}\n"
+    )
+    fake_upstream.route(
+        "/tags",
+        (
+            200,
+            {
+                "results": [
+                    _tag("10.4.0", "sha256-1040"),
+                    _tag("bb1040bb1040", "sha256-1040"),
+                    _tag("9.3.11", "sha256-9311"),
+                    _tag("aabbccddee11", "sha256-9311"),
+                ],
+                "next": None,
+            },
+            None,
+            0.4,
+        ),
+    )
+    fake_upstream.route(
+        "/policy",
+        (200, "<td>10.4</td><td>May 18 2026</td><td>May 18 2028</td>", None, 0.4),
+    )
+    monkeypatch.setattr(
+        splunk_matrix_update, "DOCKER_HUB_TAGS_URL", fake_upstream.url("/tags")
+    )
+    monkeypatch.setattr(
+        splunk_matrix_update, "SUPPORT_POLICY_URL", fake_upstream.url("/policy")
+    )
+    splunk_matrix_update.configure_http_cache(None)
+
+    start = time.monotonic()
+    assert update_splunk_version() == "True"
+    elapsed = time.monotonic() - start
+
+    assert elapsed < 0.75
+    assert fake_upstream.max_in_flight == 2
+    assert sorted(fake_upstream.hits) == ["/policy", "/tags"]
+    config = make_config((tmp_path / "config" / "splunk_matrix.conf").read_text())
+    assert config.get("9.3", "VERSION") == "9.3.11"
+    assert config.get("10.4", "SUPPORTED") == "2028-05-18"
+
+
+def _incremental_setup(tmp_path, monkeypatch):
+    future_date = (datetime.date.today() + datetime.timedelta(days=3650)).isoformat()
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    conf = tmp_path / "config" / "splunk_matrix.conf"
+    conf.write_text(
+        "[GENERAL]\nLATEST = 9.3\nOLDEST = 9.3\n"
+        f"[9.3]\nVERSION = 9.3.10\nBUILD = aabbccddee00\nSUPPORTED = {future_date}\n"
+    )
+    return conf
+
+
+_FIRST_LISTING = [
+    _tag("9.3.10", "sha256-9310", "2026-02-01T00:00:00Z"),
+    _tag("aabbccddee00", "sha256-9310", "2026-02-01T00:00:00Z"),
+    _tag("9.3.9", "sha256-939", "2026-01-01T00:00:00Z"),
+]
+
+
+@pytest.mark.usefixtures("offline_support_policy")
+def test_update_splunk_version_only_reads_tags_after_the_watermark(
+    tmp_path, monkeypatch
+):
+    conf = _incremental_setup(tmp_path, monkeypatch)
+    state = tmp_path / "config" / "splunk_matrix.state.json"
+    with patch("matrix_http.requests.Session.get", return_value=_page(_FIRST_LISTING)):
+        assert update_splunk_version() == "False"
+    assert json.loads(state.read_text())["last_updated"] == "2026-02-01T00:00:00Z"
+
+    # Nothing new: one page request, no config or state change.
+    before = state.read_text()
+    with patch(
+        "matrix_http.requests.Session.get",
+        return_value=_page(_FIRST_LISTING, "https://hub.example/page2"),
+    ) as mock_get:
+        assert update_splunk_version() == "False"
+    assert mock_get.call_count == 1
+    assert state.read_text() == before
+
+    newer = [
+        _tag("9.3.11", "sha256-9311", "2026-03-01T00:00:00Z"),
+        _tag("aabbccddee11", "sha256-9311", "2026-03-01T00:00:00Z"),
+    ]
+    with patch(
+        "matrix_http.requests.Session.get",
+        return_value=_page(newer + _FIRST_LISTING, "https://hub.example/page2"),
+    ) as mock_get:
+        assert update_splunk_version() == "True"
+    assert mock_get.call_count == 1
+    config = make_config(conf.read_text())
+    assert config.get("9.3", "VERSION") == "9.3.11"
+    assert config.get("9.3", "BUILD") == "aabbccddee11"
+    assert json.loads(state.read_text())["last_updated"] == "2026-03-01T00:00:00Z"
+
+
+@pytest.mark.usefixtures("offline_support_policy")
+def test_update_splunk_version_lists_everything_when_the_watermark_is_unusable(
+    tmp_path, monkeypatch
+):
+    conf = _incremental_setup(tmp_path, monkeypatch)
+    with patch("matrix_http.requests.Session.get", return_value=_page(_FIRST_LISTING)):
+        update_splunk_version()
+
+    # The build tag of 9.3.11 predates the watermark: fall back to a full listing.
+    listing = [
+        _tag("9.3.11", "sha256-9311", "2026-03-01T00:00:00Z"),
+        *_FIRST_LISTING,
+    ]
+    old_build = _tag("aabbccddee11", "sha256-9311", "2025-12-01T00:00:00Z")
+    with patch(
+        "matrix_http.requests.Session.get",
+        side_effect=[_page(listing), _page(listing + [old_build])],
+    ) as mock_get:
+        assert update_splunk_version() == "True"
+    assert mock_get.call_count == 2
+    assert make_config(conf.read_text()).get("9.3", "BUILD") == "aabbccddee11"
+
+    # A hand-edited config invalidates the watermark as well.
+    conf.write_text(conf.read_text().replace("9.3.11", "9.3.10"))
+    with patch(
+        "matrix_http.requests.Session.get",
+        return_value=_page(listing + [old_build]),
+    ):
+        assert update_splunk_version() == "True"
+    assert make_config(conf.read_text()).get("9.3", "VERSION") == "9.3.11"
+
+
+def test_update_splunk_version_keeps_the_watermark_behind_releases_awaiting_a_build(
+    tmp_path, monkeypatch
+):
+    conf = _incremental_setup(tmp_path, monkeypatch)
+    state = tmp_path / "config" / "splunk_matrix.state.json"
+    future_date = (datetime.date.today() + datetime.timedelta(days=3650)).isoformat()
+    monkeypatch.setattr(
+        splunk_matrix_update,
+        "get_support_policy",
+        lambda: {"10.6": ("2026-03-01", future_date)},
+    )
+    monkeypatch.setattr(splunk_matrix_update, "http_client", HttpClient())
+    fixture = str(tmp_path / "tags.json")
+    write_fixture(fixture, _FIRST_LISTING)
+    try:
+        splunk_matrix_update.configure_registry(f"fixture:{fixture}")
+        assert update_splunk_version() == "False"
+
+        # 10.6.0 is out, its build tag is not: the run skips 10.6.
+        release = _tag("10.6.0", "sha256-1060", "2026-03-01T00:00:00Z")
+        write_fixture(fixture, [release] + _FIRST_LISTING)
+        assert update_splunk_version() == "False"
+        assert not make_config(conf.read_text()).has_section("10.6")
+        assert json.loads(state.read_text())["last_updated"] == "2026-02-01T00:00:00Z"
+
+        build = _tag("aabbccddee60", "sha256-1060", "2026-03-02T00:00:00Z")
+        write_fixture(fixture, [build, release] + _FIRST_LISTING)
+        assert update_splunk_version() == "True"
+    finally:
+        splunk_matrix_update.configure_registry(None)
+    config = make_config(conf.read_text())
+    assert config.get("10.6", "VERSION") == "10.6.0"
+    assert config.get("10.6", "BUILD") == "aabbccddee60"
+    assert json.loads(state.read_text())["last_updated"] == "2026-03-02T00:00:00Z"
+
+
+def test_with_sc4s_fetches_releases_through_the_configured_client(
+    fake_upstream, tmp_path, monkeypatch, capsys
+):
+    import runpy
+
+    import matrix_http
+    import sc4s_matrix_update
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config").mkdir()
+    (tmp_path / "config" / "SC4S_matrix.conf").write_text("[2]\nVERSION=3.40.0\n")
+    fake_upstream.route(
+        "/releases",
+        (200, [{"tag_name": "v3.41.0"}], {"ETag": '"r1"'}),
+    )
+    monkeypatch.setattr(
+        sc4s_matrix_update, "SC4S_RELEASES_URL", fake_upstream.url("/releases")
+    )
+
+    # Run only the SC4S task; the script runs the Splunk one against Docker Hub.
+    def sc4s_only(tasks, max_workers=None):
+        return {"splunk": "False", "sc4s": tasks["sc4s"]()}
+
+    monkeypatch.setattr(matrix_http, "fetch_concurrently", sc4s_only)
+    cache_dir = tmp_path / "cache"
+    argv = ["splunk_matrix_update.py", "--with-sc4s", "--cache-dir", str(cache_dir)]
+    monkeypatch.setattr(sys, "argv", argv)
+    runpy.run_path(splunk_matrix_update.__file__, run_name="__main__")
+
+    stderr = capsys.readouterr().err
+    assert "SC4S config updated: True" in stderr
+    # The request went through the script's client: counted and cached.
+    assert stderr.splitlines()[-1].startswith("1 HTTP requests")
+    assert any(path.suffix == ".body" for path in cache_dir.iterdir())
@@ -0,0 +1,79 @@
+"""Startup-time budget of the action; see benchmarks/bench_startup.py."""
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.bench_startup import (
+    REPO,
+    build_runtime,
+    entry_points,
+    parse_importtime,
+    run_entry_point,
+)
+
+# Generous enough for a loaded CI runner; a cold interpreter start is ~20-80 ms.
+STARTUP_BUDGET_SECONDS = float(os.environ.get("MATRIX_STARTUP_BUDGET", "0.5"))
+
+# Never needed to load a snapshot and write the outputs.
+_DEFERRED_MODULES = {
+    "argparse",
+    "configparser",
+    "pathlib",
+    "pprint",
+    "tempfile",
+    "uuid",
+    # Only loaded with --pin-digests.
+    "addonfactory_test_matrix_action.pinning",
+}
+_UPDATER_DEPENDENCIES = {"requests", "urllib3", "packaging"}
+
+
+@pytest.fixture(scope="module")
+def runtime(tmp_path_factory):
+    workdir = str(tmp_path_factory.mktemp("runtime"))
+    return workdir, entry_points(build_runtime(workdir))
+
+
+def test_importing_main_defers_heavy_modules():
+    result = subprocess.run(
+        [
+            sys.executable,
+            # Without site, so .pth hooks of the test environment don't count.
+            "-S",
+            "-X",
+            "importtime",
+            "-c",
+            "import addonfactory_test_matrix_action.main",
+        ],
+        cwd=REPO,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=True,
+    )
+    imported = set(parse_importtime(result.stderr))
+    assert "addonfactory_test_matrix_action.main" in imported
+    assert not imported & (_DEFERRED_MODULES | _UPDATER_DEPENDENCIES)
+
+
+def test_zipapp_matches_module_output(runtime):
+    workdir, commands = runtime
+    _, _, module_output = run_entry_point(commands["module"], workdir)
+    _, stderr, zipapp_output = run_entry_point(
+        commands["zipapp"], workdir, importtime=True
+    )
+    # Multiline values use a random heredoc delimiter.
+    delimiter = re.compile(r"ghadelimiter_[0-9a-f]{32}")
+    assert delimiter.sub("EOF", zipapp_output) == delimiter.sub("EOF", module_output)
+    imported = set(parse_importtime(stderr))
+    assert "site" not in imported
+    assert not imported & ({"configparser", "tempfile"} | _UPDATER_DEPENDENCIES)
+
+
+def test_zipapp_startup_within_budget(runtime):
+    workdir, commands = runtime
+    walls = [run_entry_point(commands["zipapp"], workdir)[0] for _ in range(3)]
+    assert statistics.median(walls) < STARTUP_BUDGET_SECONDS